@@ -0,0 +1,248 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from numpy import uint8
+from numpy.typing import ArrayLike, NDArray
+from os import PathLike
+from threading import Lock
+from typing import Dict, List, Union
+
+
+class ArtifactWriter:
+    """
+    Concurrent writer of the image artifacts
+
+    ## Details
+    - The images are encoded and written by a thread pool,
+      so the caller never waits on the filesystem.
+    - The BMP images are encoded by `save_bmp_image`,
+      and the other formats by `PIL` (imported only when needed).
+    - The identical outputs are not written again.
+      An image is skipped if the same bytes were already written to the path,
+      or if the file already contains the same bytes (for example, on re-runs).
+    - The images of the same path are written in the order of `write`.
+      Each image is written to a temporary file and moved into place,
+      so a path never holds a partially written image.
+    - The writer can be disabled, so that `write` does nothing for benchmark runs.
+    - The errors are raised by `flush` or `close`,
+      so call `flush` before finishing to make a failed write fail the run
+
+    ## Examples
+
+        ```python
+        with ArtifactWriter() as artifacts:
+            artifacts.write(values_y, "y.bmp", "L")
+            artifacts.write(values_rgb, "rgb.bmp", "RGB")
+        ```
+    """
+
+    _digests: Dict[str, bytes]
+    _enabled: bool
+    _executor: ThreadPoolExecutor
+    _futures: List[Future]
+    _last_futures: Dict[str, Future]
+    _lock: Lock
+
+    def __init__(
+        self,
+        *,
+        max_workers: Union[int, None] = None,
+        enabled: bool = True,
+    ) -> None:
+        """
+        ## Parameters
+        - `max_workers`
+            - The maximum number of threads
+            - The default value is `None`, which uses `4`
+        - `enabled`
+            - Whether to write the artifacts
+            - The default value is `True`
+        """
+
+        max_workers = int(max_workers or 4)
+
+        if max_workers <= 0:
+            raise ValueError("The maximum number of threads should be greater than 0")
+
+        self._digests = {}
+        self._enabled = bool(enabled)
+        self._executor = ThreadPoolExecutor(max_workers, "ArtifactWriter")
+        self._futures = []
+        self._last_futures = {}
+        self._lock = Lock()
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Check if the artifacts are written
+        """
+
+        return self._enabled
+
+    def write(
+        self,
+        values: ArrayLike,
+        path: Union[str, PathLike],
+        mode: Union[str, None] = None,
+    ) -> None:
+        """
+        Queue an image to be written
+
+        ## Parameters
+        - `values`
+            - 8-bit values in the shape of `(V, H)` or `(V, H, 3)`
+            - They should not be modified until they are written
+        - `path`: The path of the image
+            - The format is chosen by the suffix
+        - `mode`
+            - The mode of the image, `"L"` (grey-scale) or `"RGB"`
+            - The default value is `None`, which infers the mode from the shape
+        """
+
+        from numpy import asarray
+
+        if not self._enabled:
+            return
+
+        values = asarray(values)
+        modes = {2: "L", 3: "RGB"}
+
+        if values.dtype != uint8 or not (
+            values.ndim == 2 or (values.ndim == 3 and values.shape[2] == 3)
+        ):
+            raise ValueError(
+                "The values should be 8-bit and in the shape of (V, H) or (V, H, 3)"
+            )
+        if mode is not None and mode != modes[values.ndim]:
+            raise ValueError(f"The mode should be {modes[values.ndim]!r}")
+
+        path = str(path)
+
+        with self._lock:
+            future = self._executor.submit(
+                self._write, values, path, self._last_futures.get(path)
+            )
+            self._last_futures[path] = future
+            # The failed jobs are kept until their errors are raised by `flush`
+            self._futures = [
+                future
+                for future in self._futures
+                if not future.done() or future.exception() is not None
+            ]
+            self._futures.append(future)
+
+    def flush(self) -> None:
+        """
+        Wait until the queued images are written
+
+        ## Details
+        - The first error of the queued images is raised
+          after all of them are done
+        """
+
+        with self._lock:
+            futures, self._futures = self._futures, []
+
+        wait(futures)
+
+        with self._lock:
+            self._last_futures = {
+                path: future
+                for path, future in self._last_futures.items()
+                if not future.done()
+            }
+
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Write the queued images, and shut down the threads
+        """
+
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _write(
+        self,
+        values: NDArray[uint8],
+        path: str,
+        previous: Union[Future, None],
+    ) -> None:
+        """
+        An internal method which encodes and writes an image if it is changed
+        """
+
+        from hashlib import blake2b
+        from io import BytesIO
+        from os import O_CREAT, O_EXCL, O_WRONLY, open as open_file, remove, replace
+        from os.path import basename, dirname, getsize, join
+        from secrets import token_hex
+
+        from .bmp import save_bmp_image
+
+        device = BytesIO()
+        if path.lower().endswith(".bmp"):
+            save_bmp_image(device, values)
+        else:
+            from PIL import Image
+
+            Image.fromarray(values).save(device, _get_format(path))
+        data = device.getbuffer()
+        digest = blake2b(data, digest_size=16).digest()
+
+        # The previous image of the path is written first.
+        # It was submitted earlier, so it is already running on another thread.
+        if previous is not None:
+            wait([previous])
+
+        with self._lock:
+            if self._digests.get(path) == digest:
+                return
+
+        try:
+            unchanged = False
+            if getsize(path) == len(data):
+                with open(path, "rb") as file:
+                    unchanged = file.read() == data
+        except OSError:
+            unchanged = False
+
+        if not unchanged:
+            # The temporary file is created with the mode of a new file,
+            # to which the kernel applies the umask of the process
+            temporary_path = join(
+                dirname(path), f".{basename(path)}.{token_hex(8)}.tmp"
+            )
+            descriptor = open_file(temporary_path, O_CREAT | O_EXCL | O_WRONLY, 0o666)
+            try:
+                with open(descriptor, "wb") as file:
+                    file.write(data)
+                replace(temporary_path, path)
+            except BaseException:
+                remove(temporary_path)
+                raise
+
+        # The digest is recorded only after the image is written
+        with self._lock:
+            self._digests[path] = digest
+
+
+def _get_format(path: str) -> str:
+    """
+    An internal function which gets the `PIL` format from the suffix of a path
+    """
+
+    from PIL import Image
+
+    Image.init()
+    suffix = path[path.rfind(".") :].lower()
+    if suffix not in Image.EXTENSION:
+        raise ValueError(f"The format of {path!r} is unknown")
+    return Image.EXTENSION[suffix]
@@ -0,0 +1,240 @@
+from numpy import uint8
+from numpy.typing import ArrayLike, NDArray
+from os import PathLike
+from typing import BinaryIO, Tuple, Union
+
+
+def load_bmp_image(path: Union[str, PathLike], *, copy: bool = False) -> NDArray[uint8]:
+    """
+    Load the values of an uncompressed BMP image
+
+    ## Parameters
+    - `path`: The path of the image
+    - `copy`
+        - Whether to copy the values into a new contiguous array
+        - The default value is `False`, which returns a view of the mapped file
+
+    ## Returns
+    - 8-bit values (`NDArray[uint8]`)
+        - 24-bit and 32-bit images are returned as R'G'B' values
+          in the shape of `(V, H, 3)`
+        - 8-bit images with a grey-scale palette or no palette are returned
+          as values in the shape of `(V, H)`
+        - Other 8-bit images are returned as R'G'B' values
+          looked up from the palette in the shape of `(V, H, 3)`
+
+    ## Details
+    - The pixel array is memory-mapped.
+      The row order (bottom-up or top-down), the row padding
+      and the B'G'R' order are handled with a strided view, so no pixels are copied.
+    - The view is read-only. The file stays mapped until the view is released.
+    - Only the uncompressed (`BI_RGB`) 8-bit, 24-bit and 32-bit images are supported
+        - The fourth byte of the 32-bit pixels is ignored
+    """
+
+    from mmap import ACCESS_READ, mmap
+    from numpy import arange, frombuffer, ndarray
+
+    with open(path, "rb") as file:
+        mapping = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+    # The array keeps the mapping alive through its buffer export
+    data = frombuffer(mapping, dtype=uint8)
+    size, bit_depth, offset, colors = _parse_bmp_header(data)
+    width, height = size
+    stride = _get_bmp_stride(width, bit_depth)
+    rows = abs(height)
+
+    if offset + stride * rows > data.size:
+        raise ValueError("The file does not contain the whole pixel array")
+
+    # Bottom-up rows are viewed with a negative stride from the last row
+    if height > 0:
+        offset += stride * (rows - 1)
+        stride = -stride
+
+    if bit_depth != 8:
+        # The channels are viewed from the third byte backwards (B'G'R' to R'G'B')
+        values = ndarray(
+            (rows, width, 3),
+            dtype=uint8,
+            buffer=data,
+            offset=offset + 2,
+            strides=(stride, bit_depth // 8, -1),
+        )
+    else:
+        values = ndarray(
+            (rows, width), dtype=uint8, buffer=data, offset=offset, strides=(stride, 1)
+        )
+        palette = data[54 : 54 + colors * 4].reshape(colors, 4)[:, 2::-1]
+        grey = arange(colors, dtype=uint8)[:, None]
+        if colors and (colors != 256 or (palette != grey).any()):
+            return palette.take(values, axis=0, mode="clip")
+
+    return values.copy() if copy else values
+
+
+def save_bmp_image(
+    device: Union[str, PathLike, BinaryIO],
+    values: ArrayLike,
+) -> None:
+    """
+    Save the values as an uncompressed BMP image
+
+    ## Parameters
+    - `device`: The path or a writable binary device to save the image to
+    - `values`
+        - 8-bit values
+        - The values in the shape of `(V, H)` are saved as an 8-bit image
+          with a grey-scale palette
+        - The R'G'B' values in the shape of `(V, H, 3)` are saved as a 24-bit image
+
+    ## Details
+    - The headers, the palette and the padded bottom-up rows are assembled
+      in one buffer and written with one call.
+    - The output is the same as `PIL.Image.fromarray(values).save(device, "BMP")`
+    """
+
+    from numpy import arange, asarray, empty, zeros
+    from struct import pack_into
+
+    values = asarray(values)
+
+    if values.dtype != uint8 or not (
+        values.ndim == 2 or (values.ndim == 3 and values.shape[2] == 3)
+    ):
+        raise ValueError(
+            "The values should be 8-bit and in the shape of (V, H) or (V, H, 3)"
+        )
+
+    height, width = values.shape[:2]
+    bit_depth = 8 if values.ndim == 2 else 24
+    colors = 256 if bit_depth == 8 else 0
+    stride = _get_bmp_stride(width, bit_depth)
+    offset = 54 + colors * 4
+    file_size = offset + stride * height
+
+    if file_size > 0xFFFFFFFF:
+        raise ValueError("The file size is too large for the BMP format")
+
+    data = empty(file_size, dtype=uint8)
+    pack_into(
+        "<2sIIIIiiHHIIiiII",
+        data,
+        0,
+        b"BM",
+        file_size,
+        0,
+        offset,
+        40,
+        width,
+        height,
+        1,
+        bit_depth,
+        0,
+        stride * height,
+        *_BMP_PIXELS_PER_METER,
+        colors,
+        colors,
+    )
+
+    if colors:
+        palette = zeros((colors, 4), dtype=uint8)
+        palette[:, :3] = arange(colors, dtype=uint8)[:, None]
+        data[54:offset] = palette.reshape(-1)
+
+    rows = data[offset:].reshape(height, stride)
+    row_bytes = width * bit_depth // 8
+    rows[:, row_bytes:] = 0
+    if bit_depth == 24:
+        # Copying the channels one by one is faster than a reversed channel view
+        pixels = rows[::-1, :row_bytes].reshape(height, width, 3)
+        for channel in range(3):
+            pixels[..., channel] = values[..., 2 - channel]
+    else:
+        rows[::-1, :row_bytes] = values
+
+    if isinstance(device, (str, PathLike)):
+        with open(device, "wb") as file:
+            file.write(memoryview(data))
+    else:
+        device.write(memoryview(data))
+
+
+def get_bmp_size(path: Union[str, PathLike]) -> Tuple[int, int]:
+    """
+    Get the size of a BMP image from its header
+
+    ## Parameters
+    - `path`: The path of the image
+
+    ## Returns
+    - The width and height of the image
+    """
+
+    from numpy import frombuffer
+
+    with open(path, "rb") as file:
+        header = file.read(54)
+
+    (width, height), _, _, _ = _parse_bmp_header(frombuffer(header, dtype=uint8))
+    return (width, abs(height))
+
+
+_BMP_PIXELS_PER_METER = (3780, 3780)
+
+
+def _get_bmp_stride(width: int, bit_depth: int) -> int:
+    """
+    An internal function which gets the number of bytes of a padded row
+    """
+
+    return (width * bit_depth + 31) // 32 * 4
+
+
+def _parse_bmp_header(data: NDArray[uint8]) -> Tuple[Tuple[int, int], int, int, int]:
+    """
+    An internal function which parses the headers of a BMP image
+
+    ## Returns
+    - The width and signed height, the bit depth, the offset of the pixel array
+      and the number of palette colours
+    """
+
+    from struct import unpack_from
+
+    if data.size < 54 or bytes(data[:2]) != b"BM":
+        raise ValueError("The file is not a BMP image")
+
+    (offset,) = unpack_from("<I", data, 10)
+    (
+        header_size,
+        width,
+        height,
+        _,
+        bit_depth,
+        compression,
+        _,
+        _,
+        _,
+        colors,
+    ) = unpack_from("<IiiHHIIiiI", data, 14)
+
+    if header_size != 40:
+        raise ValueError("Only the BMP images with BITMAPINFOHEADER are supported")
+    if compression != 0 or bit_depth not in (8, 24, 32):
+        raise ValueError(
+            "Only the uncompressed 8-bit, 24-bit and 32-bit images are supported"
+        )
+    if width <= 0 or height == 0:
+        raise ValueError("The size of the image should be greater than 0")
+
+    if bit_depth == 8:
+        if colors == 0:
+            colors = min(max(offset - 54, 0) // 4, 256)
+        if 54 + colors * 4 > offset:
+            raise ValueError("The palette overlaps the pixel array")
+    else:
+        colors = 0
+
+    return ((width, height), bit_depth, offset, colors)
@@ -0,0 +1,191 @@
+from contextlib import contextmanager
+from numpy import dtype as DType
+from numpy.typing import DTypeLike, NDArray
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple, Union
+
+
+class FramePool:
+    """
+    Frame buffer pool
+
+    ## Details
+    - The buffers are keyed by their shapes and data types
+    - The buffers are borrowed with `acquire` and returned with `release`,
+      so the pipelines allocate no new buffers per frame in steady state.
+    - The contents of an acquired buffer are undefined
+    - It is safe to share a pool between threads
+
+    ## Examples
+
+        ```python
+        from numpy import float32, uint8
+
+        pool = FramePool()
+        for frame in frames:
+            with pool.borrow((144, 176, 3), float32) as workspace:
+                values = COLOR.dequantize_rgb(frame, out=workspace)
+                ...
+        ```
+    """
+
+    _buffers: Dict[Tuple[Tuple[int, ...], DType], List[NDArray]]
+    _capacity: int
+    _lock: Lock
+
+    def __init__(self, *, capacity: int = 4) -> None:
+        """
+        ## Parameters
+        - `capacity`
+            - The maximum number of idle buffers kept per shape and data type
+            - The default value is `4`
+        """
+
+        capacity = int(capacity)
+
+        if capacity < 0:
+            raise ValueError("The capacity should be greater than or equal to 0")
+
+        self._buffers = {}
+        self._capacity = capacity
+        self._lock = Lock()
+
+    def acquire(self, shape: Tuple[int, ...], dtype: DTypeLike) -> NDArray:
+        """
+        Acquire a buffer from the pool
+
+        ## Parameters
+        - `shape`: The shape of the buffer
+        - `dtype`: The data type of the buffer
+
+        ## Returns
+        - A contiguous NumPy array
+            - An idle buffer is reused if there is one,
+              otherwise a new buffer is allocated.
+        """
+
+        from numpy import empty
+
+        key = (tuple(map(int, shape)), DType(dtype))
+
+        with self._lock:
+            buffers = self._buffers.get(key)
+            if buffers:
+                return buffers.pop()
+
+        return empty(key[0], dtype=key[1])
+
+    def release(self, buffer: NDArray) -> None:
+        """
+        Release a buffer back to the pool
+
+        ## Parameters
+        - `buffer`: The buffer acquired from the pool
+            - It should not be used after being released
+
+        ## Details
+        - The buffer is dropped if the pool is full
+        """
+
+        if not buffer.flags.c_contiguous or not buffer.flags.writeable:
+            raise ValueError("The buffer should be contiguous and writable")
+
+        key = (buffer.shape, buffer.dtype)
+
+        with self._lock:
+            buffers = self._buffers.setdefault(key, [])
+            if len(buffers) < self._capacity:
+                buffers.append(buffer)
+
+    @contextmanager
+    def borrow(self, shape: Tuple[int, ...], dtype: DTypeLike) -> Iterator[NDArray]:
+        """
+        Borrow a buffer from the pool within a context
+
+        ## Parameters
+        - `shape`: The shape of the buffer
+        - `dtype`: The data type of the buffer
+
+        ## Returns
+        - A context manager which acquires a buffer on entering
+          and releases it on exiting
+        """
+
+        buffer = self.acquire(shape, dtype)
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def clear(self) -> None:
+        """
+        Drop all the idle buffers in the pool
+        """
+
+        with self._lock:
+            self._buffers.clear()
+
+
+def get_output_array(
+    array: Union[NDArray, None],
+    shape: Tuple[int, ...],
+    dtype: DTypeLike,
+    *,
+    contiguous: bool = False,
+) -> NDArray:
+    """
+    Get a validated output array, or allocate a new one
+
+    ## Parameters
+    - `array`: The output array provided by the caller, or `None`
+    - `shape`: The expected shape of the output array
+    - `dtype`: The expected data type of the output array
+    - `contiguous`: Whether the output array should be contiguous
+
+    ## Returns
+    - `array` if it is valid, otherwise a new array if it is `None`
+    """
+
+    from numpy import empty
+
+    shape = tuple(map(int, shape))
+
+    if array is None:
+        return empty(shape, dtype=dtype)
+    if array.shape != shape:
+        raise ValueError(f"The output array should be in the shape of {shape}")
+    if array.dtype != DType(dtype):
+        raise ValueError(f"The output array should be of the data type {DType(dtype)}")
+    if not array.flags.writeable:
+        raise ValueError("The output array should be writable")
+    if contiguous and not array.flags.c_contiguous:
+        raise ValueError("The output array should be contiguous")
+    return array
+
+
+def get_buffer_view(buffer: NDArray, shape: Tuple[int, ...]) -> NDArray:
+    """
+    Get a contiguous view on the leading elements of a buffer
+
+    ## Parameters
+    - `buffer`: A contiguous buffer
+    - `shape`: The shape of the view
+        - The view should not be larger than the buffer
+
+    ## Returns
+    - A contiguous view of `buffer` in the shape of `shape`
+
+    ## Details
+    - It allows a buffer allocated for the largest shape, such as a full stripe,
+      to be reused for any smaller shape, such as the last stripe.
+    """
+
+    from math import prod
+
+    shape = tuple(map(int, shape))
+
+    if not buffer.flags.c_contiguous:
+        raise ValueError("The buffer should be contiguous")
+    if prod(shape) > buffer.size:
+        raise ValueError(f"The buffer is too small for the shape of {shape}")
+    return buffer.reshape(-1)[: prod(shape)].reshape(shape)
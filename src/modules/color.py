@@ -1,8 +1,11 @@
-from numpy import float32, uint8, uint16, uint32, uint64
-from numpy.typing import ArrayLike, NDArray
-from typing import Iterable, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from numpy import float16, float32, float64, uint8, uint16, uint64
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+from typing import Callable, Iterable, Tuple, Union
 
-from .typing import get_uint_type, uintlike
+from .buffer import get_output_array
+from .typing import floatlike, get_float_type, get_uint_type, uintlike
 
 
 class H273:
@@ -19,15 +22,49 @@ class H273:
     - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
     """
 
+    _dtype: floatlike
     _is_full_range: bool
 
     def __init__(
         self,
         *,
         full_range: bool = False,
+        dtype: DTypeLike = float32,
     ) -> None:
+        """
+        ## Parameters
+        - `full_range`
+            - The video full range flag
+            - The default value is `False`
+        - `dtype`
+            - The working data type of the analog values and intermediate values
+            - It should be `float16`, `float32` or `float64`
+            - `float16` only supports the bit depths up to `11`
+            - The default value is `float32`
+            - See `get_dtype_deviation` for the precision of the other data types
+        """
+
+        self._dtype = get_float_type(dtype)
         self.set_full_range(full_range)
 
+    @property
+    def dtype(self) -> floatlike:
+        """
+        Get the working data type of the analog values and intermediate values
+
+        ## Details
+        - The cached matrices are computed in `float32`,
+          and casted to this data type when they are applied.
+        - NumPy computes `float16` without hardware support on most processors,
+          so `float16` halves the memory of the intermediate values,
+          but the computation is about 15 times slower than `float32`.
+          It does not reduce the time of bandwidth-bound conversions.
+        - `float16` only supports the bit depths up to `11`,
+          since the higher bit depths cannot be represented exactly.
+        """
+
+        return self._dtype
+
     def set_full_range(self, flag: bool = False) -> "H273":
         """
         Set the video full range flag
@@ -37,6 +74,9 @@ class H273:
           in association with the other coefficients.
         - Generally, the flag affect the behavior of the (de)quantization process.
         - When not specified, the value defaults to `False`.
+        - The flag is shared by all the callers of this instance,
+          so it is unsafe to set it while other threads use the instance.
+          Use `H273Config` for immutable configurations instead.
 
         ## References
         - See Section 8.3 of Rec. ITU-T H.273.
@@ -66,6 +106,8 @@ class H273:
         self,
         values: Iterable[Tuple[float, float, float]],
         bit_depth: int = 8,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
     ) -> NDArray[uintlike]:
         """
         De-quantize the R'G'B' values (from digital to analog)
@@ -78,6 +120,9 @@ class H273:
             - Representation bit depth of the corresponding luma colour component signal
             - It should be greater than or equal to `8`
             - The default value is `8`
+        - `out`
+            - An optional array to store the de-quantized values
+            - It should be in the same shape as `values`
 
         ## Returns
         - De-quantized R'G'B' values (`NDArray[uintlike]`)
@@ -91,30 +136,39 @@ class H273:
         - See Equation 20 to 22 and 26 to 28, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import asarray
+        from numpy import asarray, divide
 
         bit_depth = int(bit_depth)
-        values = asarray(values, dtype=float32)
+        values = asarray(values)
 
         if bit_depth < 8:
             raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(self.dtype, bit_depth)
         if values.shape[-1] != 3:
             raise ValueError("The input values should be in the shape of (..., 3)")
 
+        transformed_values = get_output_array(out, values.shape, self.dtype)
         if self.is_full_range:
             scale = (1 << bit_depth) - 1
-            transformed_values = values / scale
+            divide(values, scale, out=transformed_values, dtype=self.dtype)
         else:
             padding = 1 << (bit_depth - 8)
-            transformed_values = (values / padding - 16) / 219
+            divide(values, padding, out=transformed_values, dtype=self.dtype)
+            transformed_values -= 16
+            transformed_values /= 219
 
-        clipped_values = self.clip_analog(transformed_values, 0.0, 1.0)
+        clipped_values = self.clip_analog(
+            transformed_values, 0.0, 1.0, out=transformed_values
+        )
         return clipped_values
 
     def quantize_rgb(
         self,
         values: Iterable[Tuple[float, float, float]],
         bit_depth: int = 8,
+        *,
+        out: Union[NDArray[uintlike], None] = None,
+        workspace: Union[NDArray[floatlike], None] = None,
     ) -> NDArray[uintlike]:
         """
         Quantize the R'G'B' values (from analog to digital)
@@ -126,6 +180,12 @@ class H273:
             - Representation bit depth of the corresponding luma colour component signal
             - It should be greater than or equal to `8`
             - The default value is `8`
+        - `out`
+            - An optional array to store the quantized values
+            - It should be in the same shape as `values`
+        - `workspace`
+            - An optional array of the working data type to store the intermediate values
+            - It should be in the same shape as `values`
 
         ## Returns
         - Quantized R'G'B' values (`NDArray[uintlike]`)
@@ -139,24 +199,28 @@ class H273:
         - See Equation 20 to 22 and 26 to 28, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import asarray
+        from numpy import asarray, multiply
 
         bit_depth = int(bit_depth)
-        values = asarray(values, dtype=float32)
+        values = asarray(values)
 
         if bit_depth < 8:
             raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(self.dtype, bit_depth)
         if values.shape[-1] != 3:
             raise ValueError("The input values should be in the shape of (..., 3)")
 
+        transformed_values = get_output_array(workspace, values.shape, self.dtype)
         if self.is_full_range:
             scale = (1 << bit_depth) - 1
-            transformed_values = scale * values
+            multiply(values, scale, out=transformed_values, dtype=self.dtype)
         else:
             padding = 1 << (bit_depth - 8)
-            transformed_values = padding * (219 * values + 16)
+            multiply(values, 219, out=transformed_values, dtype=self.dtype)
+            transformed_values += 16
+            transformed_values *= padding
 
-        clipped_values = self.clip_digital(transformed_values, bit_depth)
+        clipped_values = self.clip_digital(transformed_values, bit_depth, out=out)
         return clipped_values
 
     def dequantize_ycbcr(
@@ -165,6 +229,8 @@ class H273:
         bit_depth_y: int = 8,
         bit_depth_cb: int = 8,
         bit_depth_cr: int = 8,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
     ) -> NDArray[uintlike]:
         """
         De-quantize the Y'Cb'Cr' values to Y'Pb'Pr' (from digital to analog)
@@ -184,10 +250,16 @@ class H273:
         - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
             - It should be greater than or equal to `8`
             - The default value is `8`
+        - `out`
+            - An optional array to store the de-quantized values
+            - It should be in the same shape as `values`
 
         ## Returns
-        - De-quantized values (`NDArray[uintlike]`)
+        - De-quantized values (`NDArray[floatlike]`)
             - The values are equal to Y'Pb'Pr' values
+            - The values are of the working data type (`float32` by default),
+              which holds every code value up to 16 bits within one rounding.
+              Use `float64` for the full precision of the analog values.
 
         ## Details
         - It is implemented as the inverse operation of `quantize_ycbcr`
@@ -198,39 +270,50 @@ class H273:
         - See Equation 23 to 25 and 29 to 31, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import array, asarray, stack
+        from numpy import asarray, divide, subtract
 
         bit_depth_y, bit_depth_cb, bit_depth_cr = map(
             int, (bit_depth_y, bit_depth_cb, bit_depth_cr)
         )
-        values = asarray(values, dtype=float32)
+        values = asarray(values)
 
         if bit_depth_y < 8 or bit_depth_cb < 8 or bit_depth_cr < 8:
             raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(self.dtype, bit_depth_y, bit_depth_cb, bit_depth_cr)
         if values.shape[-1] != 3:
             raise ValueError("The input values should be in the shape of (..., 3)")
 
-        if self.is_full_range:
-            scale = (
-                1 << array([bit_depth_y, bit_depth_cb, bit_depth_cr], dtype=uint32)
-            ) - 1
-            padding = 1 << (array([1, bit_depth_cb, bit_depth_cr], dtype=uint32) - 1)
-            padding[0] = 0
-            transformed_values = (values - padding) / scale
-        else:
-            padding = 1 << (
-                array([bit_depth_y, bit_depth_cb, bit_depth_cr], dtype=uint32) - 8
-            )
-            transformed_values = (values / padding - [16, 128, 128]) / [219, 224, 224]
-
-        clipped_values = stack(
-            [
-                self.clip_analog(transformed_values[..., 0], +0.0, +1.0),
-                self.clip_analog(transformed_values[..., 1], -0.5, +0.5),
-                self.clip_analog(transformed_values[..., 2], -0.5, +0.5),
-            ],
-            axis=-1,
-        )
+        # The components are transformed one by one in place
+        clipped_values = get_output_array(out, values.shape, self.dtype)
+        for channel, bit_depth, offset, (min, max) in zip(
+            range(3),
+            (bit_depth_y, bit_depth_cb, bit_depth_cr),
+            (16, 128, 128),
+            ((+0.0, +1.0), (-0.5, +0.5), (-0.5, +0.5)),
+        ):
+            transformed_values = clipped_values[..., channel]
+            if self.is_full_range:
+                scale = (1 << bit_depth) - 1
+                padding = 0 if channel == 0 else 1 << (bit_depth - 1)
+                subtract(
+                    values[..., channel],
+                    padding,
+                    out=transformed_values,
+                    dtype=self.dtype,
+                )
+                transformed_values /= scale
+            else:
+                padding = 1 << (bit_depth - 8)
+                divide(
+                    values[..., channel],
+                    padding,
+                    out=transformed_values,
+                    dtype=self.dtype,
+                )
+                transformed_values -= offset
+                transformed_values /= 219 if channel == 0 else 224
+
+            self.clip_analog(transformed_values, min, max, out=transformed_values)
         return clipped_values
 
     def quantize_ycbcr(
@@ -239,6 +322,9 @@ class H273:
         bit_depth_y: int = 8,
         bit_depth_cb: int = 8,
         bit_depth_cr: int = 8,
+        *,
+        out: Union[NDArray[uintlike], None] = None,
+        workspace: Union[NDArray[float64], None] = None,
     ) -> NDArray[uintlike]:
         """
         Quantize the Y'Pb'Pr' values to Y'Cb'Cr' values (from analog to digital)
@@ -257,6 +343,12 @@ class H273:
         - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
             - It should be greater than or equal to `8`
             - The default value is `8`
+        - `out`
+            - An optional array to store the quantized values
+            - It should be in the same shape as `values`
+        - `workspace`
+            - An optional `float64` array to store the intermediate values of a component
+            - It should be in the shape of `(...)` for the values in the shape of `(..., 3)`
 
         ## Returns
         - Quantized values (`NDArray[uintlike]`)
@@ -269,54 +361,201 @@ class H273:
         ## Details
         - The bit depths for chroma components might be distinct. *[Equation 3, Section 5.4]*
         - Y'Cb'Cr' and Y'Pb'Pr' values are derived from gamma-corrected RGB values
+        - The values are scaled and rounded in `float64` regardless of the working
+          data type, so the code values are exact at the high bit depths
 
         ## References
         - See Equation 23 to 25 and 29 to 31, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import array, asarray, stack
+        from numpy import asarray, multiply
 
         bit_depth_y, bit_depth_cb, bit_depth_cr = map(
             int, (bit_depth_y, bit_depth_cb, bit_depth_cr)
         )
-        values = asarray(values, dtype=float32)
+        bit_depths = (bit_depth_y, bit_depth_cb, bit_depth_cr)
+        values = asarray(values)
 
         if bit_depth_y < 8 or bit_depth_cb < 8 or bit_depth_cr < 8:
             raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(self.dtype, bit_depth_y, bit_depth_cb, bit_depth_cr)
         if values.shape[-1] != 3:
             raise ValueError("The input values should be in the shape of (..., 3)")
 
-        if self.is_full_range:
-            scale = (
-                1 << array([bit_depth_y, bit_depth_cb, bit_depth_cr], dtype=uint32)
-            ) - 1
-            padding = 1 << (array([1, bit_depth_cb, bit_depth_cr], dtype=uint32) - 1)
-            padding[0] = 0
-            transformed_values = (scale * values + padding).round()
-        else:
-            padding = 1 << (
-                array([bit_depth_y, bit_depth_cb, bit_depth_cr], dtype=uint32) - 8
-            )
-            transformed_values = (
-                padding * ([219, 224, 224] * values + [16, 128, 128])
-            ).round()
-
-        clipped_values = stack(
-            [
-                self.clip_digital(transformed_values[..., 0], bit_depth_y),
-                self.clip_digital(transformed_values[..., 1], bit_depth_cb),
-                self.clip_digital(transformed_values[..., 2], bit_depth_cr),
-            ],
-            axis=-1,
+        # The components are transformed one by one in the workspace
+        transformed_values = get_output_array(workspace, values.shape[:-1], float64)
+        clipped_values = get_output_array(
+            out, values.shape, get_uint_type(max(bit_depths))
         )
+        for channel, bit_depth, offset in zip(range(3), bit_depths, (16, 128, 128)):
+            if self.is_full_range:
+                scale = (1 << bit_depth) - 1
+                padding = 0 if channel == 0 else 1 << (bit_depth - 1)
+                multiply(
+                    values[..., channel],
+                    scale,
+                    out=transformed_values,
+                    dtype=float64,
+                )
+                transformed_values += padding
+            else:
+                padding = 1 << (bit_depth - 8)
+                multiply(
+                    values[..., channel],
+                    219 if channel == 0 else 224,
+                    out=transformed_values,
+                    dtype=float64,
+                )
+                transformed_values += offset
+                transformed_values *= padding
+            transformed_values.round(out=transformed_values)
+
+            self.clip_digital(
+                transformed_values, bit_depth, out=clipped_values[..., channel]
+            )
         return clipped_values
 
+    def requantize_ycbcr_plane(
+        self,
+        values: ArrayLike,
+        bit_depth: int,
+        new_bit_depth: int,
+        *,
+        is_chroma: bool = False,
+        out: Union[NDArray[uintlike], None] = None,
+    ) -> NDArray[uintlike]:
+        """
+        Convert the quantized values of a Y', Cb' or Cr' plane to another bit depth
+        (from digital to digital)
+
+        ## Parameters
+        - `values`: The quantized values of a plane in unsigned integers
+        - `bit_depth`: Representation bit depth of `values`
+        - `new_bit_depth`: Representation bit depth of the converted values
+        - `bit_depth`, `new_bit_depth`
+            - It should be between `8` and `16`
+        - `is_chroma`
+            - Whether the values are Cb' or Cr' values
+            - The default value is `False`
+        - `out`
+            - An optional contiguous array to store the converted values
+            - It should be in the same shape as `values`
+            - It may be `values` itself if their data types are the same
+
+        ## Returns
+        - Converted values (`NDArray[uintlike]`)
+            - The data types are determined based on `new_bit_depth`
+
+        ## Details
+        - It is equivalent to `dequantize_ycbcr` followed by `quantize_ycbcr`
+          in `float64`, but it never promotes the values to floating-point numbers.
+          The values exactly halfway between two codes are rounded half to even,
+          where the floating-point path follows its rounding errors.
+        - With full range disabled, the bit depths are converted by shifting
+          the values in their own data types.
+          With full range enabled, the values are scaled in `int64`
+          stripe by stripe.
+        - The values are converted in stripes, so it can convert
+          the samples unpacked in place with `unpack_samples`
+          and `SAMPLE_PACKING_MSB()` without another plane-sized buffer.
+
+        ## Examples
+
+            ```python
+            # 10-bit MSB-aligned (P010 style) Y' plane to 12 bits in place
+            words = frombuffer(buffer, dtype=uint16)[: v * h]
+            unpack_samples(buffer[: v * h * 2], words.shape, 10, "msb", out=words)
+            COLOR.requantize_ycbcr_plane(words, 10, 12, out=words)
+            pack_samples(words, 12, "msb", out=buffer[: v * h * 2])
+            ```
+
+        ## References
+        - See Equation 23 to 25 and 29 to 31, Section 8 of Rec. ITU-T H.273.
+        """
+
+        from numpy import (
+            asarray,
+            bitwise_and,
+            clip,
+            copyto,
+            divmod,
+            empty,
+            int64,
+            left_shift,
+            right_shift,
+        )
+
+        from .tile import iter_stripes
+
+        bit_depth, new_bit_depth = int(bit_depth), int(new_bit_depth)
+        values = asarray(values)
+
+        if values.dtype.kind not in "ui":
+            raise ValueError("The values should be integers")
+        if not (8 <= bit_depth <= 16 and 8 <= new_bit_depth <= 16):
+            raise ValueError("The bit depth should be between 8 and 16")
+
+        out = get_output_array(
+            out, values.shape, get_uint_type(new_bit_depth), contiguous=True
+        )
+        flat_values, flat_out = values.reshape(-1), out.reshape(-1)
+
+        # The intermediate values are bounded by the size of a stripe
+        for stripe in iter_stripes(flat_values.size, 1 << 16):
+            stripe_values, stripe_out = flat_values[stripe], flat_out[stripe]
+
+            if self.is_full_range:
+                # The numerator is rounded exactly, since the odd scale has no ties
+                scale, new_scale = (1 << bit_depth) - 1, (1 << new_bit_depth) - 1
+                scaled_values = empty(stripe_values.shape, dtype=int64)
+                clip(stripe_values, 0, scale, out=scaled_values, casting="unsafe")
+                if is_chroma:
+                    scaled_values -= 1 << (bit_depth - 1)
+                scaled_values *= new_scale
+                quotients, remainders = divmod(scaled_values, scale)
+                remainders *= 2
+                quotients += remainders > scale
+                if is_chroma:
+                    quotients += 1 << (new_bit_depth - 1)
+                clip(quotients, 0, new_scale, out=stripe_out, casting="unsafe")
+                continue
+
+            # The values out of the nominal range are clipped as analog values
+            clipped_values = clip(
+                stripe_values,
+                16 << (bit_depth - 8),
+                (240 if is_chroma else 235) << (bit_depth - 8),
+            )
+            shift = new_bit_depth - bit_depth
+            if shift >= 0:
+                left_shift(
+                    clipped_values,
+                    shift,
+                    out=stripe_out,
+                    dtype=stripe_out.dtype,
+                    casting="unsafe",
+                )
+                continue
+
+            # The discarded bits are rounded half to even
+            half = 1 << (-shift - 1)
+            remainders = bitwise_and(clipped_values, (half << 1) - 1)
+            quotients = right_shift(clipped_values, -shift)
+            rounding = remainders == half
+            rounding &= (quotients & 1).astype(bool)
+            rounding |= remainders > half
+            quotients += rounding
+            copyto(stripe_out, quotients, casting="unsafe")
+        return out
+
     def rgb_from_ypbpr(
         self,
         values: Iterable[Tuple[float, float, float]],
         kr: float,
         kb: float,
-    ) -> NDArray[float32]:
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
         """
         Compute the R'G'B' values from the Y'Pb'Pr' values (from analog to analog)
 
@@ -327,9 +566,12 @@ class H273:
             - The Pb' and Pr' values are in the range of `-0.5` to `0.5` *[Note 3]*
         - `kr`: The constant computed from color primaries *[Table 4]*
         - `kb`: The constant computed from color primaries *[Table 4]*
+        - `out`
+            - An optional contiguous array to store the R'G'B' values
+            - It should be in the same shape as `values`
 
         ## Returns
-        - R'G'B' values (`NDArray[float32]`)
+        - R'G'B' values (`NDArray[floatlike]`)
             - The values are in the range of `0.0` to `1.0`
 
         ## Details
@@ -340,9 +582,9 @@ class H273:
         - See Equation 38 to 40, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import asarray, linalg
+        from numpy import asarray, matmul
 
-        values = asarray(values, dtype=float32)
+        values = asarray(values, dtype=self.dtype)
 
         if values.shape[-1] != 3:
             raise ValueError("The input values should be in the shape of (..., 3)")
@@ -350,11 +592,21 @@ class H273:
         original_shape = values.shape
         values = values.reshape(-1, 3)
 
-        transform_matrix = linalg.inv(self.get_ypbpr_transformation_matrix(kr, kb))
+        _, transform_matrix = _get_ypbpr_transformation_matrices(float(kr), float(kb))
+        transform_matrix = transform_matrix.astype(self.dtype, copy=False)
         transposed_values = values.transpose()
-        transformed_values = (transform_matrix @ transposed_values).transpose()
-
-        transformed_values = transformed_values.reshape(original_shape)
+        if out is None:
+            transformed_values = (transform_matrix @ transposed_values).transpose()
+            transformed_values = transformed_values.reshape(original_shape)
+        else:
+            transformed_values = get_output_array(
+                out, original_shape, self.dtype, contiguous=True
+            )
+            matmul(
+                transform_matrix,
+                transposed_values,
+                out=transformed_values.reshape(-1, 3).transpose(),
+            )
         return transformed_values
 
     def ypbpr_from_rgb(
@@ -362,7 +614,9 @@ class H273:
         values: Iterable[Tuple[float, float, float]],
         kr: float,
         kb: float,
-    ) -> NDArray[float32]:
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
         """
         Compute the Y'Pb'Pr' values from the R'G'B' values (from analog to analog)
 
@@ -371,9 +625,12 @@ class H273:
             - R'G'B' values in the range of `0.0` to `1.0`
         - `kr`: The constant computed from color primaries *[Table 4]*
         - `kb`: The constant computed from color primaries *[Table 4]*
+        - `out`
+            - An optional contiguous array to store the Y'Pb'Pr' values
+            - It should be in the same shape as `values`
 
         ## Returns
-        - Y'PbPr values (`NDArray[float32]`)
+        - Y'PbPr values (`NDArray[floatlike]`)
             - The Y' values are in the range of `0.0` to `1.0` *[Note 3]*
             - The Pb' and Pr' values are in the range of `-0.5` to `0.5` *[Note 3]*
 
@@ -384,9 +641,9 @@ class H273:
         - See Equation 38 to 40, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import asarray
+        from numpy import asarray, matmul
 
-        values = asarray(values, dtype=float32)
+        values = asarray(values, dtype=self.dtype)
 
         if values.shape[-1] != 3:
             raise ValueError("The input values should be in the shape of (..., 3)")
@@ -395,141 +652,1793 @@ class H273:
         values = values.reshape(-1, 3)
 
         transform_matrix = self.get_ypbpr_transformation_matrix(kr, kb)
+        transform_matrix = transform_matrix.astype(self.dtype, copy=False)
         transposed_values = values.transpose()
-        transformed_values = (transform_matrix @ transposed_values).transpose()
-
-        transformed_values = transformed_values.reshape(original_shape)
+        if out is None:
+            transformed_values = (transform_matrix @ transposed_values).transpose()
+            transformed_values = transformed_values.reshape(original_shape)
+        else:
+            transformed_values = get_output_array(
+                out, original_shape, self.dtype, contiguous=True
+            )
+            matmul(
+                transform_matrix,
+                transposed_values,
+                out=transformed_values.reshape(-1, 3).transpose(),
+            )
         return transformed_values
 
-    def get_ypbpr_transformation_matrix(
+    def luma_from_rgb(
         self,
+        values: Iterable[Tuple[float, float, float]],
         kr: float,
         kb: float,
-    ) -> NDArray[float32]:
+        bit_depth_rgb: int = 8,
+        bit_depth_y: int = 8,
+        *,
+        full_range_rgb: bool = True,
+        quantize: bool = True,
+        out: Union[NDArray, None] = None,
+        workspace: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray:
         """
-        Compute the transformation matrix from the RGB color space to the Y'Pb'Pr' one
+        Compute the Y' values from the R'G'B' values (from digital to digital or analog)
 
         ## Parameters
+        - `values`
+            - Quantized R'G'B' values
         - `kr`: The constant computed from color primaries *[Table 4]*
         - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `bit_depth_y`
+            - Representation bit depth of the Y' colour component signals
+            - *Unused* if `quantize` is `False`
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+        - `quantize`
+            - Whether to quantize the Y' values
+            - The default value is `True`
+        - `out`
+            - An optional array to store the Y' values
+            - It should be in the shape of `(...)` where `(..., 3)` is the shape of `values`
+        - `workspace`
+            - An optional array of the working data type to store the intermediate values
+            - It should be in the same shape as `out`
+            - *Unused* if `quantize` is `False`
 
         ## Returns
-        - Transformation matrix (`NDArray[float32]`)
-            - Shape: `(3, 3)`
+        - Y' values (`NDArray`)
+            - If `quantize` is `True`, they are quantized values (`NDArray[uintlike]`)
+              whose data types are determined based on `bit_depth_y`
+            - Otherwise, they are de-quantized values (`NDArray[floatlike]`)
+              in the range of `0.0` to `1.0`
 
         ## Details
-        - Formula:
-
-            ```plaintext
-            Kg = 1 - Kr - Kb
-            Sb = 0.5 / (Kb - 1)
-            Sr = 0.5 / (Kr - 1)
-            Y  = ( Kr      * R' + Kg * G' +  Kb      * B')
-            Pb = ( Kr      * R' + Kg * G' + (Kb - 1) * B') * Sb
-            Pr = ((Kr - 1) * R' + Kg * G' +  Kb      * B') * Sr
-            Transform = [
-                 [ Kr,           Kg,       Kb          ],
-                 [ Kr      * Sb, Kg * Sb, (Kb - 1) * Sb],
-                 [(Kr - 1) * Sr, Kg * Sr,  Kb      * Sr],
-            ]
-            ```
+        - It is equivalent to the Y' component of `ycbcr_from_rgb`, or
+          of `dequantize_rgb` and `ypbpr_from_rgb` if `quantize` is `False`
+          (up to floating-point rounding)
+        - The video full range flag of this instance applies to the Y' values
+        - The Cb' and Cr' components are not computed,
+          so each sample takes one dot product with the cached coefficients
+        - The R'G'B' values are clipped only if their data type may exceed the bounds.
+          They are clipped stripe by stripe into a buffer of about `2 ** 16` pixels,
+          so the intermediate values are bounded by the size of a stripe.
 
         ## References
-        - See Equation 38 to 40, Section 8 of Rec. ITU-T H.273.
+        - See Equation 20 to 31 and 38, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import array
+        from math import prod
+        from numpy import asarray, clip, iinfo, matmul, empty
 
-        kg = 1 - kr - kb
-        transformation_matrix = array([[kr, kg, kb]] * 3, dtype=float32)
-        transformation_matrix[1][2] -= 1
-        transformation_matrix[2][0] -= 1
-        transformation_matrix[1] *= 0.5 / (kb - 1)
-        transformation_matrix[2] *= 0.5 / (kr - 1)
-        return transformation_matrix
+        from .tile import iter_stripes
 
-    def clip_analog(
+        bit_depth_rgb, bit_depth_y = int(bit_depth_rgb), int(bit_depth_y)
+        values = asarray(values)
+
+        if min(bit_depth_rgb, bit_depth_y) < 8:
+            raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(self.dtype, bit_depth_rgb, bit_depth_y)
+        if values.shape[-1] != 3:
+            raise ValueError("The input values should be in the shape of (..., 3)")
+
+        coefficients, offset = _get_luma_coefficients(
+            float(kr),
+            float(kb),
+            bool(full_range_rgb),
+            self.is_full_range,
+            bit_depth_rgb,
+            bit_depth_y,
+            bool(quantize),
+        )
+        lower, upper = _get_digital_bounds(full_range_rgb, (bit_depth_rgb,) * 3, False)
+
+        shape = values.shape[:-1]
+        luma = get_output_array(workspace if quantize else out, shape, self.dtype)
+
+        if (
+            full_range_rgb
+            and values.dtype.kind == "u"
+            and iinfo(values.dtype).max <= upper[0]
+        ):
+            matmul(values, coefficients, out=luma, dtype=self.dtype, casting="unsafe")
+        else:
+            # The values are clipped in stripes of the first axis into one buffer,
+            # so no copy of all the R'G'B' values is allocated
+            stripe_values, stripe_luma = (
+                (values[None], luma[None]) if values.ndim == 1 else (values, luma)
+            )
+            stripe_height = max(1, (1 << 16) // max(1, prod(stripe_values.shape[1:-1])))
+            clipped_values = empty(
+                (min(stripe_height, len(stripe_values)), *stripe_values.shape[1:]),
+                dtype=self.dtype,
+            )
+            for stripe in iter_stripes(len(stripe_values), stripe_height):
+                _clip_channels(
+                    stripe_values[stripe],
+                    lower,
+                    upper,
+                    out=clipped_values[: stripe.stop - stripe.start],
+                )
+                matmul(
+                    clipped_values[: stripe.stop - stripe.start],
+                    coefficients,
+                    out=stripe_luma[stripe],
+                    dtype=self.dtype,
+                    casting="unsafe",
+                )
+        luma += offset
+
+        if not quantize:
+            return luma
+
+        quantized_luma = get_output_array(out, shape, get_uint_type(bit_depth_y))
+        luma.round(out=luma)
+        return clip(
+            luma, 0, (1 << bit_depth_y) - 1, out=quantized_luma, casting="unsafe"
+        )
+
+    def ycbcr_from_rgb(
         self,
-        values: ArrayLike,
-        min: float,
-        max: float,
-    ) -> NDArray[float32]:
+        values: Iterable[Tuple[float, float, float]],
+        kr: float,
+        kb: float,
+        bit_depth_rgb: int = 8,
+        bit_depth_y: int = 8,
+        bit_depth_cb: int = 8,
+        bit_depth_cr: int = 8,
+        *,
+        full_range_rgb: bool = True,
+        stripe_height: Union[int, None] = None,
+        out: Union[NDArray[uintlike], None] = None,
+        workspace: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[uintlike]:
         """
-        Clip the analog values within the specified bit depth
+        Compute the Y'Cb'Cr' values from the R'G'B' values (from digital to digital)
 
         ## Parameters
-        - `values`: Values to be clipped
-        - `min`: Minumum value
-        - `max`: Maximum value
+        - `values`
+            - Quantized R'G'B' values
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
+            - Representation bit depths of the Y'Cb'Cr' colour component signals
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+        - `stripe_height`
+            - The number of rows of `values` transformed at a time
+            - The default value is `None`, which transforms all the rows at once
+            - See `get_stripe_height` in `modules.tile`
+        - `out`
+            - An optional contiguous array to store the Y'Cb'Cr' values
+            - It should be in the same shape as `values`
+        - `workspace`
+            - An optional contiguous array of the working data type to store the intermediate values
+            - It should be in the shape of `(2, ...)` where `...` is the shape of `values`,
+              or the shape of a stripe of `values` if `stripe_height` is specified
 
         ## Returns
-        - Clipped values (`NDArray[float32]`)
+        - Quantized Y'Cb'Cr' values (`NDArray[uintlike]`)
+            - The data types are determined based on the largest bit depths
 
         ## Details
-        - Formula: `clip_a(x) = min(max(x, min), max))`
-        - The function is used for de-quantized representation
+        - It is equivalent to applying `dequantize_rgb`, `ypbpr_from_rgb`
+          and `quantize_ycbcr` (up to floating-point rounding)
+        - The video full range flag of this instance applies to the Y'Cb'Cr' values
+        - The transformation is a single matrix multiplication plus offset
+          using the cached matrix of `get_ycbcr_transformation_matrix`
+        - If `stripe_height` is specified, the rows are transformed in stripes,
+          so the intermediate values are bounded by the size of a stripe
+          and stay in the cache when the stripe is small enough
+
+        ## References
+        - See Equation 20 to 31 and 38 to 40, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import clip
+        from numpy import asarray, clip, copyto, matmul
 
-        return clip(values, min, max).astype(float32)
+        bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr = map(
+            int, (bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr)
+        )
+        values = asarray(values)
 
-    def clip_digital(
+        if min(bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr) < 8:
+            raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(
+            self.dtype, bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr
+        )
+        if values.shape[-1] != 3:
+            raise ValueError("The input values should be in the shape of (..., 3)")
+
+        transform_matrix = self.get_ycbcr_transformation_matrix(
+            kr,
+            kb,
+            bit_depth_rgb,
+            bit_depth_y,
+            bit_depth_cb,
+            bit_depth_cr,
+            full_range_rgb=full_range_rgb,
+        ).astype(self.dtype, copy=False)
+        lower, upper = _get_digital_bounds(full_range_rgb, (bit_depth_rgb,) * 3, False)
+
+        bit_depths = (bit_depth_y, bit_depth_cb, bit_depth_cr)
+        original_shape = values.shape
+
+        if stripe_height is not None:
+            return _transform_in_stripes(
+                self.ycbcr_from_rgb,
+                values,
+                (kr, kb, bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr),
+                stripe_height,
+                get_output_array(
+                    out, original_shape, get_uint_type(max(bit_depths)), contiguous=True
+                ),
+                workspace,
+                self.dtype,
+                full_range_rgb=full_range_rgb,
+            )
+
+        clipped_values, transformed_values = _get_affine_workspace(
+            workspace, original_shape, self.dtype
+        )
+        quantized_values = get_output_array(
+            out, original_shape, get_uint_type(max(bit_depths)), contiguous=True
+        )
+
+        copyto(clipped_values, values.reshape(-1, 3), casting="unsafe")
+        _clip_channels(clipped_values, lower, upper, out=clipped_values)
+
+        # The transformed values are stored in the planar format,
+        # which is the fastest layout for the matrix multiplication in NumPy
+        matmul(
+            transform_matrix[:, :3],
+            clipped_values.transpose(),
+            out=transformed_values,
+        )
+        transformed_values += transform_matrix[:, 3:]
+        transformed_values.round(out=transformed_values)
+
+        for channel, bit_depth in enumerate(bit_depths):
+            clip(
+                transformed_values[channel],
+                0,
+                (1 << bit_depth) - 1,
+                out=quantized_values.reshape(-1, 3)[:, channel],
+                casting="unsafe",
+            )
+        return quantized_values
+
+    def rgb_from_ycbcr(
         self,
-        values: ArrayLike,
-        bit_depth: int = 8,
+        values: Iterable[Tuple[float, float, float]],
+        kr: float,
+        kb: float,
+        bit_depth_y: int = 8,
+        bit_depth_cb: int = 8,
+        bit_depth_cr: int = 8,
+        bit_depth_rgb: int = 8,
+        *,
+        full_range_rgb: bool = True,
+        stripe_height: Union[int, None] = None,
+        out: Union[NDArray[uintlike], None] = None,
+        workspace: Union[NDArray[floatlike], None] = None,
     ) -> NDArray[uintlike]:
         """
-        Clip the digital values within the specified bit depth
+        Compute the R'G'B' values from the Y'Cb'Cr' values (from digital to digital)
 
         ## Parameters
-        - `values`: Values to be clipped
-        - `bit_depth`:
-            - Representation bit depth of the values
-            - It should be greater than or equal to `0`
+        - `values`
+            - Quantized Y'Cb'Cr' values
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
+            - Representation bit depths of the Y'Cb'Cr' colour component signals
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+        - `stripe_height`
+            - The number of rows of `values` transformed at a time
+            - The default value is `None`, which transforms all the rows at once
+            - See `get_stripe_height` in `modules.tile`
+        - `out`
+            - An optional contiguous array to store the R'G'B' values
+            - It should be in the same shape as `values`
+        - `workspace`
+            - An optional contiguous array of the working data type to store the intermediate values
+            - It should be in the shape of `(2, ...)` where `...` is the shape of `values`,
+              or the shape of a stripe of `values` if `stripe_height` is specified
 
         ## Returns
-        - Clipped values (`NDArray[uintlike]`)
+        - Quantized R'G'B' values (`NDArray[uintlike]`)
+            - The data types are determined based on `bit_depth_rgb`
 
         ## Details
-        - Formula: `clip_d(x) = min(max(x, 0), ((1 << bit_depth) - 1))`
-        - The values are casted into suitable unsigned integer types
-        - The function is used for quantized representation
+        - It is implemented as the inverse operation of `ycbcr_from_rgb`
+        - It is equivalent to applying `dequantize_ycbcr`, `rgb_from_ypbpr`
+          and `quantize_rgb` (up to floating-point rounding)
+        - The video full range flag of this instance applies to the Y'Cb'Cr' values
+        - The transformation is a single matrix multiplication plus offset
+          using the cached matrix of `get_rgb_transformation_matrix`
+        - If `stripe_height` is specified, the rows are transformed in stripes,
+          so the intermediate values are bounded by the size of a stripe
+          and stay in the cache when the stripe is small enough
 
         ## References
-        - See Equation 2 to 4, Section 5.4 of Rec. ITU-T H.273.
+        - See Equation 20 to 31 and 38 to 40, Section 8 of Rec. ITU-T H.273.
         """
 
-        from numpy import clip
+        from numpy import asarray, clip, copyto, matmul
 
-        bit_depth = int(bit_depth)
+        bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb = map(
+            int, (bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb)
+        )
+        values = asarray(values)
 
-        if bit_depth < 0:
-            raise ValueError("The bit depth should be greater than or equal to 0")
+        if min(bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb) < 8:
+            raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(
+            self.dtype, bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb
+        )
+        if values.shape[-1] != 3:
+            raise ValueError("The input values should be in the shape of (..., 3)")
 
-        clipped_values = clip(values, 0, (1 << bit_depth) - 1)
-        casted_values = clipped_values.astype(get_uint_type(bit_depth))
+        transform_matrix = self.get_rgb_transformation_matrix(
+            kr,
+            kb,
+            bit_depth_y,
+            bit_depth_cb,
+            bit_depth_cr,
+            bit_depth_rgb,
+            full_range_rgb=full_range_rgb,
+        ).astype(self.dtype, copy=False)
+        lower, upper = _get_digital_bounds(
+            self.is_full_range, (bit_depth_y, bit_depth_cb, bit_depth_cr), True
+        )
 
-        return casted_values
+        original_shape = values.shape
 
+        if stripe_height is not None:
+            return _transform_in_stripes(
+                self.rgb_from_ycbcr,
+                values,
+                (kr, kb, bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb),
+                stripe_height,
+                get_output_array(
+                    out, original_shape, get_uint_type(bit_depth_rgb), contiguous=True
+                ),
+                workspace,
+                self.dtype,
+                full_range_rgb=full_range_rgb,
+            )
 
-def KR_KB_BT601() -> Tuple[float, float]:
-    """
-    Constant `Kr` and `Kb` values for Rec. ITU-R BT.601-7
+        clipped_values, transformed_values = _get_affine_workspace(
+            workspace, original_shape, self.dtype
+        )
+        quantized_values = get_output_array(
+            out, original_shape, get_uint_type(bit_depth_rgb), contiguous=True
+        )
 
-    ## References
-    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
-    - Value 5 or 6, Table 4 of Rec. ITU-T H.273
-    """
-    return (0.299, 0.114)
+        copyto(clipped_values, values.reshape(-1, 3), casting="unsafe")
+        _clip_channels(clipped_values, lower, upper, out=clipped_values)
 
+        # The transformed values are stored in the planar format,
+        # which is the fastest layout for the matrix multiplication in NumPy
+        matmul(
+            transform_matrix[:, :3],
+            clipped_values.transpose(),
+            out=transformed_values,
+        )
+        transformed_values += transform_matrix[:, 3:]
+
+        for channel in range(3):
+            clip(
+                transformed_values[channel],
+                0,
+                (1 << bit_depth_rgb) - 1,
+                out=quantized_values.reshape(-1, 3)[:, channel],
+                casting="unsafe",
+            )
+        return quantized_values
 
-def KR_KB_BT709() -> Tuple[float, float]:
-    """
-    Constant `Kr` and `Kb` values for Rec. ITU-R BT.709-6
+    def rgb_from_ycbcr_planes(
+        self,
+        planes: Tuple[ArrayLike, ArrayLike, ArrayLike],
+        scheme: Tuple[int, int, int],
+        kr: float,
+        kb: float,
+        bit_depth_y: int = 8,
+        bit_depth_cb: int = 8,
+        bit_depth_cr: int = 8,
+        bit_depth_rgb: int = 8,
+        *,
+        full_range_rgb: bool = True,
+        stripe_height: Union[int, None] = None,
+        out: Union[NDArray[uintlike], None] = None,
+    ) -> NDArray[uintlike]:
+        """
+        Reconstruct the quantized R'G'B' values from the sub-sampled Y'Cb'Cr' planes
+        (from digital to digital)
 
-    ## References
-    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
-    - Value 1, Table 4 of Rec. ITU-T H.273
-    """
-    return (0.2126, 0.0722)
+        ## Parameters
+        - `planes`
+            - The Y', Cb' and Cr' planes
+            - Each plane is a 2-D array of the quantized values,
+              or a 3-D array in the shape of `(N, V, H)` for a stack of frames
+            - The chroma planes are sub-sampled using `scheme`
+        - `scheme`: Colour sub-sampling scheme used
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
+            - Representation bit depths of the Y'Cb'Cr' colour component signals
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+        - `stripe_height`
+            - The number of rows of the Y' plane reconstructed at a time
+            - It should be a multiple of the vertical sub-sampling factor
+            - The default value is `None`, which reconstructs all the rows at once
+            - See `get_stripe_height` in `modules.tile`
+        - `out`
+            - An optional array to store the R'G'B' values
+            - It should be in the shape of `(V, H, 3)` where `(V, H)`
+              is the shape of the Y' plane, or `(N, V, H, 3)` for a stack of frames
+
+        ## Returns
+        - Quantized R'G'B' values (`NDArray[uintlike]`)
+            - The data types are determined based on `bit_depth_rgb`
+
+        ## Details
+        - It is equivalent to up-sampling the chroma planes with `BT2100.upsample`,
+          and then applying `dequantize_ycbcr`, `rgb_from_ypbpr` and `quantize_rgb`
+          (up to floating-point rounding)
+        - The video full range flag of this instance applies to the Y'Cb'Cr' values
+        - The chroma contribution is computed once per sub-sampled sample and
+          broadcast over its block when it is added to the luma contribution
+        - The R'G'B' values are computed channel by channel in place
+          in a workspace which is reused for every stripe,
+          so no temporary array of the size of the Y' plane is allocated
+        - If `stripe_height` is specified, the planes are reconstructed in stripes
+          aligned with the chroma rows, so the intermediate values are bounded
+          by the size of a stripe
+        - A stack of frames is reconstructed in one call as a single tall frame
+          if the height is a multiple of the vertical sub-sampling factor
+          and `out` is contiguous, otherwise frame by frame.
+          The default stripe of a stack is one frame,
+          so the intermediate values are bounded by the size of a frame.
+
+        ## References
+        - See Equation 20 to 31 and 38 to 40, Section 8 of Rec. ITU-T H.273.
+        """
+
+        from numpy import asarray, copyto, clip, empty, multiply, zeros
+
+        from .sample import get_subsampling_factors
+        from .tile import iter_stripes
+
+        bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb = map(
+            int, (bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb)
+        )
+        plane_y, plane_cb, plane_cr = map(asarray, planes)
+
+        if min(bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb) < 8:
+            raise ValueError("The bit depth should be greater than or equal to 8")
+        _check_dtype_precision(
+            self.dtype, bit_depth_y, bit_depth_cb, bit_depth_cr, bit_depth_rgb
+        )
+
+        if plane_y.ndim == 3 and plane_cb.ndim == 3 and plane_cr.ndim == 3:
+            n, v, h = plane_y.shape
+            dv, _ = get_subsampling_factors(scheme)
+
+            if plane_cb.shape[0] != n or plane_cr.shape[0] != n:
+                raise ValueError("The planes should have the same number of frames")
+
+            out = get_output_array(out, (n, v, h, 3), get_uint_type(bit_depth_rgb))
+
+            # The frames are stacked into a tall frame
+            # if no chroma row straddles two frames
+            if v % dv == 0 and out.flags.c_contiguous:
+                stripe_height = v if stripe_height is None else stripe_height
+                frames = [
+                    (
+                        tuple(
+                            plane.reshape(-1, plane.shape[-1])
+                            for plane in (plane_y, plane_cb, plane_cr)
+                        ),
+                        out.reshape(n * v, h, 3),
+                    )
+                ]
+            else:
+                frames = [
+                    ((plane_y[i], plane_cb[i], plane_cr[i]), out[i]) for i in range(n)
+                ]
+
+            for frame_planes, frame_out in frames:
+                self.rgb_from_ycbcr_planes(
+                    frame_planes,
+                    scheme,
+                    kr,
+                    kb,
+                    bit_depth_y,
+                    bit_depth_cb,
+                    bit_depth_cr,
+                    bit_depth_rgb,
+                    full_range_rgb=full_range_rgb,
+                    stripe_height=stripe_height,
+                    out=frame_out,
+                )
+            return out
+
+        if plane_y.ndim != 2 or plane_cb.ndim != 2 or plane_cr.ndim != 2:
+            raise ValueError("The dimension of the planes should be 2 or 3")
+
+        v, h = plane_y.shape
+        dv, dh = get_subsampling_factors(scheme)
+        v_chroma, h_chroma = -(-v // dv), -(-h // dh)
+
+        if plane_cb.shape != (v_chroma, h_chroma) or plane_cr.shape != (
+            v_chroma,
+            h_chroma,
+        ):
+            raise ValueError(
+                f"The chroma planes should be in the shape of ({v_chroma}, {h_chroma})"
+            )
+        if out is None:
+            out = empty((v, h, 3), dtype=get_uint_type(bit_depth_rgb))
+        elif out.shape != (v, h, 3):
+            raise ValueError(
+                f"The output array should be in the shape of ({v}, {h}, 3)"
+            )
+
+        if stripe_height is None:
+            stripe_height = v_chroma * dv
+        else:
+            stripe_height = int(stripe_height)
+
+            if stripe_height <= 0 or stripe_height % dv != 0:
+                raise ValueError(
+                    f"The stripe height should be a positive multiple of {dv}"
+                )
+        stripe_height = min(stripe_height, v_chroma * dv)
+
+        _, transform_matrix = _get_ypbpr_transformation_matrices(float(kr), float(kb))
+        transform_matrix = transform_matrix.astype(self.dtype, copy=False)
+
+        # The workspaces are allocated once and reused for every stripe and channel
+        # - The luma and R'G'B' workspaces are padded to whole chroma blocks
+        # - The padding of the luma workspace stays zero
+        v_stripe_chroma = stripe_height // dv
+        luma = zeros((v_stripe_chroma * dv, h_chroma * dh), dtype=self.dtype)
+        workspace = empty((v_stripe_chroma, dv, h_chroma, dh), dtype=self.dtype)
+        chroma_b, chroma_r, chroma, chroma_r_part = (
+            empty((v_stripe_chroma, h_chroma), dtype=self.dtype) for _ in range(4)
+        )
+
+        for stripe in iter_stripes(v, stripe_height):
+            rows = stripe.stop - stripe.start
+            chroma_stripe = slice(stripe.start // dv, -(-stripe.stop // dv))
+            rows_chroma = chroma_stripe.stop - chroma_stripe.start
+
+            # De-quantize the Y'Cb'Cr' planes to Y'Pb'Pr' planes
+            stripe_luma = luma[: rows_chroma * dv]
+            stripe_chroma_b, stripe_chroma_r, stripe_chroma, stripe_chroma_r_part = (
+                array[:rows_chroma]
+                for array in (chroma_b, chroma_r, chroma, chroma_r_part)
+            )
+            _dequantize_ycbcr_plane(
+                plane_y[stripe],
+                bit_depth_y,
+                self.is_full_range,
+                False,
+                stripe_luma[:rows, :h],
+            )
+            _dequantize_ycbcr_plane(
+                plane_cb[chroma_stripe],
+                bit_depth_cb,
+                self.is_full_range,
+                True,
+                stripe_chroma_b,
+            )
+            _dequantize_ycbcr_plane(
+                plane_cr[chroma_stripe],
+                bit_depth_cr,
+                self.is_full_range,
+                True,
+                stripe_chroma_r,
+            )
+
+            # Compute the chroma contribution per sub-sampled sample,
+            # and broadcast it over the blocks onto the luma contribution
+            blocks = workspace[:rows_chroma]
+            values = blocks.reshape(rows_chroma * dv, h_chroma * dh)[:rows, :h]
+
+            for channel in range(3):
+                multiply(
+                    stripe_chroma_b, transform_matrix[channel, 1], out=stripe_chroma
+                )
+                multiply(
+                    stripe_chroma_r,
+                    transform_matrix[channel, 2],
+                    out=stripe_chroma_r_part,
+                )
+                stripe_chroma += stripe_chroma_r_part
+                multiply(
+                    stripe_luma.reshape(blocks.shape),
+                    transform_matrix[channel, 0],
+                    out=blocks,
+                )
+                blocks += stripe_chroma[:, None, :, None]
+
+                # Quantize the R'G'B' values
+                if full_range_rgb:
+                    values *= (1 << bit_depth_rgb) - 1
+                else:
+                    values *= 219
+                    values += 16
+                    values *= 1 << (bit_depth_rgb - 8)
+                clip(values, 0, (1 << bit_depth_rgb) - 1, out=values)
+
+                copyto(out[stripe, :, channel], values, casting="unsafe")
+        return out
+
+    def ycbcr_planes_from_rgb(
+        self,
+        values: Iterable[Tuple[float, float, float]],
+        scheme: Tuple[int, int, int],
+        kr: float,
+        kb: float,
+        bit_depth_rgb: int = 8,
+        bit_depth_y: int = 8,
+        bit_depth_cb: int = 8,
+        bit_depth_cr: int = 8,
+        *,
+        full_range_rgb: bool = True,
+        stripe_height: Union[int, None] = None,
+        out: Union[
+            Tuple[NDArray[uintlike], NDArray[uintlike], NDArray[uintlike]], None
+        ] = None,
+    ) -> Tuple[NDArray[uintlike], NDArray[uintlike], NDArray[uintlike]]:
+        """
+        Compute the sub-sampled Y'Cb'Cr' planes from the quantized R'G'B' values
+        (from digital to digital)
+
+        ## Parameters
+        - `values`
+            - Quantized R'G'B' values in the shape of `(V, H, 3)`,
+              or `(N, V, H, 3)` for a stack of frames
+        - `scheme`: Colour sub-sampling scheme to use
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
+            - Representation bit depths of the Y'Cb'Cr' colour component signals
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+        - `stripe_height`
+            - The number of rows of `values` transformed at a time
+            - It should be a multiple of the vertical sub-sampling factor
+            - The default value is `None`, which transforms all the rows at once
+            - See `get_stripe_height` in `modules.tile`
+        - `out`
+            - Optional arrays to store the Y', Cb' and Cr' planes
+
+        ## Returns
+        - The Y', Cb' and Cr' planes (`Tuple[NDArray[uintlike], ...]`)
+            - The data types are determined based on the bit depths
+            - The chroma planes are sub-sampled using `scheme`
+            - The planes are in the shape of `(N, V, H)` for a stack of frames
+
+        ## Details
+        - It is equivalent to applying `ycbcr_from_rgb` and
+          then sub-sampling the chroma components with `BT2100.subsample`
+        - The video full range flag of this instance applies to the Y'Cb'Cr' values
+        - If `stripe_height` is specified, the rows are transformed in stripes
+          aligned with the chroma rows, so the intermediate values are bounded
+          by the size of a stripe and stay in the cache when the stripe is small enough
+        - A stack of frames is transformed in one call as a single tall frame
+          if the height is a multiple of the vertical sub-sampling factor
+          and the planes of `out` are contiguous, otherwise frame by frame.
+          The default stripe of a stack is one frame,
+          so the intermediate values are bounded by the size of a frame.
+
+        ## References
+        - See Equation 20 to 31 and 38 to 40, Section 8 of Rec. ITU-T H.273.
+        """
+
+        from numpy import asarray, copyto, empty
+
+        from .buffer import get_buffer_view
+        from .sample import get_subsampling_factors
+        from .tile import iter_stripes
+
+        bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr = map(
+            int, (bit_depth_rgb, bit_depth_y, bit_depth_cb, bit_depth_cr)
+        )
+        values = asarray(values)
+
+        if values.ndim == 4 and values.shape[-1] == 3:
+            n, v, h = values.shape[:3]
+            dv, dh = get_subsampling_factors(scheme)
+            v_chroma, h_chroma = -(-v // dv), -(-h // dh)
+            bit_depths = (bit_depth_y, bit_depth_cb, bit_depth_cr)
+            shapes = ((n, v, h), (n, v_chroma, h_chroma), (n, v_chroma, h_chroma))
+            planes = tuple(
+                get_output_array(plane, shape, get_uint_type(bit_depth))
+                for plane, shape, bit_depth in zip(
+                    out or (None,) * 3, shapes, bit_depths
+                )
+            )
+
+            # The frames are stacked into a tall frame
+            # if no chroma row straddles two frames
+            if v % dv == 0 and all(plane.flags.c_contiguous for plane in planes):
+                stripe_height = v if stripe_height is None else stripe_height
+                frames = [
+                    (
+                        values.reshape(n * v, h, 3),
+                        tuple(plane.reshape(-1, plane.shape[-1]) for plane in planes),
+                    )
+                ]
+            else:
+                frames = [
+                    (values[i], tuple(plane[i] for plane in planes)) for i in range(n)
+                ]
+
+            for frame_values, frame_planes in frames:
+                self.ycbcr_planes_from_rgb(
+                    frame_values,
+                    scheme,
+                    kr,
+                    kb,
+                    bit_depth_rgb,
+                    bit_depth_y,
+                    bit_depth_cb,
+                    bit_depth_cr,
+                    full_range_rgb=full_range_rgb,
+                    stripe_height=stripe_height,
+                    out=frame_planes,
+                )
+            return planes
+
+        if values.ndim != 3 or values.shape[-1] != 3:
+            raise ValueError(
+                "The input values should be in the shape of (V, H, 3) or (N, V, H, 3)"
+            )
+
+        v, h = values.shape[:2]
+        dv, dh = get_subsampling_factors(scheme)
+        v_chroma, h_chroma = -(-v // dv), -(-h // dh)
+        stripe_height = (
+            -(-v // dv) * dv if stripe_height is None else int(stripe_height)
+        )
+
+        if stripe_height <= 0 or stripe_height % dv != 0:
+            raise ValueError(f"The stripe height should be a positive multiple of {dv}")
+
+        bit_depths = (bit_depth_y, bit_depth_cb, bit_depth_cr)
+        shapes = ((v, h), (v_chroma, h_chroma), (v_chroma, h_chroma))
+        plane_y, plane_cb, plane_cr = (
+            get_output_array(plane, shape, get_uint_type(bit_depth))
+            for plane, shape, bit_depth in zip(out or (None,) * 3, shapes, bit_depths)
+        )
+
+        stripe_rows = min(stripe_height, v)
+        stripe_buffer = empty((stripe_rows, h, 3), dtype=get_uint_type(max(bit_depths)))
+        workspace = empty((2, stripe_rows, h, 3), dtype=self.dtype)
+
+        for stripe in iter_stripes(v, stripe_height):
+            stripe_shape = (stripe.stop - stripe.start, h, 3)
+            ycbcr = self.ycbcr_from_rgb(
+                values[stripe],
+                kr,
+                kb,
+                bit_depth_rgb,
+                bit_depth_y,
+                bit_depth_cb,
+                bit_depth_cr,
+                full_range_rgb=full_range_rgb,
+                out=get_buffer_view(stripe_buffer, stripe_shape),
+                workspace=get_buffer_view(workspace, (2, *stripe_shape)),
+            )
+
+            chroma_stripe = slice(stripe.start // dv, -(-stripe.stop // dv))
+            copyto(plane_y[stripe], ycbcr[..., 0], casting="unsafe")
+            copyto(plane_cb[chroma_stripe], ycbcr[::dv, ::dh, 1], casting="unsafe")
+            copyto(plane_cr[chroma_stripe], ycbcr[::dv, ::dh, 2], casting="unsafe")
+
+        return (plane_y, plane_cb, plane_cr)
+
+    def nonlinear_from_linear(
+        self,
+        values: ArrayLike,
+        transfer: int,
+        bit_depth: Union[int, None] = None,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Apply the opto-electronic transfer function to the linear RGB values
+        (from linear to non-linear)
+
+        ## Parameters
+        - `values`
+            - Linear RGB values
+            - Either quantized values of unsigned integers,
+              or de-quantized values in the range of `0.0` to `1.0`
+        - `transfer`
+            - The transfer characteristics *[Table 3]*
+            - Search for the methods beginning with
+              `TRANSFER_CHARACTERISTICS_` in this module
+        - `bit_depth`
+            - Representation bit depth of the quantized values
+            - It should be in the range of `8` to `16`
+            - The default value is `None`, which is only allowed for `uint8` values
+              and means `8`, since wider data types commonly store
+              10-bit or 12-bit samples
+            - *Unused* for the de-quantized values
+        - `out`
+            - An optional array to store the R'G'B' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - De-quantized R'G'B' values (`NDArray[floatlike]`)
+            - The values are in the range of `0.0` to `1.0`
+
+        ## Details
+        - It can be applied before `ypbpr_from_rgb`
+        - The quantized values are de-quantized as `dequantize_rgb` does,
+          and looked up in a precomputed table with one entry per code value
+        - The de-quantized values are evaluated with the transfer function
+          in the working data type, which is faster than interpolating a table
+          with NumPy
+        - The tables are cached, so no power functions are evaluated
+          per quantized sample
+
+        ## References
+        - See Table 3, Section 8.2 of Rec. ITU-T H.273.
+        """
+
+        return _apply_transfer_table(
+            values, transfer, False, self.is_full_range, bit_depth, out, self.dtype
+        )
+
+    def linear_from_nonlinear(
+        self,
+        values: ArrayLike,
+        transfer: int,
+        bit_depth: Union[int, None] = None,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Apply the inverse of the opto-electronic transfer function
+        to the R'G'B' values (from non-linear to linear)
+
+        ## Parameters
+        - `values`
+            - R'G'B' values
+            - Either quantized values of unsigned integers,
+              or de-quantized values in the range of `0.0` to `1.0`
+        - `transfer`
+            - The transfer characteristics *[Table 3]*
+            - Search for the methods beginning with
+              `TRANSFER_CHARACTERISTICS_` in this module
+        - `bit_depth`
+            - Representation bit depth of the quantized values
+            - It should be in the range of `8` to `16`
+            - The default value is `None`, which is only allowed for `uint8` values
+              and means `8`, since wider data types commonly store
+              10-bit or 12-bit samples
+            - *Unused* for the de-quantized values
+        - `out`
+            - An optional array to store the linear RGB values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - De-quantized linear RGB values (`NDArray[floatlike]`)
+            - The values are in the range of `0.0` to `1.0`
+
+        ## Details
+        - It is implemented as the inverse operation of `nonlinear_from_linear`
+        - It can be applied after `rgb_from_ypbpr`
+        - The quantized values are de-quantized as `dequantize_rgb` does,
+          and looked up in a precomputed table with one entry per code value
+        - The de-quantized values are evaluated with the transfer function
+          in the working data type, which is faster than interpolating a table
+          with NumPy
+        - The tables are cached, so no power functions are evaluated
+          per quantized sample
+
+        ## References
+        - See Table 3, Section 8.2 of Rec. ITU-T H.273.
+        """
+
+        return _apply_transfer_table(
+            values, transfer, True, self.is_full_range, bit_depth, out, self.dtype
+        )
+
+    def get_ypbpr_transformation_matrix(
+        self,
+        kr: float,
+        kb: float,
+    ) -> NDArray[float32]:
+        """
+        Compute the transformation matrix from the RGB color space to the Y'Pb'Pr' one
+
+        ## Parameters
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+
+        ## Returns
+        - Transformation matrix (`NDArray[float32]`)
+            - Shape: `(3, 3)`
+            - The matrix is cached per `(kr, kb)` and is read-only
+
+        ## Details
+        - Formula:
+
+            ```plaintext
+            Kg = 1 - Kr - Kb
+            Sb = 0.5 / (Kb - 1)
+            Sr = 0.5 / (Kr - 1)
+            Y  = ( Kr      * R' + Kg * G' +  Kb      * B')
+            Pb = ( Kr      * R' + Kg * G' + (Kb - 1) * B') * Sb
+            Pr = ((Kr - 1) * R' + Kg * G' +  Kb      * B') * Sr
+            Transform = [
+                 [ Kr,           Kg,       Kb          ],
+                 [ Kr      * Sb, Kg * Sb, (Kb - 1) * Sb],
+                 [(Kr - 1) * Sr, Kg * Sr,  Kb      * Sr],
+            ]
+            ```
+
+        ## References
+        - See Equation 38 to 40, Section 8 of Rec. ITU-T H.273.
+        """
+
+        transformation_matrix, _ = _get_ypbpr_transformation_matrices(
+            float(kr), float(kb)
+        )
+        return transformation_matrix
+
+    def get_ycbcr_transformation_matrix(
+        self,
+        kr: float,
+        kb: float,
+        bit_depth_rgb: int = 8,
+        bit_depth_y: int = 8,
+        bit_depth_cb: int = 8,
+        bit_depth_cr: int = 8,
+        *,
+        full_range_rgb: bool = True,
+    ) -> NDArray[float32]:
+        """
+        Compute the affine transformation matrix
+        from the digital R'G'B' values to the digital Y'Cb'Cr' ones
+
+        ## Parameters
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
+            - Representation bit depths of the Y'Cb'Cr' colour component signals
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+
+        ## Returns
+        - Affine transformation matrix (`NDArray[float32]`)
+            - Shape: `(3, 4)`
+            - The last column is the offset
+            - The matrix is cached per parameters and is read-only
+
+        ## Details
+        - The video full range flag of this instance applies to the Y'Cb'Cr' values
+        - Formula:
+
+            ```plaintext
+            Y'Cb'Cr' = Quantize(Transform(Dequantize(R'G'B')))
+                     = Matrix[:, :3] @ R'G'B' + Matrix[:, 3]
+            ```
+
+        ## References
+        - See Equation 20 to 31 and 38 to 40, Section 8 of Rec. ITU-T H.273.
+        """
+
+        transformation_matrix, _ = _get_ycbcr_transformation_matrices(
+            float(kr),
+            float(kb),
+            bool(full_range_rgb),
+            self.is_full_range,
+            int(bit_depth_rgb),
+            int(bit_depth_y),
+            int(bit_depth_cb),
+            int(bit_depth_cr),
+        )
+        return transformation_matrix
+
+    def get_rgb_transformation_matrix(
+        self,
+        kr: float,
+        kb: float,
+        bit_depth_y: int = 8,
+        bit_depth_cb: int = 8,
+        bit_depth_cr: int = 8,
+        bit_depth_rgb: int = 8,
+        *,
+        full_range_rgb: bool = True,
+    ) -> NDArray[float32]:
+        """
+        Compute the affine transformation matrix
+        from the digital Y'Cb'Cr' values to the digital R'G'B' ones
+
+        ## Parameters
+        - `kr`: The constant computed from color primaries *[Table 4]*
+        - `kb`: The constant computed from color primaries *[Table 4]*
+        - `bit_depth_y`, `bit_depth_cb`, `bit_depth_cr`
+            - Representation bit depths of the Y'Cb'Cr' colour component signals
+        - `bit_depth_rgb`
+            - Representation bit depth of the R'G'B' colour component signals
+        - `full_range_rgb`
+            - The video full range flag of the R'G'B' values
+            - The default value is `True`
+
+        ## Returns
+        - Affine transformation matrix (`NDArray[float32]`)
+            - Shape: `(3, 4)`
+            - The last column is the offset
+            - The matrix is cached per parameters and is read-only
+
+        ## Details
+        - It is the inverse of `get_ycbcr_transformation_matrix`
+        - The video full range flag of this instance applies to the Y'Cb'Cr' values
+
+        ## References
+        - See Equation 20 to 31 and 38 to 40, Section 8 of Rec. ITU-T H.273.
+        """
+
+        _, transformation_matrix = _get_ycbcr_transformation_matrices(
+            float(kr),
+            float(kb),
+            bool(full_range_rgb),
+            self.is_full_range,
+            int(bit_depth_rgb),
+            int(bit_depth_y),
+            int(bit_depth_cb),
+            int(bit_depth_cr),
+        )
+        return transformation_matrix
+
+    def clip_analog(
+        self,
+        values: ArrayLike,
+        min: float,
+        max: float,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Clip the analog values within the specified bit depth
+
+        ## Parameters
+        - `values`: Values to be clipped
+        - `min`: Minumum value
+        - `max`: Maximum value
+        - `out`
+            - An optional array to store the clipped values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - Clipped values (`NDArray[floatlike]`)
+
+        ## Details
+        - Formula: `clip_a(x) = min(max(x, min), max))`
+        - The function is used for de-quantized representation
+        """
+
+        from numpy import clip
+
+        if out is None:
+            return clip(values, min, max).astype(self.dtype)
+        return clip(values, min, max, out=out)
+
+    def clip_digital(
+        self,
+        values: ArrayLike,
+        bit_depth: int = 8,
+        *,
+        out: Union[NDArray[uintlike], None] = None,
+    ) -> NDArray[uintlike]:
+        """
+        Clip the digital values within the specified bit depth
+
+        ## Parameters
+        - `values`: Values to be clipped
+        - `bit_depth`:
+            - Representation bit depth of the values
+            - It should be greater than or equal to `0`
+        - `out`
+            - An optional array of unsigned integers to store the clipped values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - Clipped values (`NDArray[uintlike]`)
+
+        ## Details
+        - Formula: `clip_d(x) = min(max(x, 0), ((1 << bit_depth) - 1))`
+        - The values are casted into suitable unsigned integer types
+        - The function is used for quantized representation
+
+        ## References
+        - See Equation 2 to 4, Section 5.4 of Rec. ITU-T H.273.
+        """
+
+        from numpy import clip
+
+        bit_depth = int(bit_depth)
+
+        if bit_depth < 0:
+            raise ValueError("The bit depth should be greater than or equal to 0")
+
+        if out is not None:
+            return clip(values, 0, (1 << bit_depth) - 1, out=out, casting="unsafe")
+
+        clipped_values = clip(values, 0, (1 << bit_depth) - 1)
+        casted_values = clipped_values.astype(get_uint_type(bit_depth))
+
+        return casted_values
+
+
+@dataclass(frozen=True)
+class H273Config:
+    """
+    Immutable configuration of the colour conversion
+
+    ## Details
+    - It fixes the constants, the video full range flags and the bit depths,
+      which are passed to the methods of `H273` otherwise.
+    - It is safe to share a configuration between threads,
+      since the converters created from it are never modified.
+
+    ## Examples
+
+        ```python
+        config = H273Config(*KR_KB_BT709(), full_range=False)
+        ycbcr_converter = config.get_ycbcr_converter()
+        values = ycbcr_converter.quantize_ycbcr(values, *config.bit_depths_ycbcr)
+        ```
+    """
+
+    kr: float
+    """The constant computed from color primaries *[Table 4]*"""
+
+    kb: float
+    """The constant computed from color primaries *[Table 4]*"""
+
+    full_range: bool = False
+    """The video full range flag of the Y'Cb'Cr' values"""
+
+    full_range_rgb: bool = True
+    """The video full range flag of the R'G'B' values"""
+
+    bit_depth_rgb: int = 8
+    """Representation bit depth of the R'G'B' colour component signals"""
+
+    bit_depth_y: int = 8
+    """Representation bit depth of the Y' colour component signals"""
+
+    bit_depth_cb: int = 8
+    """Representation bit depth of the Cb' colour component signals"""
+
+    bit_depth_cr: int = 8
+    """Representation bit depth of the Cr' colour component signals"""
+
+    dtype: DTypeLike = float32
+    """The working data type of the analog values and intermediate values"""
+
+    def __post_init__(self) -> None:
+        if min(self.bit_depth_rgb, *self.bit_depths_ycbcr) < 8:
+            raise ValueError("The bit depth should be greater than or equal to 8")
+
+        # The data type is normalized, so equal configurations have equal hashes
+        object.__setattr__(self, "dtype", get_float_type(self.dtype))
+        _check_dtype_precision(self.dtype, self.bit_depth_rgb, *self.bit_depths_ycbcr)
+
+    @property
+    def bit_depths_ycbcr(self) -> Tuple[int, int, int]:
+        """
+        Get the bit depths of the Y'Cb'Cr' colour component signals
+        """
+
+        return (self.bit_depth_y, self.bit_depth_cb, self.bit_depth_cr)
+
+    def get_rgb_converter(self) -> H273:
+        """
+        Create a converter with the video full range flag of the R'G'B' values
+
+        ## Returns
+        - A new `H273` instance which should not be modified
+        """
+
+        return H273(full_range=self.full_range_rgb, dtype=self.dtype)
+
+    def get_ycbcr_converter(self) -> H273:
+        """
+        Create a converter with the video full range flag of the Y'Cb'Cr' values
+
+        ## Returns
+        - A new `H273` instance which should not be modified
+        """
+
+        return H273(full_range=self.full_range, dtype=self.dtype)
+
+
+def _check_dtype_precision(dtype: floatlike, *bit_depths: int) -> None:
+    """
+    An internal function which rejects the bit depths
+    beyond the precision of the working data type
+    """
+
+    # `float16` has 11 significant bits, and overflows above `65504`
+    if dtype is float16 and max(bit_depths) > 11:
+        raise ValueError(
+            "The bit depth should be less than or equal to 11 for float16, "
+            "use float32 or float64 instead"
+        )
+
+
+def get_dtype_deviation(
+    convert: Callable[[DTypeLike], ArrayLike],
+    dtype: DTypeLike = float16,
+    reference_dtype: DTypeLike = float32,
+) -> Tuple[float, float]:
+    """
+    Measure the deviation of the outputs computed in a working data type
+
+    ## Parameters
+    - `convert`
+        - A function which computes the outputs in the given working data type
+        - For example, `lambda dtype: H273(dtype=dtype).ycbcr_from_rgb(values, KR, KB)`
+    - `dtype`
+        - The working data type to validate
+        - The default value is `float16`
+    - `reference_dtype`
+        - The working data type of the reference outputs
+        - The default value is `float32`
+
+    ## Returns
+    - A tuple of the maximum absolute deviation
+      and the ratio of the deviated outputs (`Tuple[float, float]`)
+        - For quantized outputs, a maximum deviation of `0`
+          means that the working data type rounds back exactly.
+
+    ## Examples
+
+        ```python
+        max_deviation, deviated_ratio = get_dtype_deviation(
+            lambda dtype: H273(dtype=dtype).ycbcr_from_rgb(values, *KR_KB_BT709()),
+        )
+        ```
+    """
+
+    from numpy import abs, asarray, count_nonzero, subtract
+
+    outputs = asarray(convert(get_float_type(dtype)))
+    reference_outputs = asarray(convert(get_float_type(reference_dtype)))
+
+    if outputs.shape != reference_outputs.shape:
+        raise ValueError("The outputs should be in the same shape")
+    if outputs.size == 0:
+        return (0.0, 0.0)
+
+    deviations = abs(subtract(outputs, reference_outputs, dtype=float64))
+    return (float(deviations.max()), count_nonzero(deviations) / deviations.size)
+
+
+def KR_KB_BT601() -> Tuple[float, float]:
+    """
+    Constant `Kr` and `Kb` values for Rec. ITU-R BT.601-7
+
+    ## References
+    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
+    - Value 5 or 6, Table 4 of Rec. ITU-T H.273
+    """
+    return (0.299, 0.114)
+
+
+def KR_KB_BT709() -> Tuple[float, float]:
+    """
+    Constant `Kr` and `Kb` values for Rec. ITU-R BT.709-6
+
+    ## References
+    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
+    - Value 1, Table 4 of Rec. ITU-T H.273
+    """
+    return (0.2126, 0.0722)
+
+
+def TRANSFER_CHARACTERISTICS_BT709() -> int:
+    """
+    Transfer characteristics of Rec. ITU-R BT.709-6
+
+    ## Details
+    - `V = 1.099 * Lc ** 0.45 - 0.099` for `1 >= Lc >= 0.018`
+    - `V = 4.5 * Lc` for `0.018 > Lc >= 0`
+    - It is also used by Rec. ITU-R BT.601-7 and BT.2020-2
+
+    ## References
+    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
+    - Value 1, Table 3 of Rec. ITU-T H.273
+    """
+    return 1
+
+
+def TRANSFER_CHARACTERISTICS_SRGB() -> int:
+    """
+    Transfer characteristics of IEC 61966-2-1 sRGB
+
+    ## Details
+    - `V = 1.055 * Lc ** (1 / 2.4) - 0.055` for `1 >= Lc >= 0.0031308`
+    - `V = 12.92 * Lc` for `0.0031308 > Lc >= 0`
+
+    ## References
+    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
+    - Value 13, Table 3 of Rec. ITU-T H.273
+    """
+    return 13
+
+
+def TRANSFER_CHARACTERISTICS_PQ() -> int:
+    """
+    Transfer characteristics of SMPTE ST 2084 (Perceptual Quantization)
+
+    ## Details
+    - `V = ((c1 + c2 * Lc ** n) / (1 + c3 * Lc ** n)) ** m` for all `Lc`
+    - `Lc` equal to `1` corresponds to `10000` candelas per square metre
+    - It is also used by Rec. ITU-R BT.2100-2
+
+    ## References
+    - [Rec. ITU-T H.273](https://www.itu.int/rec/T-REC-H.273)
+    - Value 16, Table 3 of Rec. ITU-T H.273
+    """
+    return 16
+
+
+def _apply_transfer_table(
+    values: ArrayLike,
+    transfer: int,
+    inverse: bool,
+    full_range: bool,
+    bit_depth: Union[int, None],
+    out: Union[NDArray[floatlike], None],
+    dtype: DTypeLike = float32,
+) -> NDArray[floatlike]:
+    """
+    An internal function which applies the transfer function with the cached tables
+    """
+
+    from numpy import asarray, clip, copyto, take
+
+    values = asarray(values)
+    transformed_values = get_output_array(out, values.shape, dtype)
+
+    if values.dtype.kind in "ui":
+        if bit_depth is None:
+            if values.dtype != uint8:
+                raise ValueError(
+                    "The bit depth should be specified for the values wider than 8 bits"
+                )
+            bit_depth = 8
+        bit_depth = int(bit_depth)
+
+        if not 8 <= bit_depth <= 16:
+            raise ValueError("The bit depth should be in the range of 8 to 16")
+
+        table = _get_transfer_table(int(transfer), inverse, full_range, bit_depth)
+        table = table.astype(dtype, copy=False)
+        return take(table, values, out=transformed_values, mode="clip")
+
+    clipped_values = clip(values, 0.0, 1.0, out=transformed_values, casting="unsafe")
+    copyto(
+        transformed_values,
+        _get_transfer_function(int(transfer), inverse)(clipped_values),
+        casting="unsafe",
+    )
+    return transformed_values
+
+
+def _get_transfer_function(transfer: int, inverse: bool) -> Callable[..., NDArray]:
+    """
+    An internal function which gets the exact transfer function in `float64`
+
+    - See Table 3, Section 8.2 of Rec. ITU-T H.273.
+    """
+
+    from numpy import maximum, power, where
+
+    if transfer in (1, 6, 14, 15, 13):
+        if transfer == 13:
+            alpha, beta, gamma, slope = 1.055, 0.0031308, 1 / 2.4, 12.92
+        else:
+            alpha, beta, gamma, slope = 1.099296826809442, 0.018053968510807, 0.45, 4.5
+
+        def oetf(values):
+            return where(
+                values >= beta,
+                alpha * power(values, gamma) - (alpha - 1),
+                slope * values,
+            )
+
+        def inverse_oetf(values):
+            return where(
+                values >= slope * beta,
+                power((values + (alpha - 1)) / alpha, 1 / gamma),
+                values / slope,
+            )
+
+    elif transfer == 16:
+        c1, c2, c3 = 0.8359375, 18.8515625, 18.6875
+        m, n = 78.84375, 0.1593017578125
+
+        def oetf(values):
+            values = power(values, n)
+            return power((c1 + c2 * values) / (1 + c3 * values), m)
+
+        def inverse_oetf(values):
+            values = power(values, 1 / m)
+            return power(maximum(values - c1, 0) / (c2 - c3 * values), 1 / n)
+
+    else:
+        raise ValueError(f"Unsupported transfer characteristics: {transfer}")
+
+    return inverse_oetf if inverse else oetf
+
+
+@lru_cache(maxsize=None)
+def _get_transfer_table(
+    transfer: int,
+    inverse: bool,
+    full_range: bool,
+    bit_depth: int,
+) -> NDArray[float32]:
+    """
+    An internal cache of the transfer function of every code value
+
+    - The code values are de-quantized as `H273.dequantize_rgb` does
+    """
+
+    from numpy import arange, clip
+
+    codes = arange(1 << bit_depth, dtype=float64)
+    if full_range:
+        values = codes / ((1 << bit_depth) - 1)
+    else:
+        values = (codes / (1 << (bit_depth - 8)) - 16) / 219
+    values = clip(values, 0.0, 1.0)
+
+    table = _get_transfer_function(transfer, inverse)(values).astype(float32)
+    table.setflags(write=False)
+    return table
+
+
+def _clip_channels(
+    values: NDArray[float32],
+    lower: Iterable[float],
+    upper: Iterable[float],
+    out: Union[NDArray[float32], None] = None,
+) -> NDArray[float32]:
+    """
+    An internal function which clips the values in the shape of `(..., 3)` per channel
+
+    - Clipping with scalar bounds is much faster than
+      clipping with broadcast bounds in NumPy,
+      so the channels are clipped one by one if their bounds differ.
+    """
+
+    from numpy import clip, empty_like
+
+    lower, upper = list(lower), list(upper)
+
+    if len(set(lower)) == 1 and len(set(upper)) == 1:
+        return clip(values, lower[0], upper[0], out=out, casting="unsafe")
+
+    if out is None:
+        out = empty_like(values)
+    for channel in range(3):
+        clip(
+            values[..., channel],
+            lower[channel],
+            upper[channel],
+            out=out[..., channel],
+            casting="unsafe",
+        )
+    return out
+
+
+def _get_affine_workspace(
+    workspace: Union[NDArray[floatlike], None],
+    shape: Tuple[int, ...],
+    dtype: DTypeLike = float32,
+) -> Tuple[NDArray[floatlike], NDArray[floatlike]]:
+    """
+    An internal function which splits the workspace of the affine transformations
+
+    - The first half stores the clipped values in the shape of `(N, 3)`
+    - The second half stores the transformed values in the shape of `(3, N)`
+    """
+
+    workspace = get_output_array(
+        workspace, (2, *shape), dtype, contiguous=True
+    ).reshape(2, -1)
+    return (workspace[0].reshape(-1, 3), workspace[1].reshape(3, -1))
+
+
+def _transform_in_stripes(
+    transform: Callable[..., NDArray],
+    values: NDArray,
+    arguments: Tuple,
+    stripe_height: int,
+    out: NDArray,
+    workspace: Union[NDArray[floatlike], None],
+    dtype: DTypeLike = float32,
+    **keywords,
+) -> NDArray:
+    """
+    An internal function which applies an affine transformation to the row stripes
+
+    - The workspace is allocated for one stripe and reused by all the stripes
+    """
+
+    from numpy import empty
+
+    from .buffer import get_buffer_view
+    from .tile import iter_stripes
+
+    stripe_height = int(stripe_height)
+
+    if values.ndim < 2:
+        raise ValueError("The dimension of the values should be at least 2")
+    if stripe_height <= 0:
+        raise ValueError("The stripe height should be greater than 0")
+
+    if workspace is None:
+        workspace = empty(
+            (2, min(stripe_height, values.shape[0]), *values.shape[1:]), dtype=dtype
+        )
+    for stripe in iter_stripes(values.shape[0], stripe_height):
+        stripe_values = values[stripe]
+        transform(
+            stripe_values,
+            *arguments,
+            out=out[stripe],
+            workspace=get_buffer_view(workspace, (2, *stripe_values.shape)),
+            **keywords,
+        )
+    return out
+
+
+def _dequantize_ycbcr_plane(
+    plane: NDArray[uintlike],
+    bit_depth: int,
+    is_full_range: bool,
+    is_chroma: bool,
+    out: NDArray[floatlike],
+) -> NDArray[floatlike]:
+    """
+    An internal function which de-quantizes a Y', Cb' or Cr' plane in place in `out`
+
+    - See Equation 20 to 31, Section 8 of Rec. ITU-T H.273.
+    """
+
+    from numpy import clip, copyto
+
+    copyto(out, plane, casting="unsafe")
+
+    if is_full_range:
+        if is_chroma:
+            out -= 1 << (bit_depth - 1)
+        out /= (1 << bit_depth) - 1
+    else:
+        out /= 1 << (bit_depth - 8)
+        out -= 128 if is_chroma else 16
+        out /= 224 if is_chroma else 219
+
+    if is_chroma:
+        clip(out, -0.5, 0.5, out=out)
+    else:
+        clip(out, 0.0, 1.0, out=out)
+    return out
+
+
+@lru_cache(maxsize=None)
+def _get_ypbpr_transformation_matrices(
+    kr: float,
+    kb: float,
+) -> Tuple[NDArray[float32], NDArray[float32]]:
+    """
+    An internal cache of `H273.get_ypbpr_transformation_matrix` and its inverse
+    """
+
+    from numpy import array, linalg
+
+    kg = 1 - kr - kb
+    transformation_matrix = array([[kr, kg, kb]] * 3, dtype=float32)
+    transformation_matrix[1][2] -= 1
+    transformation_matrix[2][0] -= 1
+    transformation_matrix[1] *= 0.5 / (kb - 1)
+    transformation_matrix[2] *= 0.5 / (kr - 1)
+    inverse_matrix = linalg.inv(transformation_matrix)
+
+    transformation_matrix.setflags(write=False)
+    inverse_matrix.setflags(write=False)
+    return (transformation_matrix, inverse_matrix)
+
+
+@lru_cache(maxsize=None)
+def _get_quantization_parameters(
+    full_range: bool,
+    bit_depths: Tuple[int, int, int],
+    is_ycbcr: bool,
+) -> Tuple[NDArray[float64], NDArray[float64]]:
+    """
+    An internal cache of the scales and offsets of the quantization process
+
+    - Formula: `digital = scale * analog + offset`
+    - See Equation 20 to 31, Section 8 of Rec. ITU-T H.273.
+    """
+
+    from numpy import array
+
+    bit_depths = array(bit_depths, dtype=float64)
+
+    if full_range:
+        scale = 2**bit_depths - 1
+        offset = 2 ** (bit_depths - 1) * ([0, 1, 1] if is_ycbcr else [0, 0, 0])
+    else:
+        padding = 2 ** (bit_depths - 8)
+        scale = padding * ([219, 224, 224] if is_ycbcr else [219, 219, 219])
+        offset = padding * ([16, 128, 128] if is_ycbcr else [16, 16, 16])
+
+    scale.setflags(write=False)
+    offset.setflags(write=False)
+    return (scale, offset)
+
+
+@lru_cache(maxsize=None)
+def _get_digital_bounds(
+    full_range: bool,
+    bit_depths: Tuple[int, int, int],
+    is_ycbcr: bool,
+) -> Tuple[NDArray[float32], NDArray[float32]]:
+    """
+    An internal cache of the digital values which the analog clipping bounds map to
+
+    - Clipping digital values within the bounds is equivalent to
+      clipping the de-quantized values by `H273.clip_analog`
+    """
+
+    scale, offset = _get_quantization_parameters(full_range, bit_depths, is_ycbcr)
+    lower = (offset + scale * ([0.0, -0.5, -0.5] if is_ycbcr else 0.0)).astype(float32)
+    upper = (offset + scale * ([1.0, +0.5, +0.5] if is_ycbcr else 1.0)).astype(float32)
+
+    lower.setflags(write=False)
+    upper.setflags(write=False)
+    return (lower, upper)
+
+
+@lru_cache(maxsize=None)
+def _get_luma_coefficients(
+    kr: float,
+    kb: float,
+    full_range_rgb: bool,
+    full_range_y: bool,
+    bit_depth_rgb: int,
+    bit_depth_y: int,
+    quantize: bool,
+) -> Tuple[NDArray[float32], float]:
+    """
+    An internal cache of the coefficients and offset of `H273.luma_from_rgb`
+
+    - Formula: `luma = values @ coefficients + offset`
+    """
+
+    if quantize:
+        transformation_matrix, _ = _get_ycbcr_transformation_matrices(
+            kr,
+            kb,
+            full_range_rgb,
+            full_range_y,
+            bit_depth_rgb,
+            bit_depth_y,
+            bit_depth_y,
+            bit_depth_y,
+        )
+        coefficients = transformation_matrix[0, :3].copy()
+        offset = float(transformation_matrix[0, 3])
+    else:
+        scale_rgb, offset_rgb = _get_quantization_parameters(
+            full_range_rgb, (bit_depth_rgb,) * 3, False
+        )
+        ypbpr_matrix, _ = _get_ypbpr_transformation_matrices(kr, kb)
+        coefficients = ypbpr_matrix[0].astype(float64) / scale_rgb
+        offset = float(-(coefficients @ offset_rgb))
+        coefficients = coefficients.astype(float32)
+
+    coefficients.setflags(write=False)
+    return (coefficients, offset)
+
+
+@lru_cache(maxsize=None)
+def _get_ycbcr_transformation_matrices(
+    kr: float,
+    kb: float,
+    full_range_rgb: bool,
+    full_range_ycbcr: bool,
+    bit_depth_rgb: int,
+    bit_depth_y: int,
+    bit_depth_cb: int,
+    bit_depth_cr: int,
+) -> Tuple[NDArray[float32], NDArray[float32]]:
+    """
+    An internal cache of `H273.get_ycbcr_transformation_matrix`
+    and `H273.get_rgb_transformation_matrix`
+    """
+
+    from numpy import concatenate, diag, linalg
+
+    scale_rgb, offset_rgb = _get_quantization_parameters(
+        full_range_rgb, (bit_depth_rgb,) * 3, False
+    )
+    scale_ycbcr, offset_ycbcr = _get_quantization_parameters(
+        full_range_ycbcr, (bit_depth_y, bit_depth_cb, bit_depth_cr), True
+    )
+    ypbpr_matrix, _ = _get_ypbpr_transformation_matrices(kr, kb)
+    ypbpr_matrix = ypbpr_matrix.astype(float64)
+
+    # Compose the matrices in the order of de-quantization, transformation and quantization
+    matrix = diag(scale_ycbcr) @ ypbpr_matrix @ diag(1 / scale_rgb)
+    offset = offset_ycbcr - matrix @ offset_rgb
+    inverse_matrix = linalg.inv(matrix)
+    inverse_offset = offset_rgb - inverse_matrix @ offset_ycbcr
+
+    transformation_matrix = concatenate([matrix, offset[:, None]], axis=1)
+    inverse_transformation_matrix = concatenate(
+        [inverse_matrix, inverse_offset[:, None]], axis=1
+    )
+    transformation_matrix = transformation_matrix.astype(float32)
+    inverse_transformation_matrix = inverse_transformation_matrix.astype(float32)
+
+    transformation_matrix.setflags(write=False)
+    inverse_transformation_matrix.setflags(write=False)
+    return (transformation_matrix, inverse_transformation_matrix)
@@ -1,5 +1,12 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from mmap import mmap
+from numpy import dtype as DType
 from numpy.typing import ArrayLike, NDArray
-from typing import BinaryIO, Iterable, Tuple, Union
+from os import PathLike
+from queue import Queue
+from threading import Event, Thread
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union
 
 from ..modules.typing import get_uint_type
 
@@ -34,6 +41,8 @@ def load_ycbcr_image(
     from io import BufferedIOBase, RawIOBase
     from numpy import frombuffer, ceil, uint8
 
+    from .sample import get_subsampling_factors
+
     bit_per_pixel_y, bit_per_pixel_cb, bit_per_pixel_cr = map(
         int, (bit_per_pixel_y, bit_per_pixel_cb, bit_per_pixel_cr)
     )
@@ -58,8 +67,7 @@ def load_ycbcr_image(
 
     # Calculate the number of pixels in each plane
     h_luma, v_luma = size
-    j, a, b = subsampling_scheme
-    dh, dv = j // a, j // (a + b)
+    dv, dh = get_subsampling_factors(subsampling_scheme)
     h_chroma, v_chroma = int(ceil(h_luma / dh)), int(ceil(v_luma / dv))
     pixels_y, pixels_cb, pixels_cr = (
         h_luma * v_luma,
@@ -105,10 +113,11 @@ def save_ycbcr_image(
     ## Details
     - The arrays in `planes` will be represented as byte sequences and
       be written to the device in the order Y, Cb, Cr.
+    - To write the frames in a background thread, see `YCbCrFrameWriter`
     """
 
     from io import BufferedIOBase, RawIOBase
-    from numpy import asarray
+    from numpy import ascontiguousarray
 
     if not device.writable():
         raise ValueError("The device is not writable")
@@ -118,12 +127,13 @@ def save_ycbcr_image(
         raise ValueError("The number of planes must be 3")
 
     for plane in planes:
-        plane = asarray(plane)
+        plane = ascontiguousarray(plane)
 
         if plane.ndim < 2:
             raise ValueError("The minimum dimension of the plane is 2")
 
-        device.write(plane.tobytes())
+        # The memory of the contiguous planes is written without copying
+        device.write(memoryview(plane).cast("B"))
 
 
 def planar_from_packed(packed_data: ArrayLike) -> Union[NDArray, Iterable[NDArray]]:
@@ -162,3 +172,1969 @@ def packed_from_planar(planar_data: Union[NDArray, Iterable[NDArray]]) -> NDArra
     packed_data = moveaxis(planar_data, 0, -1)
 
     return packed_data
+
+
+def load_interleaved_ycbcr_image(
+    device: BinaryIO,
+    size: Tuple[int, int],
+    layout: str,
+    bit_depth: int = 8,
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    Load a YCbCr image in an interleaved layout from a readable device.
+
+    ## Parameters
+    - `device`: A readable binary device to load the image from
+    - `size`: The width and height of the image
+    - `layout`: The interleaved layout of the image
+        - Search for the methods beginning with `INTERLEAVED_LAYOUT_` in this module
+    - `bit_depth`
+        - The bit depth of the samples
+        - The samples wider than 8 bits should be aligned
+          to the least significant bits, see `ycbcr_planes_from_interleaved`
+        - The default value is `8`
+
+    ## Returns
+    - A tuple of the Y, Cb, and Cr planes of the image
+        - Each plane is a writable strided view of the buffer of the image,
+          see `ycbcr_planes_from_interleaved`
+
+    ## Details
+    - The image is read into one buffer with `readinto`,
+      so there is no conversion pass.
+    """
+
+    from io import BufferedIOBase, RawIOBase
+
+    if not device.readable():
+        raise ValueError("The device is not readable")
+    if not isinstance(device, (BufferedIOBase, RawIOBase)):
+        raise ValueError("The device must be in binary mode")
+
+    buffer = bytearray(get_interleaved_size(size, layout, bit_depth))
+
+    if not _read_into(device, buffer):
+        raise ValueError("The device does not contain the whole image")
+    return ycbcr_planes_from_interleaved(buffer, size, layout, bit_depth)
+
+
+def save_interleaved_ycbcr_image(
+    device: BinaryIO,
+    planes: Tuple[ArrayLike, ArrayLike, ArrayLike],
+    layout: str,
+    bit_depth: int = 8,
+) -> None:
+    """
+    Save a YCbCr image in an interleaved layout to a writable device.
+
+    ## Parameters
+    - `device`: A writable binary device to save the image to
+    - `planes`: The Y, Cb, and Cr planes of the image
+        - The chroma planes are sub-sampled using the scheme of `layout`
+    - `layout`: The interleaved layout of the image
+        - Search for the methods beginning with `INTERLEAVED_LAYOUT_` in this module
+    - `bit_depth`
+        - The bit depth of the samples
+        - The samples wider than 8 bits should be aligned
+          to the least significant bits, see `ycbcr_planes_from_interleaved`
+        - The default value is `8`
+
+    ## Returns
+    - `None`
+    """
+
+    from io import BufferedIOBase, RawIOBase
+
+    if not device.writable():
+        raise ValueError("The device is not writable")
+    if not isinstance(device, (BufferedIOBase, RawIOBase)):
+        raise ValueError("The device must be in binary mode")
+
+    samples = interleaved_from_ycbcr_planes(planes, layout, bit_depth)
+    device.write(memoryview(samples).cast("B"))
+
+
+def ycbcr_planes_from_interleaved(
+    data: Union[bytes, bytearray, memoryview, NDArray],
+    size: Tuple[int, int],
+    layout: str,
+    bit_depth: int = 8,
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    Represent an image in an interleaved layout as the Y, Cb, and Cr planes.
+
+    ## Parameters
+    - `data`: The buffer of the image, such as `bytes` or a mapped file
+    - `size`: The width and height of the image
+    - `layout`: The interleaved layout of the image
+        - Search for the methods beginning with `INTERLEAVED_LAYOUT_` in this module
+    - `bit_depth`
+        - The bit depth of the samples
+        - The default value is `8`
+
+    ## Returns
+    - A tuple of the Y, Cb, and Cr planes of the image
+        - Each plane is a strided view of `data` without copying,
+          which is writable if `data` is writable
+
+    ## Details
+    - It is the equivalent of `planar_from_packed` for the YCbCr layouts
+    - The samples wider than 8 bits are little-endian 16-bit words
+      aligned to the least significant bits, as in P016 and Y216
+      or the 10-bit and 12-bit layouts with the unused high bits set to zero.
+    - The MSB-aligned layouts such as P010, P210 and Y210 are not supported
+      directly. Their words can be shifted in place before this function,
+      with `unpack_samples` and `SAMPLE_PACKING_MSB()`:
+
+        ```python
+        words = frombuffer(buffer, dtype=uint16)
+        unpack_samples(buffer, words.shape, 10, SAMPLE_PACKING_MSB(), out=words)
+        plane_y, plane_cb, plane_cr = ycbcr_planes_from_interleaved(
+            buffer, size, INTERLEAVED_LAYOUT_NV12(), 10
+        )
+        ```
+    """
+
+    from numpy import dtype, frombuffer
+
+    h, v = map(int, size)
+    sample_type = dtype(get_uint_type(int(bit_depth))).newbyteorder("<")
+    samples = frombuffer(
+        data,
+        dtype=sample_type,
+        count=get_interleaved_size(size, layout, bit_depth) // sample_type.itemsize,
+    )
+
+    if layout in (INTERLEAVED_LAYOUT_NV12(), INTERLEAVED_LAYOUT_NV21()):
+        v_chroma, h_chroma = -(-v // 2), -(-h // 2)
+        plane_y = samples[: v * h].reshape(v, h)
+        plane_cb, plane_cr = planar_from_packed(
+            samples[v * h :].reshape(v_chroma, h_chroma, 2)
+        )
+        if layout == INTERLEAVED_LAYOUT_NV21():
+            plane_cb, plane_cr = plane_cr, plane_cb
+        return (plane_y, plane_cb, plane_cr)
+
+    rows = samples.reshape(v, h * 2)
+    if layout == INTERLEAVED_LAYOUT_YUYV():
+        return (rows[:, 0::2], rows[:, 1::4], rows[:, 3::4])
+    return (rows[:, 1::2], rows[:, 0::4], rows[:, 2::4])
+
+
+def interleaved_from_ycbcr_planes(
+    planes: Tuple[ArrayLike, ArrayLike, ArrayLike],
+    layout: str,
+    bit_depth: int = 8,
+    *,
+    out: Union[NDArray, None] = None,
+) -> NDArray:
+    """
+    Represent the Y, Cb, and Cr planes in an interleaved layout.
+
+    ## Parameters
+    - `planes`: The Y, Cb, and Cr planes of the image
+        - The chroma planes are sub-sampled using the scheme of `layout`
+    - `layout`: The interleaved layout of the image
+        - Search for the methods beginning with `INTERLEAVED_LAYOUT_` in this module
+    - `bit_depth`
+        - The bit depth of the samples
+        - The default value is `8`
+    - `out`
+        - An optional contiguous array to store the samples
+        - It should be in the shape of `(get_interleaved_size(...) // itemsize,)`
+
+    ## Returns
+    - The samples of the image in one contiguous array (`NDArray`)
+        - The samples wider than 8 bits are little-endian 16-bit words
+          aligned to the least significant bits,
+          see `ycbcr_planes_from_interleaved`
+
+    ## Details
+    - It is the equivalent of `packed_from_planar` for the YCbCr layouts
+    """
+
+    from numpy import asarray, dtype
+
+    from .buffer import get_output_array
+
+    if len(planes) != 3:
+        raise ValueError("The number of planes must be 3")
+
+    plane_y, plane_cb, plane_cr = map(asarray, planes)
+
+    if plane_y.ndim != 2:
+        raise ValueError("The dimension of the planes must be 2")
+
+    v, h = plane_y.shape
+    sample_type = dtype(get_uint_type(int(bit_depth))).newbyteorder("<")
+    size = get_interleaved_size((h, v), layout, bit_depth)
+    samples = get_output_array(
+        out, (size // sample_type.itemsize,), sample_type, contiguous=True
+    )
+
+    views = ycbcr_planes_from_interleaved(samples, (h, v), layout, bit_depth)
+    for view, plane in zip(views, (plane_y, plane_cb, plane_cr)):
+        if plane.shape != view.shape:
+            raise ValueError(f"The plane should be in the shape of {view.shape}")
+        view[...] = plane
+    return samples
+
+
+def get_interleaved_size(size: Tuple[int, int], layout: str, bit_depth: int = 8) -> int:
+    """
+    Get the number of bytes of an image in an interleaved layout.
+
+    ## Parameters
+    - `size`: The width and height of the image
+    - `layout`: The interleaved layout of the image
+        - Search for the methods beginning with `INTERLEAVED_LAYOUT_` in this module
+    - `bit_depth`
+        - The bit depth of the samples
+        - The default value is `8`
+
+    ## Returns
+    - The number of bytes (`int`)
+    """
+
+    from numpy import dtype
+
+    h, v = map(int, size)
+    bit_depth = int(bit_depth)
+
+    if not 8 <= bit_depth <= 16:
+        raise ValueError("The bit depth must be between 8 and 16")
+
+    itemsize = dtype(get_uint_type(bit_depth)).itemsize
+
+    if layout in (INTERLEAVED_LAYOUT_NV12(), INTERLEAVED_LAYOUT_NV21()):
+        return (v * h + -(-v // 2) * -(-h // 2) * 2) * itemsize
+    if layout in (INTERLEAVED_LAYOUT_YUYV(), INTERLEAVED_LAYOUT_UYVY()):
+        if h % 2 != 0:
+            raise ValueError("The width must be even for the packed 4:2:2 layouts")
+        return v * h * 2 * itemsize
+    raise ValueError(f"Unsupported interleaved layout: {layout}")
+
+
+def load_packed_ycbcr_image(
+    device: BinaryIO,
+    size: Tuple[int, int],
+    subsampling_scheme: Tuple[int, int, int],
+    bit_per_pixel_y: int = 10,
+    bit_per_pixel_cb: int = 10,
+    bit_per_pixel_cr: int = 10,
+    *,
+    packing: str = "tight",
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """
+    Load a YCbCr image with packed samples from a readable device.
+
+    ## Parameters
+    - `device`: A readable binary device to load the image from
+    - `size`: The width and height of the image
+    - `subsampling_scheme`: The sub-sampling scheme used for the image file
+        - Search for the methods beginning
+          with `SUBSAMPLING_SCHEME_` in the `sample` module
+    - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+        - The bits per pixel of the planes
+        - The default value is `10`
+    - `packing`: The packing layout of the samples
+        - Search for the methods beginning with `SAMPLE_PACKING_` in this module
+        - The default value is `SAMPLE_PACKING_TIGHT()`
+
+    ## Returns
+    - A tuple of the Y, Cb, and Cr planes of the image
+        - Each plane is a NumPy array of unsigned integers
+
+    ## Details
+    - The image file is assumed to be in the planar format,
+      or saved using `save_packed_ycbcr_image` function
+    """
+
+    from io import BufferedIOBase, RawIOBase
+    from numpy import frombuffer, uint8
+
+    from .sample import get_subsampling_factors
+
+    bit_depths = tuple(map(int, (bit_per_pixel_y, bit_per_pixel_cb, bit_per_pixel_cr)))
+
+    if not device.readable():
+        raise ValueError("The device is not readable")
+    if not isinstance(device, (BufferedIOBase, RawIOBase)):
+        raise ValueError("The device must be in binary mode")
+    if len(size) != 2:
+        raise ValueError("The number of sizes must be 2")
+
+    h_luma, v_luma = map(int, size)
+    dv, dh = get_subsampling_factors(subsampling_scheme)
+    h_chroma, v_chroma = -(-h_luma // dh), -(-v_luma // dv)
+    shapes = ((v_luma, h_luma), (v_chroma, h_chroma), (v_chroma, h_chroma))
+
+    planes = []
+    for shape, bit_depth in zip(shapes, bit_depths):
+        packed_size = get_packed_size(shape[0] * shape[1], bit_depth, packing)
+        data = device.read(packed_size)
+
+        if len(data) != packed_size:
+            raise ValueError("The device does not contain the whole image")
+
+        planes.append(
+            unpack_samples(frombuffer(data, dtype=uint8), shape, bit_depth, packing)
+        )
+    return tuple(planes)
+
+
+def save_packed_ycbcr_image(
+    device: BinaryIO,
+    planes: Tuple[ArrayLike, ArrayLike, ArrayLike],
+    bit_per_pixel_y: int = 10,
+    bit_per_pixel_cb: int = 10,
+    bit_per_pixel_cr: int = 10,
+    *,
+    packing: str = "tight",
+) -> None:
+    """
+    Save a YCbCr image with packed samples to a writable device.
+
+    ## Parameters
+    - `device`: A writable binary device to save the image to
+    - `planes`: The Y, Cb, and Cr planes of the image
+        - Each plane is an array of unsigned integers
+          with the minimum dimension of 2
+    - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+        - The bits per pixel of the planes
+        - The default value is `10`
+    - `packing`: The packing layout of the samples
+        - Search for the methods beginning with `SAMPLE_PACKING_` in this module
+        - The default value is `SAMPLE_PACKING_TIGHT()`
+
+    ## Returns
+    - `None`
+
+    ## Details
+    - The planes will be packed and written to the device in the order Y, Cb, Cr.
+    """
+
+    from io import BufferedIOBase, RawIOBase
+    from numpy import asarray
+
+    if not device.writable():
+        raise ValueError("The device is not writable")
+    if not isinstance(device, (BufferedIOBase, RawIOBase)):
+        raise ValueError("The device must be in binary mode")
+    if len(planes) != 3:
+        raise ValueError("The number of planes must be 3")
+
+    for plane, bit_depth in zip(
+        planes, (bit_per_pixel_y, bit_per_pixel_cb, bit_per_pixel_cr)
+    ):
+        plane = asarray(plane)
+
+        if plane.ndim < 2:
+            raise ValueError("The minimum dimension of the plane is 2")
+
+        device.write(pack_samples(plane, bit_depth, packing).data)
+
+
+class YCbCrFrame:
+    """
+    YCbCr frame in one contiguous buffer
+
+    ## Details
+    - The Y, Cb and Cr planes are stored back to back in one buffer,
+      in the same order as `save_ycbcr_image` function,
+      so loading, saving, hashing and sharing a frame
+      are single buffer operations without copying.
+    - The planes are contiguous views of the buffer
+    - It behaves as the tuple of its planes, so it can be passed
+      to the functions which accept `Tuple[NDArray, NDArray, NDArray]`.
+
+    ## Examples
+
+        ```python
+        from hashlib import sha256
+
+        with open(path, "rb") as device:
+            frame = YCbCrFrame.load(device, (176, 144), SUBSAMPLING_SCHEME_420())
+        plane_y, plane_cb, plane_cr = frame
+        digest = sha256(frame.buffer).hexdigest()
+        ```
+    """
+
+    __slots__ = ("_bit_depths", "_buffer", "_planes", "_size", "_subsampling_scheme")
+
+    _bit_depths: Tuple[int, int, int]
+    _buffer: NDArray
+    _planes: Tuple[NDArray, NDArray, NDArray]
+    _size: Tuple[int, int]
+    _subsampling_scheme: Tuple[int, int, int]
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        subsampling_scheme: Tuple[int, int, int],
+        bit_per_pixel_y: int = 8,
+        bit_per_pixel_cb: int = 8,
+        bit_per_pixel_cr: int = 8,
+        *,
+        buffer: Union[bytearray, memoryview, NDArray, None] = None,
+    ) -> None:
+        """
+        ## Parameters
+        - `size`: The width and height of the frame
+        - `subsampling_scheme`: The sub-sampling scheme of the frame
+            - Search for the methods beginning
+              with `SUBSAMPLING_SCHEME_` in the `sample` module
+        - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+            - The bits per pixel of the planes
+            - The default value is `8`
+        - `buffer`
+            - An optional buffer to store the frame, such as a shared memory
+            - It should have at least `frame_size` bytes
+            - The default value is `None`, which allocates a new buffer
+              with undefined contents
+        """
+
+        from numpy import empty, frombuffer, ndarray, uint8
+
+        bit_depths = tuple(
+            map(int, (bit_per_pixel_y, bit_per_pixel_cb, bit_per_pixel_cr))
+        )
+        shapes, dtypes, offsets, frame_size = _get_ycbcr_frame_layout(
+            size, subsampling_scheme, *bit_depths
+        )
+
+        if buffer is None:
+            buffer = empty(frame_size, dtype=uint8)
+        elif memoryview(buffer).nbytes < frame_size:
+            raise ValueError(f"The buffer should have at least {frame_size} bytes")
+        else:
+            buffer = frombuffer(buffer, dtype=uint8, count=frame_size)
+
+        self._bit_depths = bit_depths
+        self._buffer = buffer
+        self._planes = tuple(
+            ndarray(shape, dtype=plane_dtype, buffer=buffer, offset=offset)
+            for shape, plane_dtype, offset in zip(shapes, dtypes, offsets)
+        )
+        self._size = tuple(map(int, size))
+        self._subsampling_scheme = tuple(map(int, subsampling_scheme))
+
+    def __getitem__(self, index: int) -> NDArray:
+        return self._planes[index]
+
+    def __iter__(self) -> Iterator[NDArray]:
+        return iter(self._planes)
+
+    def __len__(self) -> int:
+        return 3
+
+    def __repr__(self) -> str:
+        return (
+            f"YCbCrFrame(size={self._size}, "
+            f"subsampling_scheme={self._subsampling_scheme}, "
+            f"bit_depths={self._bit_depths})"
+        )
+
+    @classmethod
+    def from_planes(
+        cls,
+        planes: Tuple[ArrayLike, ArrayLike, ArrayLike],
+        subsampling_scheme: Tuple[int, int, int],
+        bit_per_pixel_y: int = 8,
+        bit_per_pixel_cb: int = 8,
+        bit_per_pixel_cr: int = 8,
+    ) -> "YCbCrFrame":
+        """
+        Create a frame by copying the planes
+
+        ## Parameters
+        - `planes`: The Y, Cb, and Cr planes of the frame
+            - The chroma planes are sub-sampled using `subsampling_scheme`
+        - `subsampling_scheme`: The sub-sampling scheme of the frame
+        - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+            - The bits per pixel of the planes
+            - The default value is `8`
+
+        ## Returns
+        - A new frame (`YCbCrFrame`)
+        """
+
+        from numpy import asarray
+
+        if len(planes) != 3:
+            raise ValueError("The number of planes must be 3")
+
+        planes = tuple(map(asarray, planes))
+
+        if planes[0].ndim != 2:
+            raise ValueError("The dimension of the planes must be 2")
+
+        v, h = planes[0].shape
+        frame = cls(
+            (h, v),
+            subsampling_scheme,
+            bit_per_pixel_y,
+            bit_per_pixel_cb,
+            bit_per_pixel_cr,
+        )
+
+        for view, plane in zip(frame, planes):
+            if plane.shape != view.shape:
+                raise ValueError(f"The plane should be in the shape of {view.shape}")
+            view[...] = plane
+        return frame
+
+    @classmethod
+    def load(
+        cls,
+        device: BinaryIO,
+        size: Tuple[int, int],
+        subsampling_scheme: Tuple[int, int, int],
+        bit_per_pixel_y: int = 8,
+        bit_per_pixel_cb: int = 8,
+        bit_per_pixel_cr: int = 8,
+    ) -> "YCbCrFrame":
+        """
+        Load a frame from a readable device with one `readinto`
+
+        ## Parameters
+        - `device`: A readable binary device to load the frame from
+        - `size`: The width and height of the frame
+        - `subsampling_scheme`: The sub-sampling scheme of the frame
+        - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+            - The bits per pixel of the planes
+            - The default value is `8`
+
+        ## Returns
+        - A new frame (`YCbCrFrame`)
+
+        ## Details
+        - The file is assumed to be in the planar format,
+          or saved using `save_ycbcr_image` function
+        """
+
+        from io import BufferedIOBase, RawIOBase
+
+        if not device.readable():
+            raise ValueError("The device is not readable")
+        if not isinstance(device, (BufferedIOBase, RawIOBase)):
+            raise ValueError("The device must be in binary mode")
+
+        frame = cls(
+            size,
+            subsampling_scheme,
+            bit_per_pixel_y,
+            bit_per_pixel_cb,
+            bit_per_pixel_cr,
+        )
+
+        if not _read_into(device, frame.buffer):
+            raise ValueError("The device does not contain the whole frame")
+        return frame
+
+    def save(self, device: BinaryIO) -> None:
+        """
+        Save the frame to a writable device with one `write`
+
+        ## Parameters
+        - `device`: A writable binary device to save the frame to
+
+        ## Details
+        - The frame is saved in the same format as `save_ycbcr_image` function
+        """
+
+        from io import BufferedIOBase, RawIOBase
+
+        if not device.writable():
+            raise ValueError("The device is not writable")
+        if not isinstance(device, (BufferedIOBase, RawIOBase)):
+            raise ValueError("The device must be in binary mode")
+
+        device.write(self.buffer)
+
+    def copy(self) -> "YCbCrFrame":
+        """
+        Copy the frame into a new buffer
+        """
+
+        frame = YCbCrFrame(self._size, self._subsampling_scheme, *self._bit_depths)
+        frame._buffer[...] = self._buffer
+        return frame
+
+    @property
+    def bit_depths(self) -> Tuple[int, int, int]:
+        """
+        Get the bit depths of the Y, Cb, and Cr planes
+        """
+
+        return self._bit_depths
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        Get the bytes of the frame as a writable memory view
+        """
+
+        return memoryview(self._buffer)
+
+    @property
+    def planes(self) -> Tuple[NDArray, NDArray, NDArray]:
+        """
+        Get the Y, Cb, and Cr planes as the views of the buffer
+        """
+
+        return self._planes
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """
+        Get the width and height of the frame
+        """
+
+        return self._size
+
+    @property
+    def subsampling_scheme(self) -> Tuple[int, int, int]:
+        """
+        Get the sub-sampling scheme of the frame
+        """
+
+        return self._subsampling_scheme
+
+
+class YCbCrSequence:
+    """
+    Memory-mapped sequence of YCbCr frames in a raw planar file
+
+    ## Details
+    - The file is assumed to be a concatenation of frames
+      saved using `save_ycbcr_image` function, such as a `.yuv` file
+    - The file is mapped into the memory without being read,
+      so opening a sequence takes constant time regardless of its size.
+    - The offsets of the frames and planes are computed from the size,
+      sub-sampling scheme and bit depths, so any frame is accessed
+      in constant time regardless of its position in the file.
+    - The planes are read-only views of the mapped file,
+      and the pages are read by the operating system on first access.
+    - If `writable` is specified, the planes are writable views,
+      and the changes are written back to the file by the operating system.
+    - If `count` is specified, the file is created or resized to `count` frames,
+      so the frames of an output file can be written in any order
+      with no system calls per frame.
+    - A trailing incomplete frame is ignored
+
+    ## Examples
+
+        ```python
+        with YCbCrSequence(
+            "foreman_qcif_0-2_ycbcr.yuv420p.176x144.yuv",
+            (176, 144),
+            SUBSAMPLING_SCHEME_420(),
+        ) as sequence:
+            plane_y, plane_cb, plane_cr = sequence[len(sequence) - 1]
+            planes_y, planes_cb, planes_cr = sequence[::2]
+        ```
+    """
+
+    _file: BinaryIO
+    _frame_size: int
+    _map: Union[mmap, None]
+    _planes: Tuple[NDArray, NDArray, NDArray]
+
+    def __init__(
+        self,
+        path: Union[str, PathLike],
+        size: Tuple[int, int],
+        subsampling_scheme: Tuple[int, int, int],
+        bit_per_pixel_y: int = 8,
+        bit_per_pixel_cb: int = 8,
+        bit_per_pixel_cr: int = 8,
+        *,
+        writable: bool = False,
+        count: Union[int, None] = None,
+    ) -> None:
+        """
+        ## Parameters
+        - `path`: The path of the file to map
+        - `size`: The width and height of the frames
+        - `subsampling_scheme`: The sub-sampling scheme used for the file
+            - Search for the methods beginning
+              with `SUBSAMPLING_SCHEME_` in the `sample` module
+        - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+            - The bits per pixel of the planes
+            - The default value is `8`
+        - `writable`
+            - Whether the planes are writable
+            - The default value is `False`
+        - `count`
+            - The number of frames to resize the file to
+            - The file is created if it does not exist, and the planes are writable
+            - The default value is `None`, which keeps the file
+        """
+
+        from mmap import ACCESS_READ, ACCESS_WRITE
+        from numpy import empty, frombuffer, ndarray, uint8
+        from os import O_CREAT, O_RDWR, fstat, ftruncate
+        from os import open as open_descriptor
+
+        if count is not None and int(count) < 0:
+            raise ValueError("The number of frames must be at least 0")
+
+        shapes, dtypes, offsets, frame_size = _get_ycbcr_frame_layout(
+            size,
+            subsampling_scheme,
+            bit_per_pixel_y,
+            bit_per_pixel_cb,
+            bit_per_pixel_cr,
+        )
+
+        writable = writable or count is not None
+        if count is None:
+            self._file = open(path, "r+b" if writable else "rb")
+        else:
+            self._file = open(open_descriptor(path, O_RDWR | O_CREAT, 0o666), "r+b")
+        self._frame_size = frame_size
+        self._map = None
+
+        try:
+            if count is not None:
+                ftruncate(self._file.fileno(), int(count) * frame_size)
+            count = fstat(self._file.fileno()).st_size // frame_size
+            if count > 0:
+                self._map = mmap(
+                    self._file.fileno(),
+                    0,
+                    access=ACCESS_WRITE if writable else ACCESS_READ,
+                )
+        except BaseException:
+            self._file.close()
+            raise
+
+        # Each plane of all the frames is a strided view of the mapped file.
+        # The views refer to the mapping through `frombuffer`, which keeps
+        # the mapping exported, so it is not unmapped while they are in use.
+        buffer = None if self._map is None else frombuffer(self._map, dtype=uint8)
+        planes = []
+        for (v, h), plane_dtype, offset in zip(shapes, dtypes, offsets):
+            if self._map is None:
+                planes.append(empty((0, v, h), dtype=plane_dtype))
+            else:
+                planes.append(
+                    ndarray(
+                        (count, v, h),
+                        dtype=plane_dtype,
+                        buffer=buffer,
+                        offset=offset,
+                        strides=(
+                            frame_size,
+                            h * plane_dtype.itemsize,
+                            plane_dtype.itemsize,
+                        ),
+                    )
+                )
+        self._planes = tuple(planes)
+
+    def __enter__(self) -> "YCbCrSequence":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._planes[0])
+
+    def __getitem__(self, index: Union[int, slice]) -> Tuple[NDArray, NDArray, NDArray]:
+        """
+        Get the Y, Cb and Cr planes of a frame or frames
+
+        ## Parameters
+        - `index`: The index of a frame, or a slice of frames
+
+        ## Returns
+        - A tuple of the Y, Cb, and Cr planes
+            - Each plane is a view in the shape of `(V, H)`,
+              or `(N, V, H)` for a slice
+        """
+
+        return (self._planes[0][index], self._planes[1][index], self._planes[2][index])
+
+    def __iter__(self) -> Iterator[Tuple[NDArray, NDArray, NDArray]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def frame_size(self) -> int:
+        """
+        Get the number of bytes of each frame
+        """
+
+        return self._frame_size
+
+    def flush(self) -> None:
+        """
+        Write the changes of the planes back to the file
+        """
+
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self) -> None:
+        """
+        Close the file and release the planes
+
+        ## Details
+        - The views returned before closing keep the mapping alive
+          until they are released, so they remain valid.
+        """
+
+        from numpy import empty
+
+        self._planes = tuple(
+            empty((0, *plane.shape[1:]), dtype=plane.dtype) for plane in self._planes
+        )
+        self._file.close()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # The views still export the mapping, which is unmapped
+                # when the last of them is released
+                pass
+            self._map = None
+
+
+class YCbCrFrameReader:
+    """
+    Sequential reader of YCbCr frames into reusable buffers
+
+    ## Details
+    - The file is assumed to be a concatenation of frames
+      saved using `save_ycbcr_image` function, such as a `.yuv` file
+    - Each frame is read into a preallocated `bytearray` with `readinto`,
+      so no memory is allocated per frame.
+    - The planes are writable views of the buffer,
+      which are valid until the next call to `read`.
+    - If `double_buffered` is specified, the next frame is read into
+      another buffer by a background thread while the current frame
+      is processed. The device should not be used by others meanwhile.
+
+    ## Examples
+
+        ```python
+        with open(path, "rb") as device, YCbCrFrameReader(
+            device, (176, 144), SUBSAMPLING_SCHEME_420(), double_buffered=True
+        ) as reader:
+            for plane_y, plane_cb, plane_cr in reader:
+                ...
+        ```
+    """
+
+    _buffers: List[Tuple[bytearray, Tuple[NDArray, NDArray, NDArray]]]
+    _device: BinaryIO
+    _executor: Union[ThreadPoolExecutor, None]
+    _frame_size: int
+    _index: int
+    _pending: Union[Future, None]
+
+    def __init__(
+        self,
+        device: BinaryIO,
+        size: Tuple[int, int],
+        subsampling_scheme: Tuple[int, int, int],
+        bit_per_pixel_y: int = 8,
+        bit_per_pixel_cb: int = 8,
+        bit_per_pixel_cr: int = 8,
+        *,
+        double_buffered: bool = False,
+    ) -> None:
+        """
+        ## Parameters
+        - `device`: A readable binary device to load the frames from
+        - `size`: The width and height of the frames
+        - `subsampling_scheme`: The sub-sampling scheme used for the frames
+            - Search for the methods beginning
+              with `SUBSAMPLING_SCHEME_` in the `sample` module
+        - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+            - The bits per pixel of the planes
+            - The default value is `8`
+        - `double_buffered`
+            - Whether to read the next frame in the background
+            - The default value is `False`
+        """
+
+        from io import BufferedIOBase, RawIOBase
+        from numpy import ndarray
+
+        if not device.readable():
+            raise ValueError("The device is not readable")
+        if not isinstance(device, (BufferedIOBase, RawIOBase)):
+            raise ValueError("The device must be in binary mode")
+
+        shapes, dtypes, offsets, frame_size = _get_ycbcr_frame_layout(
+            size,
+            subsampling_scheme,
+            bit_per_pixel_y,
+            bit_per_pixel_cb,
+            bit_per_pixel_cr,
+        )
+
+        self._buffers = []
+        for _ in range(2 if double_buffered else 1):
+            buffer = bytearray(frame_size)
+            planes = tuple(
+                ndarray(shape, dtype=plane_dtype, buffer=buffer, offset=offset)
+                for shape, plane_dtype, offset in zip(shapes, dtypes, offsets)
+            )
+            self._buffers.append((buffer, planes))
+
+        self._device = device
+        self._executor = (
+            ThreadPoolExecutor(1, "YCbCrFrameReader") if double_buffered else None
+        )
+        self._frame_size = frame_size
+        self._index = 0
+        self._pending = None
+
+    def __enter__(self) -> "YCbCrFrameReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Tuple[NDArray, NDArray, NDArray]]:
+        while True:
+            planes = self.read()
+            if planes is None:
+                return
+            yield planes
+
+    @property
+    def frame_size(self) -> int:
+        """
+        Get the number of bytes of each frame
+        """
+
+        return self._frame_size
+
+    def read(self) -> Union[Tuple[NDArray, NDArray, NDArray], None]:
+        """
+        Read the next frame
+
+        ## Returns
+        - A tuple of the Y, Cb, and Cr planes of the frame
+            - Each plane is a writable view of the buffer,
+              which is overwritten by the next call to `read`
+        - `None` if there are no more frames
+        """
+
+        if self._executor is None:
+            buffer, planes = self._buffers[0]
+            return planes if _read_into(self._device, buffer) else None
+
+        if self._pending is None:
+            self._pending = self._executor.submit(
+                _read_into, self._device, self._buffers[self._index][0]
+            )
+        if not self._pending.result():
+            return None
+
+        _, planes = self._buffers[self._index]
+        self._index ^= 1
+        self._pending = self._executor.submit(
+            _read_into, self._device, self._buffers[self._index][0]
+        )
+        return planes
+
+    def close(self) -> None:
+        """
+        Stop reading in the background
+
+        ## Details
+        - The device is not closed
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+@dataclass(frozen=True)
+class Y4MHeader:
+    """
+    Stream header of the YUV4MPEG2 (Y4M) format
+
+    ## Details
+    - It describes the frames of a Y4M stream,
+      so the size, sub-sampling scheme and bit depth are not passed by hand.
+    - The samples wider than 8 bits are stored as little-endian 16-bit words.
+    - The colour spaces `420`, `422` and `444` with the bit depths of 8 to 16
+      are supported. The chroma siting of `4:2:0` is not kept,
+      and it is written as `420jpeg`.
+
+    ## References
+    - [YUV4MPEG2](https://wiki.multimedia.cx/index.php/YUV4MPEG2)
+    """
+
+    size: Tuple[int, int]
+    """The width and height of the frames"""
+
+    subsampling_scheme: Tuple[int, int, int] = (4, 2, 0)
+    """The sub-sampling scheme of the frames"""
+
+    bit_depth: int = 8
+    """The bit depth of the samples of all the planes"""
+
+    frame_rate: Tuple[int, int] = (25, 1)
+    """The numerator and denominator of the frame rate"""
+
+    interlacing: str = "p"
+    """The interlacing mode, `p` for progressive"""
+
+    aspect_ratio: Tuple[int, int] = (0, 0)
+    """The pixel aspect ratio, `(0, 0)` for unknown"""
+
+    parameters: Tuple[str, ...] = ()
+    """The other parameters, such as the `X` comments, without changes"""
+
+    def __post_init__(self) -> None:
+        if len(self.size) != 2 or min(self.size) <= 0:
+            raise ValueError("The width and height must be greater than 0")
+        if not 8 <= self.bit_depth <= 16:
+            raise ValueError("The bit depth must be between 8 and 16")
+        if tuple(self.subsampling_scheme) not in _get_y4m_schemes().values():
+            raise ValueError(
+                f"Unsupported sub-sampling scheme: {self.subsampling_scheme}"
+            )
+
+    @property
+    def colorspace(self) -> str:
+        """
+        Get the colour space parameter, such as `420jpeg` or `422p10`
+        """
+
+        names = {scheme: name for name, scheme in _get_y4m_schemes().items()}
+        name = names[tuple(self.subsampling_scheme)]
+
+        if self.bit_depth == 8:
+            return "420jpeg" if name == "420" else name
+        return f"{name}p{self.bit_depth}"
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Y4MHeader":
+        """
+        Parse a stream header
+
+        ## Parameters
+        - `data`: The header line, with or without the trailing newline
+
+        ## Returns
+        - The stream header (`Y4MHeader`)
+        """
+
+        tokens = data.rstrip(b"\n").decode("ascii").split(" ")
+
+        if tokens[0] != "YUV4MPEG2":
+            raise ValueError("The stream is not in the YUV4MPEG2 format")
+
+        width = height = None
+        colorspace = "420jpeg"
+        keywords = {}
+        parameters = []
+
+        for token in tokens[1:]:
+            key, value = token[:1], token[1:]
+            if key == "W":
+                width = int(value)
+            elif key == "H":
+                height = int(value)
+            elif key == "C":
+                colorspace = value
+            elif key == "F":
+                keywords["frame_rate"] = tuple(map(int, value.split(":")))
+            elif key == "I":
+                keywords["interlacing"] = value
+            elif key == "A":
+                keywords["aspect_ratio"] = tuple(map(int, value.split(":")))
+            elif token:
+                parameters.append(token)
+
+        if width is None or height is None:
+            raise ValueError("The width and height are missing in the header")
+
+        schemes = _get_y4m_schemes()
+        name, suffix = colorspace[:3], colorspace[3:]
+
+        if name in schemes and suffix[:1] == "p" and suffix[1:].isdigit():
+            bit_depth = int(suffix[1:])
+        elif name in schemes and suffix in ("", "jpeg", "mpeg2", "paldv"):
+            bit_depth = 8
+        else:
+            raise ValueError(f"Unsupported colour space: {colorspace}")
+
+        return cls(
+            (width, height),
+            schemes[name],
+            bit_depth,
+            parameters=tuple(parameters),
+            **keywords,
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Represent the stream header
+
+        ## Returns
+        - The header line with the trailing newline (`bytes`)
+        """
+
+        tokens = [
+            "YUV4MPEG2",
+            f"W{self.size[0]}",
+            f"H{self.size[1]}",
+            f"F{self.frame_rate[0]}:{self.frame_rate[1]}",
+            f"I{self.interlacing}",
+            f"A{self.aspect_ratio[0]}:{self.aspect_ratio[1]}",
+            f"C{self.colorspace}",
+            *self.parameters,
+        ]
+        return (" ".join(tokens) + "\n").encode("ascii")
+
+
+class Y4MReader:
+    """
+    Streaming reader of the YUV4MPEG2 (Y4M) format
+
+    ## Details
+    - The stream header is parsed once on construction.
+    - Iterating the reader yields the Y, Cb and Cr planes of each frame.
+      Each frame is read into a new buffer with `readinto`,
+      and the planes are writable views of the buffer.
+    - If `prefetch` is specified, a background thread reads up to `prefetch`
+      frames ahead into a bounded queue while the frames are processed,
+      so the memory is bounded by the size of the queue.
+      The device should not be used by others meanwhile.
+    - Once the stream has ended, failed or been closed,
+      iterating again yields no frames or raises the same error.
+
+    ## Examples
+
+        ```python
+        with open(path, "rb") as device, Y4MReader(device, prefetch=4) as reader:
+            size = reader.header.size
+            for plane_y, plane_cb, plane_cr in reader:
+                ...
+        ```
+    """
+
+    _device: BinaryIO
+    _ended: bool
+    _error: Union[BaseException, None]
+    _header: Y4MHeader
+    _layout: Tuple[Tuple[Tuple[int, int], ...], Tuple[DType, ...], Tuple[int, ...], int]
+    _queue: Union[Queue, None]
+    _stopped: Event
+    _thread: Union[Thread, None]
+
+    def __init__(self, device: BinaryIO, *, prefetch: int = 0) -> None:
+        """
+        ## Parameters
+        - `device`: A readable binary device to load the stream from
+        - `prefetch`
+            - The maximum number of frames read ahead in the background
+            - The default value is `0`, which reads the frames on demand
+        """
+
+        from io import BufferedIOBase, RawIOBase
+
+        prefetch = int(prefetch)
+
+        if not device.readable():
+            raise ValueError("The device is not readable")
+        if not isinstance(device, (BufferedIOBase, RawIOBase)):
+            raise ValueError("The device must be in binary mode")
+        if prefetch < 0:
+            raise ValueError("The number of prefetched frames must be at least 0")
+
+        self._device = device
+        self._ended = False
+        self._error = None
+        self._header = Y4MHeader.from_bytes(device.readline())
+        self._layout = _get_ycbcr_frame_layout(
+            self._header.size,
+            self._header.subsampling_scheme,
+            *(self._header.bit_depth,) * 3,
+        )
+        self._queue = None
+        self._stopped = Event()
+        self._thread = None
+
+        if prefetch > 0:
+            self._queue = Queue(prefetch)
+            self._thread = Thread(target=self._prefetch, name="Y4MReader", daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> "Y4MReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Tuple[NDArray, NDArray, NDArray]]:
+        if self._queue is None:
+            while True:
+                planes = self._read()
+                if planes is None:
+                    return
+                yield planes
+
+        # The end and the error are remembered,
+        # since the thread has exited and nothing more is queued
+        while not self._ended:
+            planes = self._queue.get()
+            if planes is None or isinstance(planes, BaseException):
+                self._ended = True
+                self._error = planes
+                break
+            yield planes
+
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def header(self) -> Y4MHeader:
+        """
+        Get the stream header
+        """
+
+        return self._header
+
+    def close(self) -> None:
+        """
+        Stop reading in the background
+
+        ## Details
+        - The device is not closed
+        - The frames read ahead are discarded
+        """
+
+        from queue import Empty
+
+        self._stopped.set()
+
+        if self._thread is not None:
+            # The queue is drained, so the thread is not blocked on it
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.01)
+                except Empty:
+                    pass
+            self._thread.join()
+            self._ended = True
+
+    def _prefetch(self) -> None:
+        """
+        An internal method which reads the frames into the queue
+        """
+
+        try:
+            while not self._stopped.is_set():
+                planes = self._read()
+                self._queue.put(planes)
+                if planes is None:
+                    return
+        except BaseException as error:
+            self._queue.put(error)
+
+    def _read(self) -> Union[Tuple[NDArray, NDArray, NDArray], None]:
+        """
+        An internal method which reads the next frame
+
+        - It returns `None` at the end of the stream.
+        """
+
+        from numpy import ndarray
+
+        frame_header = self._device.readline()
+
+        if not frame_header:
+            return None
+        if not frame_header.startswith(b"FRAME"):
+            raise ValueError("The frame header is missing")
+
+        shapes, dtypes, offsets, frame_size = self._layout
+        buffer = bytearray(frame_size)
+
+        if not _read_into(self._device, buffer):
+            raise ValueError("The device does not contain the whole frame")
+
+        return tuple(
+            ndarray(
+                shape, dtype=plane_dtype.newbyteorder("<"), buffer=buffer, offset=offset
+            )
+            for shape, plane_dtype, offset in zip(shapes, dtypes, offsets)
+        )
+
+
+class Y4MWriter:
+    """
+    Streaming writer of the YUV4MPEG2 (Y4M) format
+
+    ## Details
+    - The stream header is written on construction,
+      and each frame is written with its frame header.
+
+    ## Examples
+
+        ```python
+        header = Y4MHeader((176, 144), SUBSAMPLING_SCHEME_420(), frame_rate=(30, 1))
+        with open(path, "wb") as device:
+            writer = Y4MWriter(device, header)
+            for planes in frames:
+                writer.write(planes)
+        ```
+    """
+
+    _device: BinaryIO
+    _header: Y4MHeader
+    _shapes: Tuple[Tuple[int, int], ...]
+
+    def __init__(self, device: BinaryIO, header: Y4MHeader) -> None:
+        """
+        ## Parameters
+        - `device`: A writable binary device to save the stream to
+        - `header`: The stream header
+        """
+
+        from io import BufferedIOBase, RawIOBase
+
+        if not device.writable():
+            raise ValueError("The device is not writable")
+        if not isinstance(device, (BufferedIOBase, RawIOBase)):
+            raise ValueError("The device must be in binary mode")
+
+        shapes, _, _, _ = _get_ycbcr_frame_layout(
+            header.size, header.subsampling_scheme, *(header.bit_depth,) * 3
+        )
+
+        self._device = device
+        self._header = header
+        self._shapes = shapes
+        device.write(header.to_bytes())
+
+    @property
+    def header(self) -> Y4MHeader:
+        """
+        Get the stream header
+        """
+
+        return self._header
+
+    def write(self, planes: Tuple[ArrayLike, ArrayLike, ArrayLike]) -> None:
+        """
+        Write a frame
+
+        ## Parameters
+        - `planes`: The Y, Cb, and Cr planes of the frame
+            - Each plane is an array of unsigned integers
+              in the shape given by the stream header
+        """
+
+        from numpy import asarray, dtype
+
+        if len(planes) != 3:
+            raise ValueError("The number of planes must be 3")
+
+        plane_dtype = dtype(get_uint_type(self._header.bit_depth)).newbyteorder("<")
+        planes = [asarray(plane, dtype=plane_dtype, order="C") for plane in planes]
+
+        for plane, shape in zip(planes, self._shapes):
+            if plane.shape != shape:
+                raise ValueError(f"The plane should be in the shape of {shape}")
+
+        self._device.write(b"FRAME\n")
+        for plane in planes:
+            self._device.write(plane.data)
+
+
+class YCbCrFrameWriter:
+    """
+    Buffered writer of YCbCr frames in a background thread
+
+    ## Details
+    - The frames are written in the same format as `save_ycbcr_image` function
+    - The planes are queued as views without being copied,
+      and written from their memory by a background thread,
+      so the caller is not blocked by the device unless the queue is full.
+    - The planes should not be modified until they are written,
+      which is ensured by `flush` or `close`.
+    - The queued frames are gathered into one `os.writev` call
+      if the device has a file descriptor, so several frames are written
+      with one system call. Otherwise they are written with `device.write`.
+    - The device should not be used by others until the writer is closed
+    - An error of the background thread is raised by the next call,
+      and the frames after it are dropped.
+
+    ## Examples
+
+        ```python
+        with open(path, "wb") as device, YCbCrFrameWriter(device) as writer:
+            for planes in frames:
+                writer.write(planes)
+        ```
+    """
+
+    _batch_size: int
+    _device: BinaryIO
+    _error: Union[BaseException, None]
+    _failed: bool
+    _queue: Queue
+    _thread: Thread
+
+    def __init__(
+        self,
+        device: BinaryIO,
+        *,
+        queue_size: int = 8,
+        batch_size: int = 8,
+    ) -> None:
+        """
+        ## Parameters
+        - `device`: A writable binary device to save the frames to
+        - `queue_size`
+            - The maximum number of frames waiting to be written
+            - The default value is `8`
+        - `batch_size`
+            - The maximum number of frames gathered into one write
+            - The default value is `8`
+        """
+
+        from io import BufferedIOBase, RawIOBase
+
+        queue_size, batch_size = int(queue_size), int(batch_size)
+
+        if not device.writable():
+            raise ValueError("The device is not writable")
+        if not isinstance(device, (BufferedIOBase, RawIOBase)):
+            raise ValueError("The device must be in binary mode")
+        if queue_size <= 0 or batch_size <= 0:
+            raise ValueError("The queue size and batch size must be greater than 0")
+
+        self._batch_size = batch_size
+        self._device = device
+        self._error = None
+        self._failed = False
+        self._queue = Queue(queue_size)
+        self._thread = Thread(target=self._write, name="YCbCrFrameWriter", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "YCbCrFrameWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, planes: Tuple[ArrayLike, ArrayLike, ArrayLike]) -> None:
+        """
+        Queue a frame to be written
+
+        ## Parameters
+        - `planes`: The Y, Cb, and Cr planes of the frame
+            - Each plane is an array of unsigned integers
+              with the minimum dimension of 2
+            - The non-contiguous planes are copied into contiguous arrays
+        """
+
+        from numpy import ascontiguousarray
+
+        self._raise_error()
+
+        if not self._thread.is_alive():
+            raise ValueError("The writer is closed")
+        if len(planes) != 3:
+            raise ValueError("The number of planes must be 3")
+
+        buffers = []
+        for plane in planes:
+            plane = ascontiguousarray(plane)
+
+            if plane.ndim < 2:
+                raise ValueError("The minimum dimension of the plane is 2")
+
+            buffers.append(memoryview(plane).cast("B"))
+        self._queue.put(buffers)
+
+    def flush(self) -> None:
+        """
+        Wait until the queued frames are written, and flush the device
+        """
+
+        self._queue.join()
+        self._raise_error()
+        self._device.flush()
+
+    def close(self) -> None:
+        """
+        Write the queued frames and stop the background thread
+
+        ## Details
+        - The device is not closed
+        """
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
+        self._device.flush()
+
+    def _raise_error(self) -> None:
+        """
+        An internal method which raises the error of the background thread once
+        """
+
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _write(self) -> None:
+        """
+        An internal method which writes the queued frames in batches
+        """
+
+        from queue import Empty
+
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            if None in batch:
+                running = False
+                batch = batch[: batch.index(None)]
+
+            # The frames after an error are dropped even after it is raised,
+            # so the device does not receive a frame after a partial one
+            try:
+                if not self._failed:
+                    _write_buffers(
+                        self._device,
+                        [buffer for buffers in batch for buffer in buffers],
+                    )
+            except BaseException as error:
+                self._error = error
+                self._failed = True
+            finally:
+                for _ in range(len(batch) + (not running)):
+                    self._queue.task_done()
+
+
+def pack_samples(
+    values: ArrayLike,
+    bit_depth: int,
+    packing: str = "tight",
+    *,
+    out: Union[NDArray, None] = None,
+) -> NDArray:
+    """
+    Pack the samples into a byte sequence.
+
+    ## Parameters
+    - `values`: An array of unsigned integers below `2 ** bit_depth`
+    - `bit_depth`: The bit depth of the samples
+    - `packing`: The packing layout of the samples
+        - Search for the methods beginning with `SAMPLE_PACKING_` in this module
+        - The default value is `SAMPLE_PACKING_TIGHT()`
+    - `out`
+        - An optional `uint8` array to store the packed samples
+        - It should be in the shape of `(get_packed_size(values.size, ...),)`
+
+    ## Returns
+    - A 1-D NumPy array of `uint8` containing the packed samples
+
+    ## Details
+    - The samples are packed in the row-major order.
+    - The bits are packed with integer operations on all the samples at once.
+    - The samples out of the range of `bit_depth` are rejected
+      rather than truncated, since they would corrupt the neighbouring samples.
+    """
+
+    from numpy import asarray, left_shift, uint8, uint16
+
+    from .buffer import get_output_array
+
+    values = asarray(values).reshape(-1)
+    bit_depth = int(bit_depth)
+    packed_size = get_packed_size(values.size, bit_depth, packing)
+
+    if values.dtype.kind not in "ui":
+        raise ValueError("The values should be integers")
+    if values.size > 0 and (values.min() < 0 or values.max() >= 1 << bit_depth):
+        raise ValueError(
+            f"The values should be between 0 and {(1 << bit_depth) - 1} inclusive"
+        )
+
+    out = get_output_array(out, (packed_size,), uint8, contiguous=True)
+
+    if packing == SAMPLE_PACKING_MSB():
+        left_shift(
+            values,
+            16 - bit_depth,
+            out=out.view("<u2"),
+            dtype=uint16,
+            casting="unsafe",
+        )
+        return out
+
+    group_size, group_bytes = _get_tight_packing_group(bit_depth)
+    if group_size == 1:
+        out.view(f"<u{group_bytes}")[...] = values
+        return out
+
+    words = _get_packing_words(values, bit_depth, group_size)
+    out.reshape(-1, group_bytes)[...] = words.view(uint8).reshape(-1, 8)[
+        :, :group_bytes
+    ]
+    return out
+
+
+def unpack_samples(
+    data: ArrayLike,
+    shape: Tuple[int, ...],
+    bit_depth: int,
+    packing: str = "tight",
+    *,
+    out: Union[NDArray, None] = None,
+) -> NDArray:
+    """
+    Unpack the samples from a byte sequence.
+
+    ## Parameters
+    - `data`: A 1-D array of `uint8` containing the packed samples
+    - `shape`: The shape of the samples
+    - `bit_depth`: The bit depth of the samples
+    - `packing`: The packing layout of the samples
+        - Search for the methods beginning with `SAMPLE_PACKING_` in this module
+        - The default value is `SAMPLE_PACKING_TIGHT()`
+    - `out`
+        - An optional contiguous array to store the samples
+        - It should be in the shape of `shape`
+        - It may be `data` viewed as `uint16` for `SAMPLE_PACKING_MSB()`,
+          so that the samples are unpacked in place
+
+    ## Returns
+    - An array of unsigned integers in the shape of `shape`
+        - The data type is determined based on `bit_depth`
+
+    ## Details
+    - The bits are unpacked with integer operations on all the samples at once.
+    """
+
+    from math import prod
+    from numpy import asarray, bitwise_and, empty, right_shift, uint8, uint64, zeros
+
+    from .buffer import get_output_array
+
+    data = asarray(data, dtype=uint8).reshape(-1)
+    shape = tuple(map(int, shape))
+    bit_depth = int(bit_depth)
+    count = prod(shape)
+
+    if data.size != get_packed_size(count, bit_depth, packing):
+        raise ValueError("The size of the data does not match the shape")
+
+    out = get_output_array(out, shape, get_uint_type(bit_depth), contiguous=True)
+    samples = out.reshape(-1)
+
+    if packing == SAMPLE_PACKING_MSB():
+        right_shift(data.view("<u2"), 16 - bit_depth, out=samples, casting="unsafe")
+        return out
+
+    group_size, group_bytes = _get_tight_packing_group(bit_depth)
+    if group_size == 1:
+        samples[...] = data.view(f"<u{group_bytes}")
+        return out
+
+    groups = data.size // group_bytes
+    words = zeros((groups, 8), dtype=uint8)
+    words[:, :group_bytes] = data.reshape(groups, group_bytes)
+    words = words.view("<u8").reshape(groups)
+
+    mask = uint64((1 << bit_depth) - 1)
+    shifted_words = empty(groups, dtype=uint64)
+    full_groups = count // group_size
+    for index in range(group_size):
+        right_shift(words, uint64(index * bit_depth), out=shifted_words)
+        bitwise_and(shifted_words, mask, out=shifted_words)
+        samples[index::group_size] = shifted_words[
+            : full_groups + (index < count % group_size)
+        ]
+    return out
+
+
+def get_packed_size(count: int, bit_depth: int, packing: str = "tight") -> int:
+    """
+    Get the number of bytes of the packed samples.
+
+    ## Parameters
+    - `count`: The number of samples
+    - `bit_depth`: The bit depth of the samples
+    - `packing`: The packing layout of the samples
+        - Search for the methods beginning with `SAMPLE_PACKING_` in this module
+        - The default value is `SAMPLE_PACKING_TIGHT()`
+
+    ## Returns
+    - The number of bytes (`int`)
+    """
+
+    count, bit_depth = int(count), int(bit_depth)
+
+    if packing == SAMPLE_PACKING_MSB():
+        if not 8 <= bit_depth <= 16:
+            raise ValueError("The bit depth must be between 8 and 16")
+        return count * 2
+
+    group_size, group_bytes = _get_tight_packing_group(bit_depth)
+    return -(-count // group_size) * group_bytes
+
+
+def INTERLEAVED_LAYOUT_NV12() -> str:
+    """
+    Semi-planar `4:2:0` layout with Cb first (NV12)
+
+    ## Details
+    - The Y' plane is followed by one plane of interleaved Cb' and Cr' samples,
+      in the order of `Cb, Cr, Cb, Cr, ...`
+    - The chroma components are sub-sampled using `SUBSAMPLING_SCHEME_420()`
+    """
+
+    return "nv12"
+
+
+def INTERLEAVED_LAYOUT_NV21() -> str:
+    """
+    Semi-planar `4:2:0` layout with Cr first (NV21)
+
+    ## Details
+    - The Y' plane is followed by one plane of interleaved Cr' and Cb' samples,
+      in the order of `Cr, Cb, Cr, Cb, ...`
+    - The chroma components are sub-sampled using `SUBSAMPLING_SCHEME_420()`
+    """
+
+    return "nv21"
+
+
+def INTERLEAVED_LAYOUT_YUYV() -> str:
+    """
+    Packed `4:2:2` layout with the luma first (YUYV, YUY2)
+
+    ## Details
+    - Each pair of pixels is stored as `Y0, Cb, Y1, Cr`
+    - The chroma components are sub-sampled using `SUBSAMPLING_SCHEME_422()`
+    """
+
+    return "yuyv"
+
+
+def INTERLEAVED_LAYOUT_UYVY() -> str:
+    """
+    Packed `4:2:2` layout with the chroma first (UYVY)
+
+    ## Details
+    - Each pair of pixels is stored as `Cb, Y0, Cr, Y1`
+    - The chroma components are sub-sampled using `SUBSAMPLING_SCHEME_422()`
+    """
+
+    return "uyvy"
+
+
+def SAMPLE_PACKING_MSB() -> str:
+    """
+    Packing layout with MSB-aligned 16-bit samples (P010 style)
+
+    ## Details
+    - Each sample is stored in a little-endian 16-bit word,
+      and shifted to the most significant bits.
+    - The unused least significant bits are zero.
+    - For example, a 10-bit sample `0x3FF` is stored as `0xFFC0`.
+    """
+
+    return "msb"
+
+
+def SAMPLE_PACKING_TIGHT() -> str:
+    """
+    Packing layout with tightly packed samples
+
+    ## Details
+    - The samples are concatenated without padding bits,
+      from the least significant bits of the little-endian byte sequence.
+    - For example, four 10-bit samples are stored in five bytes,
+      and two 12-bit samples are stored in three bytes.
+    - The last group of samples is padded with zeros.
+    - It supports the bit depths of 8, 10, 12, 14 and 16.
+    """
+
+    return "tight"
+
+
+def _get_ycbcr_frame_layout(
+    size: Tuple[int, int],
+    subsampling_scheme: Tuple[int, int, int],
+    bit_per_pixel_y: int,
+    bit_per_pixel_cb: int,
+    bit_per_pixel_cr: int,
+) -> Tuple[Tuple[Tuple[int, int], ...], Tuple[DType, ...], Tuple[int, ...], int]:
+    """
+    An internal function which gets the layout of the planar frames
+
+    - It returns the shapes, data types and byte offsets of the planes,
+      and the number of bytes of each frame.
+    """
+
+    from numpy import dtype
+
+    from .sample import get_subsampling_factors
+
+    bit_depths = tuple(map(int, (bit_per_pixel_y, bit_per_pixel_cb, bit_per_pixel_cr)))
+
+    if len(size) != 2:
+        raise ValueError("The number of sizes must be 2")
+    if min(bit_depths) < 8:
+        raise ValueError("The bits per pixel must be at least 8")
+
+    h_luma, v_luma = map(int, size)
+    dv, dh = get_subsampling_factors(subsampling_scheme)
+    h_chroma, v_chroma = -(-h_luma // dh), -(-v_luma // dv)
+    shapes = ((v_luma, h_luma), (v_chroma, h_chroma), (v_chroma, h_chroma))
+    dtypes = tuple(dtype(get_uint_type(bit_depth)) for bit_depth in bit_depths)
+
+    offsets = []
+    frame_size = 0
+    for (v, h), plane_dtype in zip(shapes, dtypes):
+        offsets.append(frame_size)
+        frame_size += v * h * plane_dtype.itemsize
+
+    if frame_size == 0:
+        raise ValueError("The size of the frames must be greater than 0")
+    return (shapes, dtypes, tuple(offsets), frame_size)
+
+
+def _read_into(device: BinaryIO, buffer: bytearray) -> bool:
+    """
+    An internal function which reads the whole buffer from the device
+
+    - It returns `False` at the end of the device.
+    """
+
+    view = memoryview(buffer)
+    filled = 0
+
+    while filled < len(buffer):
+        count = device.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+
+    if 0 < filled < len(buffer):
+        raise ValueError("The device does not contain the whole frame")
+    return filled == len(buffer)
+
+
+def _write_buffers(device: BinaryIO, buffers: List[memoryview]) -> None:
+    """
+    An internal function which writes the byte buffers to the device
+
+    - The buffers are written with `os.writev` if the device has a file descriptor,
+      otherwise with `device.write` one by one.
+    """
+
+    from io import UnsupportedOperation
+    import os
+
+    try:
+        descriptor = device.fileno() if hasattr(os, "writev") else None
+    except (AttributeError, UnsupportedOperation):
+        descriptor = None
+
+    if descriptor is None:
+        for buffer in buffers:
+            device.write(buffer)
+        return
+
+    # The buffered data of the device is written first to keep the order
+    device.flush()
+    max_count = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 1024
+    buffers = [buffer for buffer in buffers if len(buffer)]
+    start = 0
+
+    while start < len(buffers):
+        count = os.writev(descriptor, buffers[start : start + max_count])
+        while start < len(buffers) and count >= len(buffers[start]):
+            count -= len(buffers[start])
+            start += 1
+        if count:
+            buffers[start] = buffers[start][count:]
+
+
+def _get_y4m_schemes() -> Dict[str, Tuple[int, int, int]]:
+    """
+    An internal function which maps the Y4M colour spaces to the sub-sampling schemes
+    """
+
+    from .sample import (
+        SUBSAMPLING_SCHEME_420,
+        SUBSAMPLING_SCHEME_422,
+        SUBSAMPLING_SCHEME_444,
+    )
+
+    return {
+        "420": SUBSAMPLING_SCHEME_420(),
+        "422": SUBSAMPLING_SCHEME_422(),
+        "444": SUBSAMPLING_SCHEME_444(),
+    }
+
+
+def _get_tight_packing_group(bit_depth: int) -> Tuple[int, int]:
+    """
+    An internal function which gets the number of samples and bytes
+    of each group in the tight packing layout
+    """
+
+    from math import gcd
+
+    if bit_depth not in (8, 10, 12, 14, 16):
+        raise ValueError("The bit depth must be one of 8, 10, 12, 14 and 16")
+
+    group_size = 8 // gcd(bit_depth, 8)
+    return (group_size, group_size * bit_depth // 8)
+
+
+def _get_packing_words(values: NDArray, bit_depth: int, group_size: int) -> NDArray:
+    """
+    An internal function which concatenates each group of samples
+    into a little-endian 64-bit word
+    """
+
+    from numpy import bitwise_or, empty, left_shift, uint64
+
+    groups = -(-values.size // group_size)
+    words = empty(groups, dtype="<u8")
+    shifted_values = empty(groups, dtype=uint64)
+
+    for index in range(group_size):
+        group_values = values[index::group_size]
+        shifted_values[len(group_values) :] = 0
+        left_shift(
+            group_values,
+            uint64(index * bit_depth),
+            out=shifted_values[: len(group_values)],
+            dtype=uint64,
+            casting="unsafe",
+        )
+        if index == 0:
+            words[...] = shifted_values
+        else:
+            bitwise_or(words, shifted_values, out=words)
+    return words
@@ -0,0 +1,201 @@
+from numpy import int32, uint8, uint32
+from numpy.typing import ArrayLike, NDArray
+from threading import local
+from typing import Callable, Union
+
+_INDEX_TABLES = local()
+
+
+def convert_unique_colors(
+    convert: Callable[[NDArray[uint8]], NDArray],
+    values: ArrayLike,
+    *,
+    palette: Union[ArrayLike, None] = None,
+    sample_size: int = 65536,
+    max_unique_ratio: float = 0.25,
+    out: Union[NDArray, None] = None,
+) -> NDArray:
+    """
+    Convert the colours of a frame once per unique colour
+
+    ## Parameters
+    - `convert`
+        - A function which converts the values in the shape of `(N, 3)`
+          into the values in the shape of `(N, ...)`
+        - For example, `lambda values: COLOR.ycbcr_from_rgb(values, KR, KB)`
+    - `values`
+        - 8-bit R'G'B' values in the shape of `(..., 3)`
+    - `palette`
+        - Optional 8-bit R'G'B' values in the shape of `(K, 3)`
+          which are expected to contain the colours of the frame
+        - The default value is `None`, which finds the colours from a sample
+    - `sample_size`
+        - The number of samples (pixels) used to find the colours
+        - The default value is `65536`
+    - `max_unique_ratio`
+        - The maximum ratio of unique colours to samples for the unique mode
+        - If there are more unique colours in the sample,
+          `convert` is applied to all the values (the dense mode).
+        - The default value is `0.25`
+    - `out`
+        - An optional array to store the converted values
+
+    ## Returns
+    - The converted values in the shape of `(..., ...)`
+        - If `out` is not specified, they may be a strided view
+
+    ## Details
+    - Each colour is packed into a 24-bit key by `get_color_keys`.
+    - The unique colours are found in a strided sample of the frame with `numpy.unique`,
+      unless `palette` is specified. They are converted once,
+      and scattered back to the pixels through a table indexed by the keys.
+    - The table has `2 ** 24` entries (64 MiB). It is allocated once per thread
+      and reused by the later calls.
+    - The colours of the frame missing from the sample or the palette are found
+      with `numpy.unique` on the missing pixels only, so the result is always exact.
+    - The unique mode is faster than the dense mode for screen content and animation,
+      especially when `convert` is expensive per pixel.
+    """
+
+    from numpy import arange, asarray, concatenate, copyto, unique, zeros
+
+    values = asarray(values)
+    sample_size = int(sample_size)
+
+    if values.dtype != uint8 or values.shape[-1] != 3:
+        raise ValueError("The values should be 8-bit and in the shape of (..., 3)")
+    if sample_size <= 0:
+        raise ValueError("The sample size should be greater than 0")
+
+    keys = get_color_keys(values).reshape(-1)
+
+    # The empty values are converted in the dense mode,
+    # which determines the shape of the converted values
+    if keys.size == 0:
+        palette_keys = None
+    elif palette is None:
+        sample_keys = keys[:: max(1, keys.size // sample_size)]
+        palette_keys = unique(sample_keys)
+
+        if len(palette_keys) > len(sample_keys) * max_unique_ratio:
+            palette_keys = None
+    else:
+        palette_keys = unique(get_color_keys(palette).reshape(-1))
+
+    if palette_keys is None:
+        converted_values = convert(values.reshape(-1, 3))
+        converted_values = converted_values.reshape(
+            *values.shape[:-1], *converted_values.shape[1:]
+        )
+        if out is None:
+            return converted_values
+        copyto(out, converted_values, casting="unsafe")
+        return out
+
+    # The table maps the keys to the indices of the colours plus one.
+    # It is reset to zeros after use, so only the entries of the colours are written.
+    index_table = _get_index_table()
+    try:
+        index_table[palette_keys] = arange(1, len(palette_keys) + 1)
+        indices = index_table.take(keys)
+
+        if indices.min() == 0:
+            missing_pixels = (indices == 0).nonzero()[0]
+            missing_keys, missing_indices = unique(
+                keys[missing_pixels], return_inverse=True
+            )
+            indices[missing_pixels] = missing_indices + (len(palette_keys) + 1)
+            palette_keys = concatenate([palette_keys, missing_keys])
+    finally:
+        index_table[palette_keys] = 0
+
+    # The first converted value is a placeholder for the index zero
+    colors = colors_from_keys(concatenate([palette_keys[:1], palette_keys]))
+    converted_colors = asarray(convert(colors))
+    indices = indices.reshape(values.shape[:-1])
+    shape = (*values.shape[:-1], *converted_colors.shape[1:])
+
+    # Gathering the rows of 3 bytes is slow in NumPy,
+    # so the rows are padded and gathered as 32-bit words
+    if converted_colors.dtype == uint8 and converted_colors.shape[1:] == (3,):
+        padded_colors = zeros((len(colors), 4), dtype=uint8)
+        padded_colors[:, :3] = converted_colors.view(uint8)
+        gathered_colors = padded_colors.view(uint32)[:, 0].take(indices)
+        gathered_colors = gathered_colors.view(uint8).reshape(*shape[:-1], 4)[..., :3]
+        if out is None:
+            return gathered_colors
+        copyto(out, gathered_colors, casting="unsafe")
+        return out
+
+    return converted_colors.take(indices, axis=0, out=out)
+
+
+def get_color_keys(values: ArrayLike, *, out: Union[NDArray, None] = None) -> NDArray:
+    """
+    Pack the 8-bit R'G'B' values into 24-bit keys
+
+    ## Parameters
+    - `values`: 8-bit R'G'B' values in the shape of `(..., 3)`
+    - `out`
+        - An optional `uint32` array to store the keys
+        - It should be in the shape of `(...)`
+
+    ## Returns
+    - The keys (`NDArray[uint32]`) in the shape of `(...)`
+        - `key = (R << 16) | (G << 8) | B`
+    """
+
+    from numpy import asarray, copyto
+
+    from .buffer import get_output_array
+
+    values = asarray(values)
+
+    if values.dtype != uint8 or values.shape[-1] != 3:
+        raise ValueError("The values should be 8-bit and in the shape of (..., 3)")
+
+    keys = get_output_array(out, values.shape[:-1], uint32)
+    copyto(keys, values[..., 0])
+    keys <<= 8
+    keys |= values[..., 1]
+    keys <<= 8
+    keys |= values[..., 2]
+    return keys
+
+
+def colors_from_keys(keys: ArrayLike) -> NDArray[uint8]:
+    """
+    Unpack the 24-bit keys into the 8-bit R'G'B' values
+
+    ## Parameters
+    - `keys`: The keys packed by `get_color_keys`
+
+    ## Returns
+    - 8-bit R'G'B' values (`NDArray[uint8]`) in the shape of `(..., 3)`
+    """
+
+    from numpy import asarray, empty, right_shift
+
+    keys = asarray(keys, dtype=uint32)
+    values = empty((*keys.shape, 3), dtype=uint8)
+
+    for channel in range(3):
+        right_shift(keys, 16 - channel * 8, out=values[..., channel], casting="unsafe")
+    return values
+
+
+def _get_index_table() -> NDArray[int32]:
+    """
+    An internal function which returns the colour index table of the current thread
+
+    - The table is filled with zeros whenever it is not in use
+    """
+
+    from numpy import zeros
+
+    index_table = getattr(_INDEX_TABLES, "index_table", None)
+
+    if index_table is None:
+        index_table = zeros(1 << 24, dtype=int32)
+        _INDEX_TABLES.index_table = index_table
+    return index_table
@@ -0,0 +1,296 @@
+from concurrent.futures import ThreadPoolExecutor
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+from typing import Callable, Union
+
+from .color import H273Config
+from .typing import floatlike, get_uint_type, uintlike
+
+
+class H273Executor:
+    """
+    Thread-parallel colour conversion using an immutable configuration
+
+    ## Details
+    - The frames are split into row bands, and each band is converted
+      by a thread of the pool into its rows of the output array.
+    - NumPy releases the GIL inside its kernels,
+      so the conversion of large frames scales across the cores.
+    - The converters are created from `H273Config` and never modified,
+      so it is safe to share an executor between threads.
+
+    ## Examples
+
+        ```python
+        config = H273Config(*KR_KB_BT709(), full_range=False)
+        with H273Executor(config) as executor:
+            values = executor.dequantize_rgb(frame)
+            values = executor.ypbpr_from_rgb(values)
+            values = executor.quantize_ycbcr(values)
+        ```
+    """
+
+    _band_height: Union[int, None]
+    _config: H273Config
+    _executor: ThreadPoolExecutor
+    _max_workers: int
+
+    def __init__(
+        self,
+        config: H273Config,
+        *,
+        max_workers: Union[int, None] = None,
+        band_height: Union[int, None] = None,
+    ) -> None:
+        """
+        ## Parameters
+        - `config`: The configuration of the colour conversion
+        - `max_workers`
+            - The maximum number of threads
+            - The default value is `None`, which uses the number of processors
+        - `band_height`
+            - The number of rows of each band
+            - The default value is `None`, which splits the rows evenly
+              among the threads
+        """
+
+        from os import cpu_count
+
+        max_workers = int(max_workers or cpu_count() or 1)
+
+        if max_workers <= 0:
+            raise ValueError("The maximum number of threads should be greater than 0")
+        if band_height is not None and int(band_height) <= 0:
+            raise ValueError("The band height should be greater than 0")
+
+        self._band_height = None if band_height is None else int(band_height)
+        self._config = config
+        self._executor = ThreadPoolExecutor(max_workers, "H273Executor")
+        self._max_workers = max_workers
+
+    def __enter__(self) -> "H273Executor":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def config(self) -> H273Config:
+        """
+        Get the configuration of the colour conversion
+        """
+
+        return self._config
+
+    def close(self) -> None:
+        """
+        Shut down the threads after the pending conversions are done
+        """
+
+        self._executor.shutdown(wait=True)
+
+    def dequantize_rgb(
+        self,
+        values: ArrayLike,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Parallel version of `H273.dequantize_rgb`
+
+        ## Parameters
+        - `values`: Quantized R'G'B' values
+        - `out`
+            - An optional contiguous array to store the R'G'B' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - De-quantized R'G'B' values (`NDArray[floatlike]`)
+        """
+
+        config = self._config
+        return self._map_bands(
+            config.get_rgb_converter().dequantize_rgb,
+            values,
+            out,
+            config.dtype,
+            config.bit_depth_rgb,
+        )
+
+    def quantize_rgb(
+        self,
+        values: ArrayLike,
+        *,
+        out: Union[NDArray[uintlike], None] = None,
+    ) -> NDArray[uintlike]:
+        """
+        Parallel version of `H273.quantize_rgb`
+
+        ## Parameters
+        - `values`: R'G'B' values
+        - `out`
+            - An optional contiguous array to store the quantized R'G'B' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - Quantized R'G'B' values (`NDArray[uintlike]`)
+        """
+
+        config = self._config
+        return self._map_bands(
+            config.get_rgb_converter().quantize_rgb,
+            values,
+            out,
+            get_uint_type(config.bit_depth_rgb),
+            config.bit_depth_rgb,
+        )
+
+    def ypbpr_from_rgb(
+        self,
+        values: ArrayLike,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Parallel version of `H273.ypbpr_from_rgb`
+
+        ## Parameters
+        - `values`: R'G'B' values
+        - `out`
+            - An optional contiguous array to store the Y'Pb'Pr' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - Y'Pb'Pr' values (`NDArray[floatlike]`)
+        """
+
+        config = self._config
+        return self._map_bands(
+            config.get_ycbcr_converter().ypbpr_from_rgb,
+            values,
+            out,
+            config.dtype,
+            config.kr,
+            config.kb,
+        )
+
+    def rgb_from_ypbpr(
+        self,
+        values: ArrayLike,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Parallel version of `H273.rgb_from_ypbpr`
+
+        ## Parameters
+        - `values`: Y'Pb'Pr' values
+        - `out`
+            - An optional contiguous array to store the R'G'B' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - R'G'B' values (`NDArray[floatlike]`)
+        """
+
+        config = self._config
+        return self._map_bands(
+            config.get_ycbcr_converter().rgb_from_ypbpr,
+            values,
+            out,
+            config.dtype,
+            config.kr,
+            config.kb,
+        )
+
+    def quantize_ycbcr(
+        self,
+        values: ArrayLike,
+        *,
+        out: Union[NDArray[uintlike], None] = None,
+    ) -> NDArray[uintlike]:
+        """
+        Parallel version of `H273.quantize_ycbcr`
+
+        ## Parameters
+        - `values`: Y'Pb'Pr' values
+        - `out`
+            - An optional contiguous array to store the Y'Cb'Cr' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - Quantized Y'Cb'Cr' values (`NDArray[uintlike]`)
+        """
+
+        config = self._config
+        return self._map_bands(
+            config.get_ycbcr_converter().quantize_ycbcr,
+            values,
+            out,
+            get_uint_type(max(config.bit_depths_ycbcr)),
+            *config.bit_depths_ycbcr,
+        )
+
+    def dequantize_ycbcr(
+        self,
+        values: ArrayLike,
+        *,
+        out: Union[NDArray[floatlike], None] = None,
+    ) -> NDArray[floatlike]:
+        """
+        Parallel version of `H273.dequantize_ycbcr`
+
+        ## Parameters
+        - `values`: Quantized Y'Cb'Cr' values
+        - `out`
+            - An optional contiguous array to store the Y'Pb'Pr' values
+            - It should be in the same shape as `values`
+
+        ## Returns
+        - De-quantized Y'Pb'Pr' values (`NDArray[floatlike]`)
+        """
+
+        config = self._config
+        return self._map_bands(
+            config.get_ycbcr_converter().dequantize_ycbcr,
+            values,
+            out,
+            config.dtype,
+            *config.bit_depths_ycbcr,
+        )
+
+    def _map_bands(
+        self,
+        function: Callable[..., NDArray],
+        values: ArrayLike,
+        out: Union[NDArray, None],
+        dtype: DTypeLike,
+        *arguments,
+    ) -> NDArray:
+        """
+        An internal method which applies the function to the row bands in parallel
+        """
+
+        from numpy import asarray
+
+        from .buffer import get_output_array
+        from .tile import iter_stripes
+
+        values = asarray(values)
+
+        if values.ndim < 2:
+            return function(values, *arguments, out=out)
+
+        out = get_output_array(out, values.shape, dtype, contiguous=True)
+        height = values.shape[0]
+        band_height = self._band_height or -(-height // self._max_workers)
+
+        if band_height >= height:
+            return function(values, *arguments, out=out)
+
+        futures = [
+            self._executor.submit(function, values[band], *arguments, out=out[band])
+            for band in iter_stripes(height, band_height)
+        ]
+        for future in futures:
+            future.result()
+        return out
@@ -0,0 +1,322 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from numpy import dtype as DType
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+from typing import Callable, Deque, Iterable, Iterator, List, Sequence, Tuple, Union
+
+FrameLayout = Sequence[Tuple[Tuple[int, ...], DTypeLike]]
+
+
+class FramePipeline:
+    """
+    Frame-level process-parallel pipeline with shared-memory frame transport
+
+    ## Details
+    - The frames are processed by a pool of processes, one frame per task,
+      so the pipelines bound by the GIL (such as Huffman coding) scale with the cores.
+    - The input and output arrays are moved through two ring buffers
+      in `multiprocessing.shared_memory` instead of being pickled.
+      Each task passes only the index of its slot.
+    - At most `ring_size` frames are in flight.
+      The outputs are returned in the order of the inputs.
+    - `function` should be a module-level function, so that it can be pickled
+
+    ## Examples
+
+        ```python
+        def convert(inputs, outputs):
+            (values,) = inputs
+            COLOR.ycbcr_planes_from_rgb(
+                values, SUBSAMPLING_SCHEME, KR, KB, out=tuple(outputs)
+            )
+
+        with FramePipeline(
+            convert,
+            [((144, 176, 3), uint8)],
+            [((144, 176), uint8), ((72, 88), uint8), ((72, 88), uint8)],
+        ) as pipeline:
+            for y, cb, cr in pipeline.map((frame,) for frame in frames):
+                ...
+        ```
+    """
+
+    _executor: ProcessPoolExecutor
+    _input_memory: SharedMemory
+    _input_views: List[Tuple[NDArray, ...]]
+    _output_memory: SharedMemory
+    _output_views: List[Tuple[NDArray, ...]]
+    _ring_size: int
+    _unlinked: bool
+
+    def __init__(
+        self,
+        function: Callable[[Tuple[NDArray, ...], Tuple[NDArray, ...]], None],
+        input_layout: FrameLayout,
+        output_layout: FrameLayout,
+        *,
+        max_workers: Union[int, None] = None,
+        ring_size: Union[int, None] = None,
+    ) -> None:
+        """
+        ## Parameters
+        - `function`
+            - A function which processes a frame
+            - It is called with the input arrays and the output arrays of a slot,
+              and should store the results into the output arrays
+        - `input_layout`, `output_layout`
+            - The shapes and data types of the input and output arrays of a frame
+        - `max_workers`
+            - The maximum number of processes
+            - The default value is `None`, which uses the number of processors
+        - `ring_size`
+            - The number of slots of the ring buffers
+            - The default value is `None`, which uses twice the number of processes
+        """
+
+        from os import cpu_count
+
+        max_workers = int(max_workers or cpu_count() or 1)
+        ring_size = int(ring_size or max_workers * 2)
+
+        if max_workers <= 0:
+            raise ValueError("The maximum number of processes should be greater than 0")
+        if ring_size <= 0:
+            raise ValueError("The ring size should be greater than 0")
+
+        input_layout = _normalize_frame_layout(input_layout)
+        output_layout = _normalize_frame_layout(output_layout)
+
+        self._ring_size = ring_size
+        self._unlinked = False
+        self._input_memory = _create_ring_memory(input_layout, ring_size)
+        self._output_memory = _create_ring_memory(output_layout, ring_size)
+        self._input_views = _get_ring_views(self._input_memory, input_layout, ring_size)
+        self._output_views = _get_ring_views(
+            self._output_memory, output_layout, ring_size
+        )
+        self._executor = ProcessPoolExecutor(
+            max_workers,
+            initializer=_initialize_worker,
+            initargs=(
+                function,
+                self._input_memory.name,
+                self._output_memory.name,
+                input_layout,
+                output_layout,
+                ring_size,
+            ),
+        )
+
+    def __enter__(self) -> "FramePipeline":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def map(
+        self,
+        frames: Iterable[Sequence[ArrayLike]],
+        *,
+        copy: bool = True,
+    ) -> Iterator[Tuple[NDArray, ...]]:
+        """
+        Process the frames in parallel
+
+        ## Parameters
+        - `frames`: The input arrays of each frame
+            - They should be in the shapes of the input layout,
+              and are not broadcast
+        - `copy`
+            - Whether to copy the output arrays out of the ring buffer
+            - If it is `False`, the output arrays are views of the ring buffer,
+              which are only valid until the iterator is advanced
+            - The default value is `True`
+
+        ## Returns
+        - An iterator of the output arrays of each frame, in the order of `frames`
+
+        ## Details
+        - The input arrays are copied into a free slot once,
+          and the next frames are submitted while the outputs are being consumed.
+        """
+
+        from numpy import asarray, copyto
+
+        ring_size = self._ring_size
+        pending: Deque[Tuple[int, Future]] = deque()
+
+        try:
+            for index, frame in enumerate(frames):
+                if len(pending) == ring_size:
+                    yield self._collect(*pending.popleft(), copy)
+
+                slot = index % ring_size
+                views = self._input_views[slot]
+                if len(frame) != len(views):
+                    raise ValueError(
+                        f"The frame should have {len(views)} arrays as the input layout"
+                    )
+                for view, array in zip(views, frame):
+                    array = asarray(array)
+                    if array.shape != view.shape:
+                        raise ValueError(
+                            f"The array should be in the shape of {view.shape}"
+                        )
+                    copyto(view, array, casting="same_kind")
+                pending.append((slot, self._executor.submit(_process_slot, slot)))
+
+            while pending:
+                yield self._collect(*pending.popleft(), copy)
+        finally:
+            # The slots should not be reused while the workers are writing them
+            for _, future in pending:
+                future.cancel()
+            for _, future in pending:
+                if not future.cancelled():
+                    future.exception()
+
+    def close(self) -> None:
+        """
+        Shut down the processes, and release the ring buffers
+
+        ## Details
+        - The output arrays returned with `copy=False` stay valid,
+          and the ring buffer is freed when they are released
+        """
+
+        self._executor.shutdown(wait=True)
+        self._input_views.clear()
+        self._output_views.clear()
+        if not self._unlinked:
+            self._input_memory.unlink()
+            self._output_memory.unlink()
+            self._unlinked = True
+        self._input_memory.close()
+        self._output_memory.close()
+
+    def _collect(self, slot: int, future: Future, copy: bool) -> Tuple[NDArray, ...]:
+        """
+        An internal method which waits for a frame and gets its output arrays
+        """
+
+        future.result()
+        views = self._output_views[slot]
+        return tuple(view.copy() for view in views) if copy else views
+
+
+class _SharedMemory(SharedMemory):
+    """
+    An internal shared memory block which can be closed while its views are alive
+    """
+
+    def close(self) -> None:
+        try:
+            super().close()
+        except BufferError:
+            # The mapping is released with the last view of it
+            pass
+
+
+_WORKER_STATE: dict = {}
+
+
+def _initialize_worker(
+    function: Callable[[Tuple[NDArray, ...], Tuple[NDArray, ...]], None],
+    input_name: str,
+    output_name: str,
+    input_layout: FrameLayout,
+    output_layout: FrameLayout,
+    ring_size: int,
+) -> None:
+    """
+    An internal function which attaches a worker process to the ring buffers
+    """
+
+    input_memory = _SharedMemory(input_name)
+    output_memory = _SharedMemory(output_name)
+
+    _WORKER_STATE.update(
+        function=function,
+        memories=(input_memory, output_memory),
+        input_views=_get_ring_views(input_memory, input_layout, ring_size),
+        output_views=_get_ring_views(output_memory, output_layout, ring_size),
+    )
+
+
+def _process_slot(slot: int) -> None:
+    """
+    An internal function which processes the frame of a slot in a worker process
+    """
+
+    state = _WORKER_STATE
+    state["function"](state["input_views"][slot], state["output_views"][slot])
+
+
+def _normalize_frame_layout(
+    layout: FrameLayout,
+) -> Tuple[Tuple[Tuple[int, ...], DType], ...]:
+    """
+    An internal function which validates the shapes and data types of a frame
+    """
+
+    layout = tuple((tuple(map(int, shape)), DType(dtype)) for shape, dtype in layout)
+
+    if not layout:
+        raise ValueError("The frame layout should have at least one array")
+    if any(dtype.hasobject for _, dtype in layout):
+        raise ValueError("The arrays of a frame should not contain Python objects")
+    return layout
+
+
+def _get_slot_layout(layout: FrameLayout) -> Tuple[List[int], int]:
+    """
+    An internal function which gets the offsets of the arrays and the size of a slot
+    """
+
+    from math import prod
+
+    offsets = []
+    size = 0
+    for shape, dtype in layout:
+        offsets.append(size)
+        # Each array is aligned to a cache line to avoid false sharing
+        size += -(-prod(shape) * DType(dtype).itemsize // 64) * 64
+    return (offsets, max(size, 64))
+
+
+def _create_ring_memory(layout: FrameLayout, ring_size: int) -> SharedMemory:
+    """
+    An internal function which allocates a ring buffer in the shared memory
+    """
+
+    _, slot_size = _get_slot_layout(layout)
+    return _SharedMemory(create=True, size=slot_size * ring_size)
+
+
+def _get_ring_views(
+    memory: SharedMemory,
+    layout: FrameLayout,
+    ring_size: int,
+) -> List[Tuple[NDArray, ...]]:
+    """
+    An internal function which gets the array views of each slot of a ring buffer
+    """
+
+    from math import prod
+    from numpy import frombuffer, uint8
+
+    offsets, slot_size = _get_slot_layout(layout)
+    # The views are made from one array, which holds the buffer export of the mapping
+    data = frombuffer(memory.buf, dtype=uint8, count=slot_size * ring_size)
+    return [
+        tuple(
+            data[start : start + prod(shape) * dtype.itemsize]
+            .view(dtype)
+            .reshape(shape)
+            for (shape, dtype), start in zip(
+                layout, (slot * slot_size + offset for offset in offsets)
+            )
+        )
+        for slot in range(ring_size)
+    ]
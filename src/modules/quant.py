@@ -1,5 +1,9 @@
-from numpy.typing import ArrayLike, NDArray
-from typing import Tuple
+from numpy import float64
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+from typing import Tuple, Union
+
+from .buffer import get_output_array
+from .typing import floatlike, get_float_type
 
 
 def quantize_evenly(
@@ -7,6 +11,10 @@ def quantize_evenly(
     levels: int,
     source_range: Tuple[int, int],
     target_range: Tuple[int, int],
+    *,
+    out: Union[NDArray, None] = None,
+    workspace: Union[NDArray[floatlike], None] = None,
+    dtype: DTypeLike = float64,
 ) -> NDArray:
     """
     Quantize values evenly
@@ -16,6 +24,18 @@ def quantize_evenly(
     - `levels`: The number of levels to use
     - `target_range`: The minimum and maximum of the target
     - `source_range`: The minimum and maximum of the values
+    - `out`
+        - An optional array to store the quantized values
+        - It should be in the same shape as `values`
+    - `workspace`
+        - An optional array of the working data type to store the intermediate values
+        - It should be in the same shape as `values`
+    - `dtype`
+        - The working data type of the intermediate values
+        - It should be `float16`, `float32` or `float64`
+        - The default value is `float64`
+        - The narrower data types are exact only for small integer values,
+          see `get_dtype_deviation` in `modules.color`
 
     ## Examples
 
@@ -39,6 +59,7 @@ def quantize_evenly(
 
     ## Returns
     - The quantized values (floored to the nearest integer)
+        - The values are casted into the data type of `out` if specified
 
     ## Details
     - Generally, quantization is the process of mapping values
@@ -49,16 +70,25 @@ def quantize_evenly(
     - Out-of-range values will be scaled as well
     """
 
-    from numpy import array, floor
+    from numpy import asarray, copyto, floor, subtract
 
-    values = array(values)
+    values = asarray(values)
     source_min, source_max = min(source_range), max(source_range)
     target_min, target_max = min(target_range), max(target_range)
 
-    normalized_values = (values - source_min) / (source_max - source_min + 1)
-    normalized_leveled_values = floor(normalized_values * levels) / levels
-    denormalized_leveled_values = floor(
-        normalized_leveled_values * (target_max - target_min + 1) + target_min
-    )
+    # The values are transformed in place
+    dtype = get_float_type(dtype)
+    transformed_values = get_output_array(workspace, values.shape, dtype)
+    subtract(values, source_min, out=transformed_values, dtype=dtype)
+    transformed_values /= source_max - source_min + 1
+    transformed_values *= levels
+    floor(transformed_values, out=transformed_values)
+    transformed_values /= levels
+    transformed_values *= target_max - target_min + 1
+    transformed_values += target_min
+    floor(transformed_values, out=transformed_values)
 
-    return denormalized_leveled_values
+    if out is None:
+        return transformed_values
+    copyto(out, transformed_values, casting="unsafe")
+    return out
@@ -1,5 +1,9 @@
-from numpy.typing import ArrayLike, NDArray
-from typing import Tuple
+from functools import lru_cache
+from numpy import float64, int32, intp
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+from typing import List, Sequence, Tuple, Union
+
+from .buffer import get_output_array
 
 
 class BT2100:
@@ -22,6 +26,9 @@ class BT2100:
         scheme: Tuple[int, int, int],
         luma: ArrayLike,
         chroma: ArrayLike,
+        *,
+        axes: Tuple[int, int] = (0, 1),
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         """
         Sub-sample the chroma components using the given scheme
@@ -33,9 +40,17 @@ class BT2100:
             - *Unused*
         - `chroma`: Chroma components
             - An array with the minimum dimension of 2
+        - `axes`
+            - The vertical and horizontal (spatial) axes of the components
+            - The default value is `(0, 1)`
+            - For example, use `(1, 2)` for a stack of frames
+              in the shape of `(N, V, H)`
+        - `out`
+            - An optional array to store the sub-sampled chroma components
 
         ## Returns
         - A NumPy array transformed from the chroma components
+            - It is a strided view of `chroma` if `out` is not specified
 
         ## Details
         - To find valid values of `scheme`, search for the methods
@@ -45,24 +60,144 @@ class BT2100:
         - Table 8 of Rec. ITU-R BT.2100-2
         """
 
-        from numpy import asarray
+        from numpy import asarray, moveaxis
 
-        j, a, b = map(int, scheme)
         luma = asarray(luma)
         chroma = asarray(chroma)
 
         if luma.ndim < 2 or chroma.ndim < 2:
             raise ValueError("The minimum dimension of the components is 2")
 
-        dv, dh = j // (a + b), j // a
+        luma = _move_spatial_axes(luma, axes)
+        chroma = _move_spatial_axes(chroma, axes)
+
+        dv, dh = get_subsampling_factors(scheme)
         subsampled_chroma = chroma[::dv, ::dh]
-        return subsampled_chroma
+
+        if out is not None:
+            out, subsampled_out = _get_spatial_output(
+                out, subsampled_chroma.shape, chroma.dtype, axes
+            )
+            subsampled_out[...] = subsampled_chroma
+            return out
+        return moveaxis(subsampled_chroma, (0, 1), axes)
+
+    def subsample_average(
+        self,
+        scheme: Tuple[int, int, int],
+        luma: ArrayLike,
+        chroma: ArrayLike,
+        *,
+        axes: Tuple[int, int] = (0, 1),
+        out: Union[NDArray, None] = None,
+    ) -> NDArray:
+        """
+        Sub-sample the chroma components by averaging each block using the given scheme
+
+        ## Parameters
+        - `scheme`: Colour sub-sampling scheme to use
+        - `luma`: Luma components
+            - An array with the minimum dimension of 2
+            - *Unused*
+        - `chroma`: Chroma components
+            - An array with the minimum dimension of 2
+        - `axes`
+            - The vertical and horizontal (spatial) axes of the components
+            - The default value is `(0, 1)`
+            - For example, use `(1, 2)` for a stack of frames
+              in the shape of `(N, V, H)`
+        - `out`
+            - An optional array to store the sub-sampled chroma components
+
+        ## Returns
+        - A contiguous NumPy array of the averaged chroma components
+            - The data type is the same as `chroma`
+
+        ## Details
+        - To find valid values of `scheme`, search for the methods
+          beginning with `SUBSAMPLING_SCHEME_` in this module.
+        - Each block of `dv` rows and `dh` columns is averaged (box filter),
+          which avoids the aliasing of `subsample`.
+        - The blocks at the bottom and right edges are completed by
+          replicating the last row and column if the size is not a multiple.
+        - The integer components are summed with accumulators of the next wider
+          unsigned integer type (`uint16` for `uint8`), and the averages are rounded
+          half up. The rows are summed first and then the columns,
+          so each pass reads the rows of the blocks contiguously.
+
+        ## References
+        - Table 8 of Rec. ITU-R BT.2100-2
+        """
+
+        from numpy import add, asarray, copyto, empty, floor_divide, int64, true_divide
+
+        from .typing import get_uint_type
+
+        luma = asarray(luma)
+        chroma = asarray(chroma)
+
+        if luma.ndim < 2 or chroma.ndim < 2:
+            raise ValueError("The minimum dimension of the components is 2")
+
+        luma = _move_spatial_axes(luma, axes)
+        chroma = _move_spatial_axes(chroma, axes)
+
+        v, h = chroma.shape[:2]
+        dv, dh = get_subsampling_factors(scheme)
+        v_chroma, h_chroma = -(-v // dv), -(-h // dh)
+        out, averaged_chroma = _get_spatial_output(
+            out, (v_chroma, h_chroma, *chroma.shape[2:]), chroma.dtype, axes
+        )
+
+        if dv == 1 and dh == 1:
+            copyto(averaged_chroma, chroma)
+            return out
+
+        count = dv * dh
+        if chroma.dtype.kind == "u":
+            accumulator_type = get_uint_type(
+                chroma.dtype.itemsize * 8 + count.bit_length()
+            )
+        elif chroma.dtype.kind in "bi":
+            accumulator_type = int64
+        else:
+            accumulator_type = chroma.dtype
+
+        # Sum the rows of the blocks, replicating the last row for the incomplete block
+        row_sums = chroma
+        if dv > 1:
+            row_sums = empty((v_chroma, h, *chroma.shape[2:]), dtype=accumulator_type)
+            copyto(row_sums, chroma[0::dv])
+            for i in range(1, dv):
+                rows = chroma[i::dv]
+                add(row_sums[: len(rows)], rows, out=row_sums[: len(rows)])
+                add(row_sums[len(rows) :], chroma[-1:], out=row_sums[len(rows) :])
+
+        # Sum the columns of the blocks, replicating the last column as well
+        sums = empty((v_chroma, h_chroma, *chroma.shape[2:]), dtype=accumulator_type)
+        copyto(sums, row_sums[:, 0::dh])
+        for j in range(1, dh):
+            columns = row_sums[:, j::dh]
+            width = columns.shape[1]
+            add(sums[:, :width], columns, out=sums[:, :width])
+            add(sums[:, width:], row_sums[:, -1:], out=sums[:, width:])
+
+        if accumulator_type == chroma.dtype and chroma.dtype.kind == "f":
+            true_divide(sums, count, out=averaged_chroma)
+        else:
+            sums += count // 2
+            floor_divide(sums, count, out=averaged_chroma, casting="unsafe")
+        return out
 
     def upsample(
         self,
         scheme: Tuple[int, int, int],
         luma: ArrayLike,
         chroma: ArrayLike,
+        *,
+        view: bool = False,
+        axes: Tuple[int, int] = (0, 1),
+        out: Union[NDArray, None] = None,
     ) -> NDArray:
         """
         Up-sample the chroma components using the given scheme
@@ -73,32 +208,407 @@ class BT2100:
             - An array with the minimum dimension of 2
         - `chroma`: Chroma components which are sub-sampled
             - An array with the minimum dimension of 2
+        - `view`
+            - Whether to return a read-only broadcast view instead of a copy
+            - The default value is `False`
+        - `axes`
+            - The vertical and horizontal (spatial) axes of the components
+            - The default value is `(0, 1)`
+            - For example, use `(1, 2)` for a stack of frames
+              in the shape of `(N, V, H)`
+        - `out`
+            - An optional array to store the up-sampled chroma components
+            - *Unused* if `view` is `True`
 
         ## Returns
         - A NumPy array transformed from the chroma components
+            - If `view` is `True`, it is a read-only view of `chroma`
+              in the block shape of `(V / dv, dv, H / dh, dh, ...)`,
+              see `blocks_from_plane`
+            - The other axes of the view follow the spatial axes
+              regardless of `axes`
 
         ## Details
         - To find valid values of `scheme`, search for the methods
           beginning with `SUBSAMPLING_SCHEME_` in this module.
+        - Each sample is replicated with one strided copy per position in its block,
+          so no intermediate arrays are allocated
+        - The view allocates nothing, since each sample is broadcast over its block
+          with zero strides. Strides cannot express the replication in the shape of
+          `(V, H, ...)`, so the view keeps the block shape, whose elements are
+          in the same order. Element-wise operations with the luma components
+          in the block shape produce contiguous results,
+          which `plane_from_blocks` reshapes without copying.
+        - The view requires the size of the luma components to be
+          the size of the chroma components multiplied by the sub-sampling factors
 
         ## References
         - Table 8 of Rec. ITU-R BT.2100-2
         """
 
-        from numpy import asarray, repeat
+        from numpy import asarray
 
-        j, a, b = map(int, scheme)
         luma = asarray(luma)
         chroma = asarray(chroma)
 
         if luma.ndim < 2 or chroma.ndim < 2:
             raise ValueError("The minimum dimension of the components is 2")
 
+        luma = _move_spatial_axes(luma, axes)
+        chroma = _move_spatial_axes(chroma, axes)
+
         v, h = luma.shape[:2]
-        dv, dh = j // (a + b), j // a
-        upscaled_chroma = repeat(repeat(chroma, dv, axis=0), dh, axis=1)
-        cropped_chroma = upscaled_chroma[:v, :h, ...]
-        return cropped_chroma
+        dv, dh = get_subsampling_factors(scheme)
+
+        if view:
+            from numpy import broadcast_to
+
+            v_chroma, h_chroma = chroma.shape[:2]
+
+            if (v, h) != (v_chroma * dv, h_chroma * dh):
+                raise ValueError(
+                    f"The luma components should be in the shape of "
+                    f"({v_chroma * dv}, {h_chroma * dh}) for the view"
+                )
+
+            return broadcast_to(
+                chroma[:, None, :, None],
+                (v_chroma, dv, h_chroma, dh, *chroma.shape[2:]),
+            )
+
+        v, h = min(v, chroma.shape[0] * dv), min(h, chroma.shape[1] * dh)
+        out, cropped_chroma = _get_spatial_output(
+            out, (v, h, *chroma.shape[2:]), chroma.dtype, axes
+        )
+
+        for i in range(dv):
+            for j in range(dh):
+                block = cropped_chroma[i::dv, j::dh]
+                block[...] = chroma[: block.shape[0], : block.shape[1]]
+        return out
+
+    def upsample_interpolated(
+        self,
+        scheme: Tuple[int, int, int],
+        luma: ArrayLike,
+        chroma: ArrayLike,
+        *,
+        method: str = "bilinear",
+        siting: str = "cosited",
+        axes: Tuple[int, int] = (0, 1),
+        out: Union[NDArray, None] = None,
+    ) -> NDArray:
+        """
+        Up-sample the chroma components by interpolation using the given scheme
+
+        ## Parameters
+        - `scheme`: Colour sub-sampling scheme used
+        - `luma`: Luma components which are referenced
+            - An array with the minimum dimension of 2
+        - `chroma`: Chroma components which are sub-sampled
+            - An array with the minimum dimension of 2
+        - `method`
+            - The interpolation method
+            - The default value is `"bilinear"`
+        - `siting`
+            - The position of the chroma samples relative to the luma samples
+            - Use `CHROMA_SITING_COSITED()` for `subsample`
+              and `CHROMA_SITING_CENTER()` for `subsample_average`
+            - The default value is `"cosited"`
+        - `axes`
+            - The vertical and horizontal (spatial) axes of the components
+            - The default value is `(0, 1)`
+            - For example, use `(1, 2)` for a stack of frames
+              in the shape of `(N, V, H)`
+        - `out`
+            - An optional array to store the up-sampled chroma components
+
+        ## Returns
+        - A NumPy array interpolated from the chroma components
+            - The data type is the same as `chroma`
+
+        ## Details
+        - To find valid values of `scheme`, `method` and `siting`, search for
+          the methods beginning with `SUBSAMPLING_SCHEME_`, `INTERPOLATION_`
+          and `CHROMA_SITING_` in this module.
+        - The interpolation is separable. The columns are interpolated first
+          on the smaller array, and then the rows. Each pass adds one gathered
+          and weighted copy of the input per tap, so it is fully vectorized.
+        - The tap indices and weights of each axis are computed once per
+          size, sub-sampling factor, method and siting, and cached.
+          The samples beyond the edges are replicated.
+        - The integer components are interpolated in fixed-point arithmetic
+          with 8-bit weights, and `int32` accumulators for 8-bit components.
+          The results are rounded half up and clipped to the range of the type.
+        - The floating-point components are interpolated in their own type
+          without clipping.
+
+        ## References
+        - Table 8 of Rec. ITU-R BT.2100-2
+        """
+
+        from numpy import asarray, clip, iinfo, int32, int64, right_shift
+
+        luma = asarray(luma)
+        chroma = asarray(chroma)
+
+        if luma.ndim < 2 or chroma.ndim < 2:
+            raise ValueError("The minimum dimension of the components is 2")
+
+        luma = _move_spatial_axes(luma, axes)
+        chroma = _move_spatial_axes(chroma, axes)
+
+        if method not in (INTERPOLATION_BILINEAR(), INTERPOLATION_BICUBIC()):
+            raise ValueError(f"Unsupported interpolation method: {method}")
+        if siting not in (CHROMA_SITING_COSITED(), CHROMA_SITING_CENTER()):
+            raise ValueError(f"Unsupported chroma siting: {siting}")
+
+        dv, dh = get_subsampling_factors(scheme)
+        v, h = luma.shape[:2]
+        v, h = min(v, chroma.shape[0] * dv), min(h, chroma.shape[1] * dh)
+        out, upsampled_chroma = _get_spatial_output(
+            out, (v, h, *chroma.shape[2:]), chroma.dtype, axes
+        )
+
+        integer = chroma.dtype.kind in "biu"
+        if integer:
+            accumulator_type = int32 if chroma.dtype.itemsize == 1 else int64
+        else:
+            accumulator_type = chroma.dtype
+
+        values = chroma
+        shift = 0
+        for axis, length, factor in ((1, h, dh), (0, v, dv)):
+            if factor == 1:
+                continue
+            indices, weights, integer_weights = _get_interpolation_taps(
+                length, chroma.shape[axis], factor, method, siting
+            )
+            values = _interpolate_axis(
+                values,
+                axis,
+                indices,
+                integer_weights if integer else weights,
+                accumulator_type,
+            )
+            shift += _INTERPOLATION_WEIGHT_BITS if integer else 0
+
+        if not integer or shift == 0:
+            upsampled_chroma[...] = values
+            return out
+
+        limits = iinfo(chroma.dtype)
+        values += 1 << (shift - 1)
+        right_shift(values, shift, out=values)
+        clip(values, limits.min, limits.max, out=values)
+        upsampled_chroma[...] = values
+        return out
+
+
+def get_subsampling_factors(scheme: Tuple[int, int, int]) -> Tuple[int, int]:
+    """
+    Get the vertical and horizontal sub-sampling factors of the given scheme
+
+    ## Parameters
+    - `scheme`: Colour sub-sampling scheme `J:a:b`
+
+    ## Returns
+    - A tuple of the vertical and horizontal factors `(dv, dh)`
+        - The chroma components have `1 / dv` rows and `1 / dh` columns
+          of the luma components
+
+    ## Details
+    - The horizontal factor is `J / a`
+    - The vertical factor is `2` if `b` is zero, otherwise `1`
+    - To find valid values of `scheme`, search for the methods
+      beginning with `SUBSAMPLING_SCHEME_` in this module.
+
+    ## References
+    - Table 8 of Rec. ITU-R BT.2100-2
+    """
+
+    j, a, b = map(int, scheme)
+
+    if j <= 0 or a <= 0 or j % a != 0:
+        raise ValueError(f"Unsupported sub-sampling scheme: {j}:{a}:{b}")
+
+    dv, dh = (2 if b == 0 else 1), j // a
+    return (dv, dh)
+
+
+def blocks_from_plane(plane: ArrayLike, scheme: Tuple[int, int, int]) -> NDArray:
+    """
+    Represent a plane in the block shape of the given scheme
+
+    ## Parameters
+    - `plane`: An array in the shape of `(V, H, ...)`
+    - `scheme`: Colour sub-sampling scheme `J:a:b`
+
+    ## Returns
+    - An array in the shape of `(V / dv, dv, H / dh, dh, ...)`
+        - `(dv, dh)` are the factors of `get_subsampling_factors(scheme)`
+        - It is a view of `plane` if `plane` is contiguous
+
+    ## Details
+    - It matches the view of `BT2100.upsample`,
+      so the luma and chroma components can be combined element-wise.
+    """
+
+    from numpy import asarray
+
+    plane = asarray(plane)
+
+    if plane.ndim < 2:
+        raise ValueError("The minimum dimension of the plane is 2")
+
+    v, h = plane.shape[:2]
+    dv, dh = get_subsampling_factors(scheme)
+
+    if v % dv != 0 or h % dh != 0:
+        raise ValueError(f"The shape of the plane should be a multiple of ({dv}, {dh})")
+
+    return plane.reshape(v // dv, dv, h // dh, dh, *plane.shape[2:])
+
+
+def plane_from_blocks(blocks: ArrayLike) -> NDArray:
+    """
+    Represent an array in the block shape as a plane
+
+    ## Parameters
+    - `blocks`: An array in the shape of `(V / dv, dv, H / dh, dh, ...)`
+
+    ## Returns
+    - An array in the shape of `(V, H, ...)`
+        - It is a view of `blocks` if `blocks` is contiguous
+
+    ## Details
+    - It is the inverse operation of `blocks_from_plane`
+    """
+
+    from numpy import asarray
+
+    blocks = asarray(blocks)
+
+    if blocks.ndim < 4:
+        raise ValueError("The minimum dimension of the blocks is 4")
+
+    v_blocks, dv, h_blocks, dh = blocks.shape[:4]
+    return blocks.reshape(v_blocks * dv, h_blocks * dh, *blocks.shape[4:])
+
+
+def build_pyramid(
+    planes: Sequence[ArrayLike],
+    levels: int = 2,
+    *,
+    arena: Union[NDArray, None] = None,
+) -> List[Tuple[NDArray, ...]]:
+    """
+    Build a pyramid of successive 2x reductions of the planes
+
+    ## Parameters
+    - `planes`: The planes of a frame, such as `(Y', Cb', Cr')`
+        - Arrays with the minimum dimension of 2 and the same data type
+        - Their shapes may differ, for example after chroma sub-sampling
+    - `levels`
+        - The number of reductions
+        - The default value is `2`, which builds the half-
+          and quarter-resolution levels
+    - `arena`
+        - An optional contiguous array of the same data type as the planes
+          to store all the levels
+        - It should have at least `get_pyramid_size(shapes, levels)` elements
+        - The default value is `None`, which allocates one arena
+
+    ## Returns
+    - A list of `levels` tuples of planes (`List[Tuple[NDArray, ...]]`)
+        - The first tuple is the half resolution, and so on
+        - Each plane is a contiguous view of the arena
+
+    ## Details
+    - Each level is the area average of the previous level
+      by `BT2100.subsample_average` with the `4:2:0` scheme,
+      so each level is computed from the previous one rather than the frame.
+    - The size of each level is `(ceil(V / 2), ceil(H / 2))` of the previous level.
+    - Since each level is rounded, a level may differ by one code value
+      from the direct area average of the frame for the integer planes.
+    - All the levels are stored in one arena per frame, which can be acquired
+      from `FramePool` to build the pyramids of a sequence without allocation.
+
+    ## Examples
+
+        ```python
+        shapes = [y.shape, cb.shape, cr.shape]
+        with pool.borrow((get_pyramid_size(shapes, 2),), uint8) as arena:
+            (half_y, half_cb, half_cr), (quarter_y, ...) = build_pyramid(
+                (y, cb, cr), 2, arena=arena
+            )
+        ```
+    """
+
+    from numpy import asarray, empty
+
+    from .buffer import get_buffer_view
+
+    planes = [asarray(plane) for plane in planes]
+    levels = int(levels)
+
+    if not planes:
+        raise ValueError("There should be at least one plane")
+    if any(plane.ndim < 2 for plane in planes):
+        raise ValueError("The minimum dimension of the planes is 2")
+    if any(plane.dtype != planes[0].dtype for plane in planes):
+        raise ValueError("The planes should have the same data type")
+    if levels < 0:
+        raise ValueError("The number of levels should be greater than or equal to 0")
+
+    size = get_pyramid_size([plane.shape for plane in planes], levels)
+    if arena is None:
+        arena = empty(size, dtype=planes[0].dtype)
+    if arena.dtype != planes[0].dtype:
+        raise ValueError(f"The arena should be of the data type {planes[0].dtype}")
+    arena = get_buffer_view(arena, (size,))
+
+    sample = BT2100()
+    scheme = SUBSAMPLING_SCHEME_420()
+    pyramid = []
+    offset = 0
+
+    for _ in range(levels):
+        level = []
+        for plane in planes:
+            shape = (-(-plane.shape[0] // 2), -(-plane.shape[1] // 2), *plane.shape[2:])
+            reduced_plane = get_buffer_view(arena[offset:], shape)
+            sample.subsample_average(scheme, plane, plane, out=reduced_plane)
+            level.append(reduced_plane)
+            offset += reduced_plane.size
+        planes = level
+        pyramid.append(tuple(level))
+    return pyramid
+
+
+def get_pyramid_size(shapes: Sequence[Tuple[int, ...]], levels: int = 2) -> int:
+    """
+    Get the number of elements of the arena of `build_pyramid`
+
+    ## Parameters
+    - `shapes`: The shapes of the planes of a frame
+    - `levels`
+        - The number of reductions
+        - The default value is `2`
+
+    ## Returns
+    - The number of elements of all the levels (`int`)
+    """
+
+    from math import prod
+
+    shapes = [tuple(map(int, shape)) for shape in shapes]
+    size = 0
+
+    for _ in range(int(levels)):
+        shapes = [(-(-v // 2), -(-h // 2), *rest) for v, h, *rest in shapes]
+        size += sum(prod(shape) for shape in shapes)
+    return size
 
 
 def SUBSAMPLING_SCHEME_420() -> Tuple[int, int, int]:
@@ -156,3 +666,186 @@ def SUBSAMPLING_SCHEME_444() -> Tuple[int, int, int]:
     """
 
     return (4, 4, 4)
+
+
+def INTERPOLATION_BILINEAR() -> str:
+    """
+    Bilinear interpolation for `BT2100.upsample_interpolated`
+
+    ## Details
+    - Each sample is interpolated from the 2 nearest chroma samples per axis
+    """
+
+    return "bilinear"
+
+
+def INTERPOLATION_BICUBIC() -> str:
+    """
+    Bicubic interpolation for `BT2100.upsample_interpolated`
+
+    ## Details
+    - Each sample is interpolated from the 4 nearest chroma samples per axis
+      with the Catmull-Rom kernel (Keys kernel with `a = -0.5`)
+    - The results may overshoot the chroma samples near the edges,
+      so the integer results are clipped
+    """
+
+    return "bicubic"
+
+
+def CHROMA_SITING_COSITED() -> str:
+    """
+    Chroma sample position for `BT2100.upsample_interpolated`
+
+    ## Details
+    - The first (top-left) chroma sample is co-sited
+        with the first Y' or I samples
+    - It matches the chroma components of `BT2100.subsample`
+    """
+
+    return "cosited"
+
+
+def CHROMA_SITING_CENTER() -> str:
+    """
+    Chroma sample position for `BT2100.upsample_interpolated`
+
+    ## Details
+    - Each chroma sample is sited at the center of its block of Y' or I samples
+    - It matches the chroma components of `BT2100.subsample_average`
+    """
+
+    return "center"
+
+
+_INTERPOLATION_WEIGHT_BITS = 8
+
+
+@lru_cache(maxsize=None)
+def _get_interpolation_taps(
+    length: int,
+    length_chroma: int,
+    factor: int,
+    method: str,
+    siting: str,
+) -> Tuple[NDArray[intp], NDArray[float64], NDArray[int32]]:
+    """
+    An internal cache of the tap indices and weights of an interpolated axis
+
+    - The arrays are in the shape of `(taps, length)`.
+    - The indices are clamped to the chroma samples, so the edges are replicated.
+    - The integer weights are scaled by `2 ** _INTERPOLATION_WEIGHT_BITS`,
+      and the rounding error is added to the largest weight,
+      so they sum to exactly `2 ** _INTERPOLATION_WEIGHT_BITS`.
+    """
+
+    from numpy import abs, arange, argmax, clip, floor, rint, where
+
+    if method == INTERPOLATION_BILINEAR():
+        offsets = arange(0, 2)
+    else:
+        offsets = arange(-1, 3)
+
+    if siting == CHROMA_SITING_COSITED():
+        positions = arange(length) / factor
+    else:
+        positions = (arange(length) + 0.5) / factor - 0.5
+
+    taps = floor(positions)[None, :] + offsets[:, None]
+    distances = abs(positions[None, :] - taps)
+
+    if method == INTERPOLATION_BILINEAR():
+        weights = 1 - distances
+    else:
+        a = -0.5
+        weights = where(
+            distances <= 1,
+            ((a + 2) * distances - (a + 3)) * distances**2 + 1,
+            ((a * distances - 5 * a) * distances + 8 * a) * distances - 4 * a,
+        )
+
+    indices = clip(taps, 0, length_chroma - 1).astype(intp)
+    integer_weights = rint(weights * (1 << _INTERPOLATION_WEIGHT_BITS)).astype(int32)
+    largest_taps = argmax(integer_weights, axis=0)
+    integer_weights[largest_taps, arange(length)] += (
+        1 << _INTERPOLATION_WEIGHT_BITS
+    ) - integer_weights.sum(axis=0)
+
+    indices.setflags(write=False)
+    weights.setflags(write=False)
+    integer_weights.setflags(write=False)
+    return (indices, weights, integer_weights)
+
+
+def _interpolate_axis(
+    values: NDArray,
+    axis: int,
+    indices: NDArray[intp],
+    weights: NDArray,
+    dtype: DTypeLike,
+) -> NDArray:
+    """
+    An internal function which applies the taps along an axis of the values
+
+    - Each tap gathers the values along the axis into a reused buffer,
+      which is weighted and added to the accumulator in place.
+    """
+
+    from numpy import add, empty, multiply
+
+    shape = list(values.shape)
+    shape[axis] = indices.shape[1]
+    weights_shape = [1] * values.ndim
+    weights_shape[axis] = indices.shape[1]
+
+    values = values.astype(dtype, copy=False)
+    accumulator = empty(shape, dtype=dtype)
+    gathered_values = empty(shape, dtype=dtype)
+
+    for tap in range(len(indices)):
+        tap_weights = weights[tap].astype(dtype, copy=False).reshape(weights_shape)
+        values.take(indices[tap], axis=axis, out=gathered_values)
+        if tap == 0:
+            multiply(gathered_values, tap_weights, out=accumulator)
+        else:
+            multiply(gathered_values, tap_weights, out=gathered_values)
+            add(accumulator, gathered_values, out=accumulator)
+    return accumulator
+
+
+def _move_spatial_axes(array: NDArray, axes: Tuple[int, int]) -> NDArray:
+    """
+    An internal function which moves the spatial axes of an array to the front
+
+    - It returns a view, so the arrays of any layout are processed without copying.
+    """
+
+    from numpy import moveaxis
+
+    return moveaxis(array, tuple(map(int, axes)), (0, 1))
+
+
+def _get_spatial_output(
+    out: Union[NDArray, None],
+    shape: Tuple[int, ...],
+    dtype: DTypeLike,
+    axes: Tuple[int, int],
+) -> Tuple[NDArray, NDArray]:
+    """
+    An internal function which gets the output array with the spatial axes at `axes`
+
+    - `shape` is the shape with the spatial axes at the front.
+    - It returns the output array in the layout of the caller, and its view
+      with the spatial axes at the front.
+    - The new output array is contiguous in the layout of the caller.
+    """
+
+    from numpy import empty
+
+    if out is None:
+        vertical, horizontal = (int(axis) % len(shape) for axis in axes)
+        out_shape = list(shape[2:])
+        for axis, length in sorted(((vertical, shape[0]), (horizontal, shape[1]))):
+            out_shape.insert(axis, length)
+        out = empty(out_shape, dtype=dtype)
+    return (out, get_output_array(_move_spatial_axes(out, axes), shape, dtype))
@@ -0,0 +1,376 @@
+from asyncio import Queue, Task
+from concurrent.futures import Executor
+from numpy import uint8
+from numpy.typing import NDArray
+from os import PathLike
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .data import YCbCrFrame
+
+T = TypeVar("T")
+
+
+async def iter_async(
+    read: Callable[[], Union[T, None]],
+    *,
+    executor: Union[Executor, None] = None,
+    queue_size: int = 4,
+) -> AsyncIterator[T]:
+    """
+    Iterate over the items read by a blocking function asynchronously
+
+    ## Parameters
+    - `read`
+        - A blocking function which reads the next item,
+          or returns `None` at the end
+    - `executor`
+        - The executor to run `read` in
+        - The default value is `None`, which uses the default executor of the loop
+    - `queue_size`
+        - The maximum number of items read ahead
+        - The default value is `4`
+
+    ## Returns
+    - An asynchronous iterator of the items
+
+    ## Details
+    - A task reads the items in the executor into an `asyncio.Queue`,
+      while the consumer processes the previous items.
+      The task waits when the queue is full (backpressure),
+      so the memory is bounded by `queue_size`.
+    - The items are read one at a time in order,
+      so `read` does not need to be thread-safe.
+    - Many streams can be read concurrently with one executor,
+      since a stream takes a thread only while an item is being read.
+    - An error of `read` is raised by the iterator after the items before it
+    """
+
+    from asyncio import CancelledError, create_task, get_running_loop
+
+    queue_size = int(queue_size)
+
+    if queue_size <= 0:
+        raise ValueError("The queue size should be greater than 0")
+
+    loop = get_running_loop()
+    queue: Queue = Queue(queue_size)
+    end = object()
+
+    async def produce() -> None:
+        try:
+            while True:
+                item = await loop.run_in_executor(executor, read)
+                if item is None:
+                    break
+                await queue.put(item)
+        except Exception as error:
+            await queue.put(_Failure(error))
+        else:
+            await queue.put(end)
+
+    producer = create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is end:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except CancelledError:
+            pass
+
+
+def iter_ycbcr_frames_async(
+    device: BinaryIO,
+    size: Tuple[int, int],
+    subsampling_scheme: Tuple[int, int, int],
+    bit_per_pixel_y: int = 8,
+    bit_per_pixel_cb: int = 8,
+    bit_per_pixel_cr: int = 8,
+    *,
+    executor: Union[Executor, None] = None,
+    queue_size: int = 4,
+) -> AsyncIterator[YCbCrFrame]:
+    """
+    Iterate over the YCbCr frames of a raw planar device asynchronously
+
+    ## Parameters
+    - `device`: A readable binary device to load the frames from
+    - `size`: The width and height of the frames
+    - `subsampling_scheme`: The sub-sampling scheme used for the frames
+        - Search for the methods beginning
+          with `SUBSAMPLING_SCHEME_` in the `sample` module
+    - `bit_per_pixel_y`, `bit_per_pixel_cb`, `bit_per_pixel_cr`
+        - The bits per pixel of the planes
+        - The default value is `8`
+    - `executor`, `queue_size`: See `iter_async`
+
+    ## Returns
+    - An asynchronous iterator of the frames (`YCbCrFrame`)
+        - Each frame is read into its own buffer with `readinto`
+    """
+
+    from .data import _read_into
+
+    def read() -> Union[YCbCrFrame, None]:
+        frame = YCbCrFrame(
+            size,
+            subsampling_scheme,
+            bit_per_pixel_y,
+            bit_per_pixel_cb,
+            bit_per_pixel_cr,
+        )
+        return frame if _read_into(device, frame.buffer) else None
+
+    return iter_async(read, executor=executor, queue_size=queue_size)
+
+
+def iter_bmp_frames_async(
+    paths: Iterable[Union[str, PathLike]],
+    *,
+    executor: Union[Executor, None] = None,
+    queue_size: int = 4,
+) -> AsyncIterator[NDArray[uint8]]:
+    """
+    Iterate over the R'G'B' values of a set of BMP frames asynchronously
+
+    ## Parameters
+    - `paths`: The paths of the frames in order
+    - `executor`, `queue_size`: See `iter_async`
+
+    ## Returns
+    - An asynchronous iterator of the 8-bit values loaded by `load_bmp_image`
+        - The values are copied, so the files are not mapped
+          while the values are queued
+    """
+
+    paths = iter(paths)
+
+    def read() -> Union[NDArray[uint8], None]:
+        from .bmp import load_bmp_image
+
+        path = next(paths, None)
+        return None if path is None else load_bmp_image(path, copy=True)
+
+    return iter_async(read, executor=executor, queue_size=queue_size)
+
+
+def iter_bundle_async(
+    path: Union[str, PathLike],
+    *,
+    executor: Union[Executor, None] = None,
+    queue_size: int = 4,
+) -> AsyncIterator[Tuple[str, NDArray]]:
+    """
+    Iterate over the arrays of an encoded bundle asynchronously
+
+    ## Parameters
+    - `path`: The path of the bundle saved by `numpy.savez`
+    - `executor`, `queue_size`: See `iter_async`
+
+    ## Returns
+    - An asynchronous iterator of the names and arrays of the bundle
+    """
+
+    from numpy import load
+
+    bundle = None
+    names = None
+
+    def read() -> Union[Tuple[str, NDArray], None]:
+        nonlocal bundle, names
+
+        if bundle is None:
+            bundle = load(path)
+            names = iter(bundle.files)
+
+        name = next(names, None)
+        if name is None:
+            bundle.close()
+            return None
+        return (name, bundle[name])
+
+    return iter_async(read, executor=executor, queue_size=queue_size)
+
+
+async def save_bundle_async(
+    path: Union[str, PathLike],
+    *,
+    executor: Union[Executor, None] = None,
+    **arrays: NDArray,
+) -> None:
+    """
+    Save the arrays into an encoded bundle asynchronously
+
+    ## Parameters
+    - `path`: The path of the bundle
+    - `executor`
+        - The executor to run `numpy.savez` in
+        - The default value is `None`, which uses the default executor of the loop
+    - `arrays`: The named arrays of the bundle
+    """
+
+    from asyncio import get_running_loop
+    from functools import partial
+    from numpy import savez
+
+    await get_running_loop().run_in_executor(executor, partial(savez, path, **arrays))
+
+
+class AsyncFrameSink:
+    """
+    Asynchronous sink which writes the frames with a blocking function
+
+    ## Details
+    - A task writes the queued frames in the executor in order,
+      while the producer prepares the next frames.
+      `write` waits when the queue is full (backpressure).
+    - The frames should not be modified until they are written,
+      which is ensured by `aclose`.
+    - An error of the blocking function is raised by the next call,
+      and the frames after it are dropped.
+
+    ## Examples
+
+        ```python
+        with open(path, "wb") as device:
+            async with AsyncFrameSink(partial(save_ycbcr_image, device)) as sink:
+                async for frame in frames:
+                    await sink.write(frame)
+
+        async with AsyncFrameSink(save_bmp_image) as sink:
+            await sink.write(path, values)
+        ```
+    """
+
+    _error: Union[BaseException, None]
+    _executor: Union[Executor, None]
+    _failed: bool
+    _queue: Union[Queue, None]
+    _queue_size: int
+    _task: Union[Task, None]
+    _write: Callable[..., None]
+
+    def __init__(
+        self,
+        write: Callable[..., None],
+        *,
+        executor: Union[Executor, None] = None,
+        queue_size: int = 4,
+    ) -> None:
+        """
+        ## Parameters
+        - `write`: A blocking function which writes a frame
+            - It is called with the arguments of `AsyncFrameSink.write`
+        - `executor`
+            - The executor to run `write` in
+            - The default value is `None`, which uses the default executor
+              of the loop
+        - `queue_size`
+            - The maximum number of frames waiting to be written
+            - The default value is `4`
+        """
+
+        queue_size = int(queue_size)
+
+        if queue_size <= 0:
+            raise ValueError("The queue size should be greater than 0")
+
+        self._error = None
+        self._executor = executor
+        self._failed = False
+        self._queue = None
+        self._queue_size = queue_size
+        self._task = None
+        self._write = write
+
+    async def __aenter__(self) -> "AsyncFrameSink":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
+    async def write(self, *arguments) -> None:
+        """
+        Queue a frame to be written
+
+        ## Parameters
+        - `arguments`: The arguments of the blocking function
+        """
+
+        from asyncio import create_task
+
+        self._raise_error()
+
+        if self._task is None:
+            self._queue = Queue(self._queue_size)
+            self._task = create_task(self._consume())
+        elif self._task.done():
+            raise ValueError("The sink is closed")
+
+        await self._queue.put(arguments)
+
+    async def aclose(self) -> None:
+        """
+        Wait until the queued frames are written, and stop the task
+        """
+
+        if self._task is not None and not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """
+        An internal method which raises the error of the task once
+        """
+
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    async def _consume(self) -> None:
+        """
+        An internal method which writes the queued frames in the executor
+        """
+
+        from asyncio import get_running_loop
+
+        loop = get_running_loop()
+
+        while True:
+            arguments = await self._queue.get()
+            if arguments is None:
+                return
+            # The frames after an error are dropped even after it is raised
+            if self._failed:
+                continue
+            try:
+                await loop.run_in_executor(self._executor, self._write, *arguments)
+            except Exception as error:
+                self._error = error
+                self._failed = True
+
+
+class _Failure:
+    """
+    An internal wrapper of an error passed through a queue
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
@@ -0,0 +1,139 @@
+from functools import lru_cache
+from typing import Iterator
+
+
+def iter_stripes(height: int, stripe_height: int) -> Iterator[slice]:
+    """
+    Iterate over the row stripes of a frame
+
+    ## Parameters
+    - `height`: The number of rows of the frame
+    - `stripe_height`: The number of rows of each stripe
+        - It should be greater than 0
+        - The last stripe may have fewer rows
+
+    ## Returns
+    - An iterator of the row slices of the stripes
+        - Each stripe begins at a multiple of `stripe_height`
+    """
+
+    height, stripe_height = int(height), int(stripe_height)
+
+    if stripe_height <= 0:
+        raise ValueError("The stripe height should be greater than 0")
+
+    for start in range(0, height, stripe_height):
+        yield slice(start, min(start + stripe_height, height))
+
+
+def get_stripe_height(
+    width: int,
+    bytes_per_sample: int,
+    *,
+    alignment: int = 1,
+    cache_size: int = 0,
+) -> int:
+    """
+    Get the number of rows of the stripes which fit in the cache
+
+    ## Parameters
+    - `width`: The number of columns of the frame
+    - `bytes_per_sample`
+        - The number of bytes touched per sample (pixel) in a stripe,
+          including the input, output and intermediate values
+    - `alignment`
+        - The stripe height is a multiple of this value
+        - Use the vertical sub-sampling factor of the chroma components,
+          so that the stripes are aligned with the chroma rows
+        - The default value is `1`
+    - `cache_size`
+        - The cache size in bytes
+        - The default value is `0`, which uses `get_cache_size()`
+
+    ## Returns
+    - The number of rows of the stripes (`int`)
+        - It is at least `alignment`
+
+    ## Examples
+
+        ```python
+        from .sample import get_subsampling_factors
+
+        dv, _ = get_subsampling_factors(SUBSAMPLING_SCHEME_420())
+        # uint8 input, uint8 output and 2 float32 intermediate values per channel
+        stripe_height = get_stripe_height(3840, 3 + 3 + 2 * 3 * 4, alignment=dv)
+        ```
+    """
+
+    width, bytes_per_sample, alignment, cache_size = map(
+        int, (width, bytes_per_sample, alignment, cache_size)
+    )
+
+    if width <= 0 or bytes_per_sample <= 0:
+        raise ValueError("The width and bytes per sample should be greater than 0")
+    if alignment <= 0:
+        raise ValueError("The alignment should be greater than 0")
+
+    if cache_size <= 0:
+        cache_size = get_cache_size()
+
+    stripe_height = cache_size // (width * bytes_per_sample)
+    stripe_height -= stripe_height % alignment
+    return max(stripe_height, alignment)
+
+
+@lru_cache(maxsize=None)
+def get_cache_size(level: int = 2) -> int:
+    """
+    Get the size of the data cache of the processor
+
+    ## Parameters
+    - `level`
+        - The level of the cache
+        - The default value is `2`
+
+    ## Returns
+    - The cache size in bytes (`int`)
+
+    ## Details
+    - The size is read from `sysfs` on Linux,
+      otherwise `DEFAULT_CACHE_SIZE()` is returned.
+    """
+
+    from glob import glob
+
+    level = int(level)
+
+    for cache_path in sorted(glob("/sys/devices/system/cpu/cpu0/cache/index*")):
+        try:
+            with open(f"{cache_path}/level") as file:
+                if int(file.read()) != level:
+                    continue
+            with open(f"{cache_path}/type") as file:
+                if file.read().strip() == "Instruction":
+                    continue
+            with open(f"{cache_path}/size") as file:
+                size = file.read().strip().upper()
+        except (OSError, ValueError):
+            continue
+
+        units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+        try:
+            if size[-1:] in units:
+                return int(size[:-1]) * units[size[-1]]
+            return int(size)
+        except ValueError:
+            continue
+
+    return DEFAULT_CACHE_SIZE()
+
+
+def DEFAULT_CACHE_SIZE() -> int:
+    """
+    The default cache size in bytes (`1 MiB`)
+
+    ## Details
+    - It is used when the cache size of the processor is unknown
+    """
+
+    return 1 << 20
@@ -1,4 +1,5 @@
-from numpy import uint8, uint16, uint32, uint64
+from numpy import float16, float32, float64, uint8, uint16, uint32, uint64
+from numpy.typing import DTypeLike
 from typing import Union
 
 uintlike = Union[uint8, uint16, uint32, uint64]
@@ -6,6 +7,11 @@ uintlike = Union[uint8, uint16, uint32, uint64]
 Type alias for unsigned integers with different bit lengths
 """
 
+floatlike = Union[float16, float32, float64]
+"""
+Type alias for floating-point numbers with different bit lengths
+"""
+
 
 def get_uint_type(bit_length: int) -> uintlike:
     """
@@ -21,3 +27,15 @@ def get_uint_type(bit_length: int) -> uintlike:
         return uint64
     else:
         raise NotImplementedError("The bit depth is too large")
+
+
+def get_float_type(dtype: DTypeLike) -> floatlike:
+    """
+    Get the floating-point type of the data type
+    """
+    from numpy import dtype as DType
+
+    dtype = DType(dtype).type
+    if dtype not in (float16, float32, float64):
+        raise ValueError(f"Unsupported floating-point data type: {dtype.__name__}")
+    return dtype
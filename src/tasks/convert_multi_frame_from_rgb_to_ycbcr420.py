@@ -3,10 +3,10 @@ from numpy import array, uint8
 from numpy.typing import NDArray
 from typing import List, Tuple
 
-from .utils.env import ASSETS_DIR_PATH, OUTPUTS_DIR_PATH
+from .utils.env import ARTIFACTS, ASSETS_DIR_PATH, OUTPUTS_DIR_PATH
 from .utils.report import get_metrics_report
 from ..modules.color import H273, KR_KB_BT601
-from ..modules.data import packed_from_planar, planar_from_packed, save_ycbcr_image
+from ..modules.data import planar_from_packed, save_ycbcr_image
 from ..modules.sample import BT2100, SUBSAMPLING_SCHEME_420
 
 __all__ = ["images_data_as_ycbcr"]
@@ -101,30 +101,20 @@ for image_id in range(3):
         image_data_as_y_subsampled,
         image_data_as_cr_subsampled,
     )
-    image_data_as_ycbcr_upsampled = packed_from_planar(
-        (
-            image_data_as_y_upsampled,
-            image_data_as_cb_upsampled,
-            image_data_as_cr_upsampled,
-        )
-    )
-
-    # De-quantize the image from YCbCr to YPbPr
-    # - For comparison purposes
-    image_data_as_ypbpr_transformed = COLOR.set_full_range(False).dequantize_ycbcr(
-        image_data_as_ycbcr_upsampled
-    )
 
-    # Convert the image from YPbPr to analog RGB
+    # Reconstruct the image from YCbCr 4:2:0 to digital RGB
+    # - De-quantize from YCbCr to YPbPr, convert to analog RGB and quantize to digital RGB
     # - For comparison purposes
-    image_data_as_argb_transformed = COLOR.rgb_from_ypbpr(
-        image_data_as_ypbpr_transformed, KR, KB
-    )
-
-    # Quantize the image from analog RGB to digital RGB
-    # - For comparison purposes
-    image_data_as_drgb_transformed = COLOR.set_full_range(True).quantize_rgb(
-        image_data_as_argb_transformed
+    image_data_as_drgb_transformed = COLOR.set_full_range(False).rgb_from_ycbcr_planes(
+        (
+            image_data_as_y_subsampled,
+            image_data_as_cb_subsampled,
+            image_data_as_cr_subsampled,
+        ),
+        SUBSAMPLING_SCHEME,
+        KR,
+        KB,
+        full_range_rgb=True,
     )
 
     ############################
@@ -135,39 +125,49 @@ for image_id in range(3):
     # - This is for comparison with the transformed image
     image_copied = Image.fromarray(image_data_as_drgb, mode="RGB")
     width, height = image_copied.size
-    image_copied.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{image_id}_rgb_copied.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_drgb,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{image_id}_rgb_copied.{width}x{height}.bmp",
+        "RGB",
     )
 
     # Save the transformed image in the 24-bit RGB BMP format
     # - For comparison purposes
     image_transformed = Image.fromarray(image_data_as_drgb_transformed, mode="RGB")
     width, height = image_transformed.size
-    image_transformed.save(
+    ARTIFACTS.write(
+        image_data_as_drgb_transformed,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_rgb_transformed.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_rgb_transformed.{width}x{height}.bmp",
+        "RGB",
     )
 
     # Save the Y, Cb and Cr images without sub-sampling in the 8-bit grayscale BMP format
     image_y = Image.fromarray(image_data_as_y, mode="L")
     width, height = image_y.size
-    image_y.save(
+    ARTIFACTS.write(
+        image_data_as_y,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_y_without_subsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_y_without_subsampling.{width}x{height}.bmp",
+        "L",
     )
 
     image_cb = Image.fromarray(image_data_as_cb, mode="L")
     width, height = image_cb.size
-    image_cb.save(
+    ARTIFACTS.write(
+        image_data_as_cb,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_cb_without_subsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_cb_without_subsampling.{width}x{height}.bmp",
+        "L",
     )
 
     image_cr = Image.fromarray(image_data_as_cr, mode="L")
     width, height = image_cr.size
-    image_cr.save(
+    ARTIFACTS.write(
+        image_data_as_cr,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_cr_without_subsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_cr_without_subsampling.{width}x{height}.bmp",
+        "L",
     )
 
     images_as_ycbcr.append((image_y, image_cb, image_cr))
@@ -175,45 +175,57 @@ for image_id in range(3):
     # Save the Y, Cb and Cr images with sub-sampling in the 8-bit grayscale BMP format
     image_y_subsampled = Image.fromarray(image_data_as_y_subsampled, mode="L")
     width, height = image_y_subsampled.size
-    image_y_subsampled.save(
+    ARTIFACTS.write(
+        image_data_as_y_subsampled,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_y_with_subsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_y_with_subsampling.{width}x{height}.bmp",
+        "L",
     )
 
     image_cb_subsampled = Image.fromarray(image_data_as_cb_subsampled, mode="L")
     width, height = image_cb_subsampled.size
-    image_cb_subsampled.save(
+    ARTIFACTS.write(
+        image_data_as_cb_subsampled,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_cb_with_subsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_cb_with_subsampling.{width}x{height}.bmp",
+        "L",
     )
 
     image_cr_subsampled = Image.fromarray(image_data_as_cr_subsampled, mode="L")
     width, height = image_cr_subsampled.size
-    image_cr_subsampled.save(
+    ARTIFACTS.write(
+        image_data_as_cr_subsampled,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_cr_with_subsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_cr_with_subsampling.{width}x{height}.bmp",
+        "L",
     )
 
     # Save the Y, Cb and Cr images with up-sampling in the 8-bit grayscale BMP format
     image_y_upsampled = Image.fromarray(image_data_as_y_upsampled, mode="L")
     width, height = image_y_upsampled.size
-    image_y_upsampled.save(
+    ARTIFACTS.write(
+        image_data_as_y_upsampled,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_y_with_upsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_y_with_upsampling.{width}x{height}.bmp",
+        "L",
     )
 
     image_cb_upsampled = Image.fromarray(image_data_as_cb_upsampled, mode="L")
     width, height = image_cb_upsampled.size
-    image_cb_upsampled.save(
+    ARTIFACTS.write(
+        image_data_as_cb_upsampled,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_cb_with_upsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_cb_with_upsampling.{width}x{height}.bmp",
+        "L",
     )
 
     image_cr_upsampled = Image.fromarray(image_data_as_cr_upsampled, mode="L")
     width, height = image_cr_upsampled.size
-    image_cr_upsampled.save(
+    ARTIFACTS.write(
+        image_data_as_cr_upsampled,
         OUTPUTS_DIR_PATH
-        / f"foreman_qcif_{image_id}_cr_with_upsampling.{width}x{height}.bmp"
+        / f"foreman_qcif_{image_id}_cr_with_upsampling.{width}x{height}.bmp",
+        "L",
     )
 
     images_as_ycbcr_upsampled.append(
@@ -233,6 +245,10 @@ with open(
 ###  Report  ###
 ################
 
+# Wait until the artifacts are written
+# - A failed write fails the task
+ARTIFACTS.flush()
+
 print(
     f"""\
 ## Task 2
@@ -8,7 +8,7 @@ from ..modules.data import (
     save_ycbcr_image,
 )
 from ..modules.sample import BT2100, SUBSAMPLING_SCHEME_420
-from .utils.env import ASSETS_DIR_PATH, OUTPUTS_DIR_PATH
+from .utils.env import ARTIFACTS, ASSETS_DIR_PATH, OUTPUTS_DIR_PATH
 from .utils.report import get_metrics_report
 
 OUTPUTS_DIR_PATH = OUTPUTS_DIR_PATH / "task_1"
@@ -105,64 +105,94 @@ image_data_as_drgb_transformed = COLOR.set_full_range(True).quantize_rgb(
 # - This is for comparison with the transformed image
 image_copied = Image.fromarray(image_data_as_drgb, mode="RGB")
 width, height = image_copied.size
-image_copied.save(OUTPUTS_DIR_PATH / f"foreman_qcif_0_rgb_copied.{width}x{height}.bmp")
+ARTIFACTS.write(
+    image_data_as_drgb,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_rgb_copied.{width}x{height}.bmp",
+    "RGB",
+)
 
 # Save the transformed image in the 24-bit RGB BMP format
 image_transformed = Image.fromarray(image_data_as_drgb_transformed, mode="RGB")
 width, height = image_transformed.size
-image_transformed.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_rgb_transformed.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_drgb_transformed,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_rgb_transformed.{width}x{height}.bmp",
+    "RGB",
 )
 
 # Save the Y, Cb and Cr images before sub-sampling in the 8-bit grayscale BMP format
 image_y = Image.fromarray(image_data_as_y, mode="L")
 width, height = image_y.size
-image_y.save(OUTPUTS_DIR_PATH / f"foreman_qcif_0_y_default.{width}x{height}.bmp")
+ARTIFACTS.write(
+    image_data_as_y,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_y_default.{width}x{height}.bmp",
+    "L",
+)
 
 image_cb = Image.fromarray(image_data_as_cb, mode="L")
 width, height = image_cb.size
-image_cb.save(OUTPUTS_DIR_PATH / f"foreman_qcif_0_cb_default.{width}x{height}.bmp")
+ARTIFACTS.write(
+    image_data_as_cb,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cb_default.{width}x{height}.bmp",
+    "L",
+)
 
 image_cr = Image.fromarray(image_data_as_cr, mode="L")
 width, height = image_cr.size
-image_cr.save(OUTPUTS_DIR_PATH / f"foreman_qcif_0_cr_default.{width}x{height}.bmp")
+ARTIFACTS.write(
+    image_data_as_cr,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cr_default.{width}x{height}.bmp",
+    "L",
+)
 
 # Save the Y, Cb and Cr images after sub-sampling in the 8-bit grayscale BMP format
 image_y_subsampled = Image.fromarray(image_data_as_y_subsampled, mode="L")
 width, height = image_y_subsampled.size
-image_y_subsampled.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_y_subsampled.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_y_subsampled,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_y_subsampled.{width}x{height}.bmp",
+    "L",
 )
 
 image_cb_subsampled = Image.fromarray(image_data_as_cb_subsampled, mode="L")
 width, height = image_cb_subsampled.size
-image_cb_subsampled.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cb_subsampled.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_cb_subsampled,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cb_subsampled.{width}x{height}.bmp",
+    "L",
 )
 
 image_cr_subsampled = Image.fromarray(image_data_as_cr_subsampled, mode="L")
 width, height = image_cr_subsampled.size
-image_cr_subsampled.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cr_subsampled.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_cr_subsampled,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cr_subsampled.{width}x{height}.bmp",
+    "L",
 )
 
 # Save the Y, Cb and Cr images after up-sampling in the 8-bit grayscale BMP format
 image_y_upsampled = Image.fromarray(image_data_as_y_upsampled, mode="L")
 width, height = image_y_upsampled.size
-image_y_upsampled.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_y_upsampled.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_y_upsampled,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_y_upsampled.{width}x{height}.bmp",
+    "L",
 )
 
 image_cb_upsampled = Image.fromarray(image_data_as_cb_upsampled, mode="L")
 width, height = image_cb_upsampled.size
-image_cb_upsampled.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cb_upsampled.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_cb_upsampled,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cb_upsampled.{width}x{height}.bmp",
+    "L",
 )
 
 image_cr_upsampled = Image.fromarray(image_data_as_cr_upsampled, mode="L")
 width, height = image_cr_upsampled.size
-image_cr_upsampled.save(
-    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cr_upsampled.{width}x{height}.bmp"
+ARTIFACTS.write(
+    image_data_as_cr_upsampled,
+    OUTPUTS_DIR_PATH / f"foreman_qcif_0_cr_upsampled.{width}x{height}.bmp",
+    "L",
 )
 
 # Save the sub-sampled YCbCr image in the planar format (YUV420p)
@@ -184,6 +214,10 @@ with open(
 ###  Report  ###
 ################
 
+# Wait until the artifacts are written
+# - A failed write fails the task
+ARTIFACTS.flush()
+
 print(
     f"""\
 # Assignment 1 Code Outputs
@@ -15,10 +15,9 @@ from numpy.typing import NDArray
 from PIL import Image
 from typing import List, Tuple
 
-from .utils.env import OUTPUTS_DIR_PATH
+from .utils.env import ARTIFACTS, OUTPUTS_DIR_PATH
 from .utils.report import get_metrics_report
 from ..modules.coding import HuffmanTree
-from ..modules.data import packed_from_planar
 from ..modules.quant import quantize_evenly
 
 OUTPUTS_DIR_PATH = OUTPUTS_DIR_PATH / "task_3"
@@ -30,7 +29,6 @@ from .convert_multi_frame_from_rgb_to_ycbcr420 import (
     COLOR,
     KR,
     KB,
-    SAMPLE,
     SUBSAMPLING_SCHEME,
 )
 
@@ -175,6 +173,7 @@ for image_data_as_ycbcr_decoded in images_data_as_ycbcr_decoded:
 
     images_data_as_ycbcr_dequantized.append(image_data_as_ycbcr_dequantized)
 
+# Reconstruct the de-quantized YCbCr images from 4:2:0 to digital RGB
 # 1. Up-sample the de-quantized YCbCr images from 4:2:0 to 4:4:4 scheme
 # 2. De-quantize the image from YCbCr to YPbPr
 # 3. Convert the image from YPbPr to analog RGB
@@ -182,44 +181,13 @@ for image_data_as_ycbcr_decoded in images_data_as_ycbcr_decoded:
 # - For comparison purposes
 images_data_as_drgb_upsampled: List[NDArray[uint8]] = []
 for image_data_as_ycbcr_dequantized in images_data_as_ycbcr_dequantized:
-    # 1. ...
-    (
-        image_data_as_y_dequantized,
-        image_data_as_cb_dequantized,
-        image_data_as_cr_dequantized,
-    ) = image_data_as_ycbcr_dequantized
-    image_data_as_y_upsampled = image_data_as_y_dequantized.copy()
-    image_data_as_cb_upsampled = SAMPLE.upsample(
-        SUBSAMPLING_SCHEME,
-        image_data_as_y_dequantized,
-        image_data_as_cb_dequantized,
-    )
-    image_data_as_cr_upsampled = SAMPLE.upsample(
+    # 1. ~ 4. ...
+    image_data_as_drgb_upsampled = COLOR.set_full_range(False).rgb_from_ycbcr_planes(
+        image_data_as_ycbcr_dequantized,
         SUBSAMPLING_SCHEME,
-        image_data_as_y_dequantized,
-        image_data_as_cr_dequantized,
-    )
-    image_data_as_ycbcr_upsampled = packed_from_planar(
-        (
-            image_data_as_y_upsampled,
-            image_data_as_cb_upsampled,
-            image_data_as_cr_upsampled,
-        )
-    )
-
-    # 2. ...
-    image_data_as_ypbpr_upsampled = COLOR.set_full_range(False).dequantize_ycbcr(
-        image_data_as_ycbcr_upsampled
-    )
-
-    # 3. ...
-    image_data_as_argb_upsampled = COLOR.rgb_from_ypbpr(
-        image_data_as_ypbpr_upsampled, KR, KB
-    )
-
-    # 4. ...
-    image_data_as_drgb_upsampled = COLOR.set_full_range(True).quantize_rgb(
-        image_data_as_argb_upsampled
+        KR,
+        KB,
+        full_range_rgb=True,
     )
 
     images_data_as_drgb_upsampled.append(image_data_as_drgb_upsampled)
@@ -232,8 +200,10 @@ for image_data_as_ycbcr_dequantized in images_data_as_ycbcr_dequantized:
 for i, image_data_as_drgb_upsampled in enumerate(images_data_as_drgb_upsampled):
     image_as_drgb_upsampled = Image.fromarray(image_data_as_drgb_upsampled, mode="RGB")
     width, height = image_as_drgb_upsampled.size
-    image_as_drgb_upsampled.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_rgb_transformed.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_drgb_upsampled,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_rgb_transformed.{width}x{height}.bmp",
+        "RGB",
     )
 
 # Save the Y, Cb and Cr images before quantization in the 8-bit grayscale BMP format
@@ -247,20 +217,26 @@ for i, image_data_as_ycbcr in enumerate(images_data_as_ycbcr):
 
     image_as_y = Image.fromarray(image_data_as_y, mode="L")
     width, height = image_as_y.size
-    image_as_y.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_y_before_quantized.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_y,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_y_before_quantized.{width}x{height}.bmp",
+        "L",
     )
 
     image_as_cb = Image.fromarray(image_data_as_cb, mode="L")
     width, height = image_as_cb.size
-    image_as_cb.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cb_before_quantized.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_cb,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cb_before_quantized.{width}x{height}.bmp",
+        "L",
     )
 
     image_as_cr = Image.fromarray(image_data_as_cr, mode="L")
     width, height = image_as_cr.size
-    image_as_cr.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cr_before_quantized.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_cr,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cr_before_quantized.{width}x{height}.bmp",
+        "L",
     )
 
     images_as_ycbcr.append((image_as_y, image_as_cb, image_as_cr))
@@ -276,20 +252,26 @@ for i, image_data_as_ycbcr_dequantized in enumerate(images_data_as_ycbcr_dequant
 
     image_as_y_dequantized = Image.fromarray(image_data_as_y_dequantized, mode="L")
     width, height = image_as_y_dequantized.size
-    image_as_y_dequantized.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_y_dequantized.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_y_dequantized,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_y_dequantized.{width}x{height}.bmp",
+        "L",
     )
 
     image_as_cb_dequantized = Image.fromarray(image_data_as_cb_dequantized, mode="L")
     width, height = image_as_cb_dequantized.size
-    image_as_cb_dequantized.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cb_dequantized.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_cb_dequantized,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cb_dequantized.{width}x{height}.bmp",
+        "L",
     )
 
     image_as_cr_dequantized = Image.fromarray(image_data_as_cr_dequantized, mode="L")
     width, height = image_as_cr_dequantized.size
-    image_as_cr_dequantized.save(
-        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cr_dequantized.{width}x{height}.bmp"
+    ARTIFACTS.write(
+        image_data_as_cr_dequantized,
+        OUTPUTS_DIR_PATH / f"foreman_qcif_{i}_cr_dequantized.{width}x{height}.bmp",
+        "L",
     )
 
     images_as_ycbcr_dequantized.append(
@@ -328,6 +310,10 @@ for image_data_as_ycbcr_quantized, image_data_as_ycbcr_decoded in zip(
             image_data_as_plane_decoded,
         )
 
+# Wait until the artifacts are written
+# - A failed write fails the task
+ARTIFACTS.flush()
+
 print(
     f"""\
 ## Task 3
@@ -1,5 +1,14 @@
+from atexit import register
+from os import environ
 from pathlib import Path
 
+from ...modules.artifact import ArtifactWriter
+
 ASSETS_DIR_PATH = (Path(__file__) / "../../../../assets").resolve()
 OUTPUTS_DIR_PATH = (Path(__file__) / "../../../../outputs").resolve()
 OUTPUTS_DIR_PATH.mkdir(parents=True, exist_ok=True)
+
+# The image artifacts are written in the background
+# - Set `SAVE_ARTIFACTS=0` to skip them for benchmark runs
+ARTIFACTS = ArtifactWriter(enabled=environ.get("SAVE_ARTIFACTS", "1") != "0")
+register(ARTIFACTS.close)
@@ -0,0 +1,78 @@
+import os
+from numpy import arange, uint8
+from pytest import raises
+
+from src.modules.artifact import ArtifactWriter
+from src.modules.bmp import load_bmp_image
+
+
+def get_values(index):
+    return (arange(6 * 8).reshape(6, 8) + index).astype(uint8)
+
+
+def test_images_of_a_path_are_written_in_order(tmp_path):
+    path = tmp_path / "image.bmp"
+
+    with ArtifactWriter(max_workers=4) as artifacts:
+        for index in range(20):
+            artifacts.write(get_values(index), path)
+
+    assert (load_bmp_image(path) == get_values(19)).all()
+    assert os.listdir(tmp_path) == ["image.bmp"]
+
+
+def test_identical_images_are_not_written_again(tmp_path):
+    path = tmp_path / "image.bmp"
+
+    with ArtifactWriter() as artifacts:
+        artifacts.write(get_values(0), path)
+        artifacts.flush()
+        inode = os.stat(path).st_ino
+
+        # The same bytes are skipped within the session
+        artifacts.write(get_values(0), path)
+        artifacts.flush()
+        assert os.stat(path).st_ino == inode
+
+    # The same bytes in the file are skipped by another writer (a re-run)
+    with ArtifactWriter() as artifacts:
+        artifacts.write(get_values(0), path)
+    assert os.stat(path).st_ino == inode
+
+    # The changed bytes are written
+    with ArtifactWriter() as artifacts:
+        artifacts.write(get_values(1), path)
+    assert os.stat(path).st_ino != inode
+    assert (load_bmp_image(path) == get_values(1)).all()
+
+
+def test_files_are_created_with_the_umask(tmp_path):
+    file_mask = os.umask(0o027)
+    try:
+        with ArtifactWriter() as artifacts:
+            artifacts.write(get_values(0), tmp_path / "image.bmp")
+    finally:
+        os.umask(file_mask)
+
+    assert os.stat(tmp_path / "image.bmp").st_mode & 0o777 == 0o640
+
+
+def test_error_is_raised_by_flush_and_leaves_no_file(tmp_path):
+    artifacts = ArtifactWriter()
+    (tmp_path / "image.bmp").mkdir()
+    artifacts.write(get_values(0), tmp_path / "image.bmp")
+    artifacts.write(get_values(0), tmp_path / "other.bmp")
+
+    with raises(OSError):
+        artifacts.flush()
+    artifacts.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["image.bmp", "other.bmp"]
+
+
+def test_disabled_writer_writes_nothing(tmp_path):
+    with ArtifactWriter(enabled=False) as artifacts:
+        artifacts.write(get_values(0), tmp_path / "image.bmp")
+
+    assert not artifacts.enabled
+    assert os.listdir(tmp_path) == []
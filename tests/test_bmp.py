@@ -0,0 +1,79 @@
+from io import BytesIO
+from pathlib import Path
+from numpy import arange, asarray, uint8
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from PIL import Image
+from pytest import mark
+
+from src.modules.bmp import get_bmp_size, load_bmp_image, save_bmp_image
+
+ASSETS = Path(__file__).parent.parent / "assets"
+
+
+def get_values(shape, seed=0):
+    return default_rng(seed).integers(0, 256, shape, dtype=uint8)
+
+
+@mark.parametrize("shape", [(5, 7), (4, 8), (5, 7, 3), (3, 1, 3), (4, 8, 3)])
+def test_saved_bytes_are_the_same_as_pil(shape):
+    values = get_values(shape)
+    expected_device, device = BytesIO(), BytesIO()
+    Image.fromarray(values).save(expected_device, "BMP")
+    save_bmp_image(device, values)
+
+    assert device.getvalue() == expected_device.getvalue()
+
+
+@mark.parametrize("mode", ["L", "P", "RGB", "RGBA"])
+@mark.parametrize("width", [7, 8])
+def test_loaded_values_are_the_same_as_pil(tmp_path, mode, width):
+    path = tmp_path / "image.bmp"
+    if mode == "P":
+        image = Image.fromarray(get_values((5, width), 1), "L").convert("P")
+        image.putpalette(get_values((256 * 3,), 2).tolist())
+    elif mode == "L":
+        image = Image.fromarray(get_values((5, width), 1), "L")
+    else:
+        image = Image.fromarray(get_values((5, width, len(mode)), 1), mode)
+    image.save(path, "BMP")
+
+    with Image.open(path) as expected_image:
+        expected_values = asarray(expected_image.convert("L" if mode == "L" else "RGB"))
+    values = load_bmp_image(path)
+
+    assert_array_equal(values, expected_values)
+    assert get_bmp_size(path) == (width, 5)
+
+
+def test_top_down_rows_are_loaded(tmp_path):
+    values = get_values((4, 5, 3))
+    device = BytesIO()
+    save_bmp_image(device, values)
+    data = bytearray(device.getvalue())
+
+    # The height is negated and the rows are reversed
+    stride = 16
+    rows = asarray(data[54:], dtype=uint8).reshape(4, stride)[::-1]
+    data[22:26] = (-4).to_bytes(4, "little", signed=True)
+    data[54:] = rows.tobytes()
+    (tmp_path / "image.bmp").write_bytes(bytes(data))
+
+    assert_array_equal(load_bmp_image(tmp_path / "image.bmp"), values)
+
+
+def test_round_trip_of_a_grey_scale_image(tmp_path):
+    values = arange(256, dtype=uint8).reshape(16, 16)
+    save_bmp_image(tmp_path / "image.bmp", values)
+    loaded_values = load_bmp_image(tmp_path / "image.bmp", copy=True)
+
+    assert loaded_values.flags.c_contiguous
+    assert_array_equal(loaded_values, values)
+
+
+@mark.parametrize("path", sorted(ASSETS.glob("*.bmp")), ids=lambda path: path.name)
+def test_assets_are_loaded_as_pil(path):
+    with Image.open(path) as image:
+        expected_values = asarray(image.convert("RGB"))
+
+    assert_array_equal(load_bmp_image(path), expected_values)
@@ -0,0 +1,82 @@
+from numpy import float32, uint8, zeros
+from pytest import raises
+
+from src.modules.buffer import FramePool, get_buffer_view, get_output_array
+
+
+def test_pool_reuses_the_released_buffers():
+    pool = FramePool(capacity=1)
+
+    buffer = pool.acquire((4, 6, 3), float32)
+    assert buffer.shape == (4, 6, 3) and buffer.dtype == float32
+    assert buffer.flags.c_contiguous
+    pool.release(buffer)
+
+    assert pool.acquire((4, 6, 3), float32) is buffer
+    # The buffers of other shapes or data types are not mixed up
+    assert pool.acquire((4, 6, 3), float32) is not buffer
+    pool.release(buffer)
+    assert pool.acquire((4, 6, 3), uint8) is not buffer
+    assert pool.acquire((6, 4, 3), float32) is not buffer
+
+
+def test_pool_keeps_up_to_its_capacity():
+    pool = FramePool(capacity=1)
+    buffers = [pool.acquire((8,), uint8) for _ in range(2)]
+
+    for buffer in buffers:
+        pool.release(buffer)
+
+    assert pool.acquire((8,), uint8) is buffers[0]
+    assert pool.acquire((8,), uint8) is not buffers[1]
+
+
+def test_borrowed_buffer_is_released_on_errors():
+    pool = FramePool()
+
+    with raises(RuntimeError):
+        with pool.borrow((8,), uint8) as buffer:
+            raise RuntimeError()
+
+    with pool.borrow((8,), uint8) as borrowed_buffer:
+        assert borrowed_buffer is buffer
+    pool.clear()
+    assert pool.acquire((8,), uint8) is not buffer
+
+
+def test_pool_rejects_invalid_buffers():
+    pool = FramePool()
+
+    with raises(ValueError):
+        FramePool(capacity=-1)
+    with raises(ValueError):
+        pool.release(zeros((4, 4), dtype=uint8)[:, :2])
+
+
+def test_output_array_is_validated():
+    array = zeros((4, 6), dtype=uint8)
+
+    assert get_output_array(array, (4, 6), uint8) is array
+    assert get_output_array(None, (4, 6), uint8).shape == (4, 6)
+    assert get_output_array(array[:, :3], (4, 3), uint8).base is array
+    with raises(ValueError):
+        get_output_array(array, (6, 4), uint8)
+    with raises(ValueError):
+        get_output_array(array, (4, 6), float32)
+    with raises(ValueError):
+        get_output_array(array[:, :3], (4, 3), uint8, contiguous=True)
+
+
+def test_buffer_view_shares_the_leading_elements():
+    buffer = zeros((4, 6), dtype=uint8)
+
+    view = get_buffer_view(buffer, (2, 5))
+    view[...] = 1
+
+    assert view.flags.c_contiguous
+    assert buffer.reshape(-1)[:10].tolist() == [1] * 10
+    assert buffer.reshape(-1)[10:].tolist() == [0] * 14
+    with raises(ValueError):
+        get_buffer_view(buffer, (5, 5))
+    with raises(ValueError):
+        get_buffer_view(buffer[:, :3], (2, 3))
@@ -0,0 +1,407 @@
+from numpy import (
+    arange,
+    clip,
+    count_nonzero,
+    empty,
+    eye,
+    float16,
+    float32,
+    float64,
+    full,
+    frombuffer,
+    int32,
+    stack,
+    uint8,
+    uint16,
+    where,
+)
+from numpy.random import default_rng
+from numpy.testing import assert_allclose, assert_array_equal
+from pytest import mark, raises
+
+from src.modules.color import (
+    H273,
+    H273Config,
+    TRANSFER_CHARACTERISTICS_BT709,
+    TRANSFER_CHARACTERISTICS_PQ,
+    TRANSFER_CHARACTERISTICS_SRGB,
+    get_dtype_deviation,
+)
+from src.modules.data import SAMPLE_PACKING_MSB, pack_samples, unpack_samples
+from src.modules.sample import BT2100, get_subsampling_factors
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize("is_chroma", [False, True])
+@mark.parametrize("bit_depths", [(8, 10), (10, 8), (10, 12), (12, 10), (16, 9)])
+def test_requantized_plane_is_the_same_as_the_float_path(
+    full_range, is_chroma, bit_depths
+):
+    bit_depth, new_bit_depth = bit_depths
+    color = H273(full_range=full_range, dtype=float64)
+    values = arange(1 << bit_depth).astype(uint8 if bit_depth == 8 else uint16)
+
+    requantized_values = color.requantize_ycbcr_plane(
+        values, bit_depth, new_bit_depth, is_chroma=is_chroma
+    )
+    expected_values = color.quantize_ycbcr(
+        color.dequantize_ycbcr(stack([values] * 3, axis=-1), *[bit_depth] * 3),
+        *[new_bit_depth] * 3,
+    )[:, 1 if is_chroma else 0]
+
+    # The float path follows its rounding errors at the exact ties,
+    # which only exist when the limited range values are shifted right
+    shift = bit_depth - new_bit_depth
+    exact = full(values.shape, True)
+    if not full_range and shift > 0:
+        clipped_values = clip(
+            values,
+            16 << (bit_depth - 8),
+            (240 if is_chroma else 235) << (bit_depth - 8),
+        )
+        exact = clipped_values % (1 << shift) != 1 << (shift - 1)
+    assert requantized_values.dtype == expected_values.dtype
+    assert_array_equal(requantized_values[exact], expected_values[exact])
+    assert_array_equal(requantized_values[~exact] % 2, 0)
+
+
+def test_msb_plane_is_requantized_in_place():
+    color = H273()
+    values = default_rng(0).integers(0, 1 << 10, (6, 8)).astype(uint16)
+    data = pack_samples(values, 10, SAMPLE_PACKING_MSB())
+    words = frombuffer(data, dtype=uint16).reshape(values.shape)
+
+    unpack_samples(data, values.shape, 10, SAMPLE_PACKING_MSB(), out=words)
+    assert color.requantize_ycbcr_plane(words, 10, 12, out=words) is words
+    pack_samples(words, 12, SAMPLE_PACKING_MSB(), out=data)
+
+    assert_array_equal(
+        unpack_samples(data, values.shape, 12, SAMPLE_PACKING_MSB()),
+        color.requantize_ycbcr_plane(values, 10, 12),
+    )
+
+
+def test_requantize_rejects_invalid_arguments():
+    color = H273()
+
+    with raises(ValueError):
+        color.requantize_ycbcr_plane([0.0, 1.0], 10, 8)
+    with raises(ValueError):
+        color.requantize_ycbcr_plane([0, 1], 10, 17)
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize("full_range_rgb", [False, True])
+@mark.parametrize("dtype, bit_depth", [(uint8, 8), (uint16, 10), (float32, 8)])
+def test_luma_is_the_same_as_the_luma_of_ycbcr(
+    full_range, full_range_rgb, dtype, bit_depth
+):
+    color = H273(full_range=full_range, dtype=float64)
+    # The values beyond the bounds are clipped, across more than one stripe
+    values = default_rng(0).integers(-8, (1 << bit_depth) + 8, (300, 301, 3))
+    values = values.clip(0, None).astype(dtype)
+
+    luma = color.luma_from_rgb(
+        values, 0.2126, 0.0722, bit_depth, 10, full_range_rgb=full_range_rgb
+    )
+    ycbcr = color.ycbcr_from_rgb(
+        values, 0.2126, 0.0722, bit_depth, 10, 10, 10, full_range_rgb=full_range_rgb
+    )
+
+    assert luma.dtype == ycbcr.dtype
+    assert_array_equal(luma, ycbcr[..., 0])
+
+
+def _ycbcr_from_rgb_step_by_step(values, bit_depth_rgb, bit_depth, dtype, **kwargs):
+    rgb_color = H273(full_range=kwargs["full_range_rgb"], dtype=dtype)
+    color = H273(full_range=kwargs["full_range"], dtype=dtype)
+    return color.quantize_ycbcr(
+        color.ypbpr_from_rgb(
+            rgb_color.dequantize_rgb(values, bit_depth_rgb), 0.2126, 0.0722
+        ),
+        *[bit_depth] * 3,
+    )
+
+
+def _rgb_from_ycbcr_step_by_step(values, bit_depth, bit_depth_rgb, dtype, **kwargs):
+    rgb_color = H273(full_range=kwargs["full_range_rgb"], dtype=dtype)
+    color = H273(full_range=kwargs["full_range"], dtype=dtype)
+    return rgb_color.quantize_rgb(
+        color.rgb_from_ypbpr(
+            color.dequantize_ycbcr(values, *[bit_depth] * 3), 0.2126, 0.0722
+        ),
+        bit_depth_rgb,
+    )
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize("full_range_rgb", [False, True])
+@mark.parametrize("dtype", [float32, float64])
+@mark.parametrize("bit_depths", [(8, 8), (10, 10), (8, 10), (12, 8)])
+def test_affine_conversions_are_the_same_as_the_step_by_step_path(
+    full_range, full_range_rgb, dtype, bit_depths
+):
+    bit_depth_rgb, bit_depth = bit_depths
+    ranges = dict(full_range=full_range, full_range_rgb=full_range_rgb)
+    color = H273(full_range=full_range, dtype=dtype)
+    values = default_rng(0).integers(0, 1 << bit_depth_rgb, (64, 64, 3))
+    values = values.astype(uint16)
+
+    ycbcr = color.ycbcr_from_rgb(
+        values,
+        0.2126,
+        0.0722,
+        bit_depth_rgb,
+        *[bit_depth] * 3,
+        full_range_rgb=full_range_rgb,
+    )
+    expected_ycbcr = _ycbcr_from_rgb_step_by_step(
+        values, bit_depth_rgb, bit_depth, dtype, **ranges
+    )
+    rgb = color.rgb_from_ycbcr(
+        expected_ycbcr,
+        0.2126,
+        0.0722,
+        *[bit_depth] * 3,
+        bit_depth_rgb,
+        full_range_rgb=full_range_rgb,
+    )
+    expected_rgb = _rgb_from_ycbcr_step_by_step(
+        expected_ycbcr, bit_depth, bit_depth_rgb, dtype, **ranges
+    )
+
+    # The fused matrices only move the rounding of the rare near ties
+    for values, expected_values in ((ycbcr, expected_ycbcr), (rgb, expected_rgb)):
+        assert values.dtype == expected_values.dtype
+        differences = abs(values.astype(int32) - expected_values)
+        assert differences.max() <= 1
+        assert count_nonzero(differences) <= differences.size // 100
+
+
+@mark.parametrize("full_range", [False, True])
+def test_transformation_matrices_are_affine_maps_of_the_codes(full_range):
+    color = H273(full_range=full_range, dtype=float64)
+    values = default_rng(0).integers(0, 1 << 10, (256, 3))
+
+    matrix = color.get_ycbcr_transformation_matrix(0.2126, 0.0722, 10, 8, 8, 8)
+    expected_values = color.ypbpr_from_rgb(
+        H273(full_range=True).dequantize_rgb(values, 10), 0.2126, 0.0722
+    )
+    expected_values = color.quantize_ycbcr(expected_values, 8, 8, 8)
+    codes = (values @ matrix[:, :3].T.astype(float64) + matrix[:, 3]).round()
+    codes = codes.clip(0, 255)
+
+    assert matrix.shape == (3, 4)
+    assert not matrix.flags.writeable
+    assert abs(codes - expected_values).max() <= 1
+
+    inverse_matrix = color.get_rgb_transformation_matrix(0.2126, 0.0722, 8, 8, 8, 10)
+    assert_allclose(
+        inverse_matrix[:, :3].astype(float64) @ matrix[:, :3], eye(3), atol=1e-5
+    )
+
+
+def _get_ycbcr_planes(shape, scheme, bit_depth, seed=0):
+    generator = default_rng(seed)
+    dv, dh = get_subsampling_factors(scheme)
+    chroma_shape = shape[:-2] + (shape[-2] // dv, shape[-1] // dh)
+    return (
+        generator.integers(0, 1 << bit_depth, shape).astype(uint16),
+        generator.integers(0, 1 << bit_depth, chroma_shape).astype(uint16),
+        generator.integers(0, 1 << bit_depth, chroma_shape).astype(uint16),
+    )
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize("scheme", [(4, 2, 0), (4, 2, 2), (4, 4, 4)])
+def test_rgb_from_planes_is_the_same_as_upsampling_first(full_range, scheme):
+    color = H273(full_range=full_range, dtype=float64)
+    y, cb, cr = _get_ycbcr_planes((36, 40), scheme, 10)
+
+    rgb = color.rgb_from_ycbcr_planes((y, cb, cr), scheme, 0.2126, 0.0722, 10, 10, 10)
+    sample = BT2100()
+    ycbcr = stack(
+        [y, sample.upsample(scheme, y, cb), sample.upsample(scheme, y, cr)], axis=-1
+    )
+    expected_rgb = color.rgb_from_ycbcr(ycbcr, 0.2126, 0.0722, 10, 10, 10, 8)
+
+    assert rgb.shape == expected_rgb.shape
+    assert rgb.dtype == expected_rgb.dtype
+    assert abs(rgb.astype(int32) - expected_rgb).max() <= 1
+
+
+@mark.parametrize("scheme", [(4, 2, 0), (4, 2, 2)])
+def test_rgb_from_planes_does_not_depend_on_stripes_or_stacks(scheme):
+    color = H273()
+    planes = _get_ycbcr_planes((3, 36, 40), scheme, 8)
+    expected_rgb = stack(
+        [
+            color.rgb_from_ycbcr_planes(
+                [plane[index] for plane in planes], scheme, 0.2126, 0.0722
+            )
+            for index in range(3)
+        ]
+    )
+
+    for stripe_height in (None, 4, 6, 36):
+        out = full(expected_rgb.shape, 0, dtype=uint8)
+        rgb = color.rgb_from_ycbcr_planes(
+            planes, scheme, 0.2126, 0.0722, stripe_height=stripe_height, out=out
+        )
+        assert rgb is out
+        assert_array_equal(rgb, expected_rgb)
+
+        # A non-contiguous output is filled frame by frame
+        out = full(expected_rgb.shape[:-1] + (4,), 0, dtype=uint8)[..., :3]
+        rgb = color.rgb_from_ycbcr_planes(
+            planes, scheme, 0.2126, 0.0722, stripe_height=stripe_height, out=out
+        )
+        assert_array_equal(rgb, expected_rgb)
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize("scheme", [(4, 2, 0), (4, 2, 2), (4, 4, 4)])
+def test_planes_from_rgb_are_the_same_as_subsampling_afterwards(full_range, scheme):
+    color = H273(full_range=full_range, dtype=float64)
+    values = default_rng(0).integers(0, 256, (2, 36, 40, 3)).astype(uint8)
+    ycbcr = color.ycbcr_from_rgb(values, 0.2126, 0.0722, 8, 10, 10, 10)
+    sample = BT2100()
+    expected_planes = (
+        ycbcr[..., 0],
+        sample.subsample(scheme, ycbcr[..., 0], ycbcr[..., 1], axes=(1, 2)),
+        sample.subsample(scheme, ycbcr[..., 0], ycbcr[..., 2], axes=(1, 2)),
+    )
+
+    for stripe_height in (None, 4, 12, 36):
+        planes = color.ycbcr_planes_from_rgb(
+            values, scheme, 0.2126, 0.0722, 8, 10, 10, 10, stripe_height=stripe_height
+        )
+        for plane, expected_plane in zip(planes, expected_planes):
+            assert plane.dtype == expected_plane.dtype
+            assert_array_equal(plane, expected_plane)
+
+
+def _oetf(values, transfer):
+    if transfer == TRANSFER_CHARACTERISTICS_PQ():
+        values = values**0.1593017578125
+        return ((0.8359375 + 18.8515625 * values) / (1 + 18.6875 * values)) ** 78.84375
+    if transfer == TRANSFER_CHARACTERISTICS_SRGB():
+        alpha, beta, gamma, slope = 1.055, 0.0031308, 1 / 2.4, 12.92
+    else:
+        alpha, beta, gamma, slope = 1.099296826809442, 0.018053968510807, 0.45, 4.5
+    return where(values >= beta, alpha * values**gamma - (alpha - 1), slope * values)
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize(
+    "transfer",
+    [
+        TRANSFER_CHARACTERISTICS_BT709(),
+        TRANSFER_CHARACTERISTICS_SRGB(),
+        TRANSFER_CHARACTERISTICS_PQ(),
+    ],
+)
+@mark.parametrize("dtype, bit_depth", [(uint8, None), (uint16, 10), (uint16, 12)])
+def test_transfer_tables_are_the_same_as_the_formulas(
+    full_range, transfer, dtype, bit_depth
+):
+    color = H273(full_range=full_range, dtype=float64)
+    shift = (bit_depth or 8) - 8
+    if full_range:
+        codes = arange(1 << (shift + 8))
+    else:
+        codes = arange(16 << shift, (235 << shift) + 1)
+    codes = codes.astype(dtype)
+
+    values = color.dequantize_rgb(stack([codes] * 3, axis=-1), bit_depth or 8)[:, 0]
+    nonlinear_values = color.nonlinear_from_linear(codes, transfer, bit_depth)
+    linear_values = color.linear_from_nonlinear(codes, transfer, bit_depth)
+
+    assert nonlinear_values.dtype == linear_values.dtype == float64
+    assert_allclose(nonlinear_values, _oetf(values, transfer), rtol=1e-6, atol=1e-7)
+    assert_allclose(_oetf(linear_values, transfer), values, rtol=1e-5, atol=1e-6)
+
+
+@mark.parametrize(
+    "transfer",
+    [
+        TRANSFER_CHARACTERISTICS_BT709(),
+        TRANSFER_CHARACTERISTICS_SRGB(),
+        TRANSFER_CHARACTERISTICS_PQ(),
+    ],
+)
+def test_transfer_functions_of_floats_are_inverse(transfer):
+    color = H273(dtype=float64)
+    values = default_rng(0).random((64, 3))
+
+    nonlinear_values = color.nonlinear_from_linear(values, transfer)
+
+    assert_allclose(nonlinear_values, _oetf(values, transfer))
+    assert_allclose(color.linear_from_nonlinear(nonlinear_values, transfer), values)
+
+
+def test_transfer_functions_reject_invalid_arguments():
+    color = H273()
+
+    with raises(ValueError):
+        color.nonlinear_from_linear(arange(4, dtype=uint16), 1)
+    with raises(ValueError):
+        color.linear_from_nonlinear(arange(4, dtype=uint8), 2, 8)
+
+
+@mark.parametrize("full_range", [False, True])
+@mark.parametrize("bit_depth", [8, 10, 11])
+def test_reduced_precision_rounds_within_one_code(full_range, bit_depth):
+    values = default_rng(0).integers(0, 1 << bit_depth, (64, 64, 3))
+    values = values.astype(uint16)
+
+    def round_trip(dtype):
+        color = H273(full_range=full_range, dtype=dtype)
+        return color.quantize_rgb(color.dequantize_rgb(values, bit_depth), bit_depth)
+
+    def convert(dtype):
+        color = H273(full_range=full_range, dtype=dtype)
+        return color.ycbcr_from_rgb(values, 0.2126, 0.0722, bit_depth, *[bit_depth] * 3)
+
+    assert H273(dtype=float16).dequantize_rgb(values, bit_depth).dtype == float16
+    assert get_dtype_deviation(round_trip, float16, float64)[0] == (
+        0 if full_range else 1
+    )
+    assert get_dtype_deviation(convert, float16, float64)[0] <= 1
+    assert get_dtype_deviation(convert, float32, float64)[0] <= 1
+
+
+def test_reduced_precision_rejects_high_bit_depths():
+    color = H273(dtype=float16)
+    values = arange(12, dtype=uint16).reshape(4, 3)
+
+    with raises(ValueError):
+        color.dequantize_rgb(values, 12)
+    with raises(ValueError):
+        color.ycbcr_from_rgb(values, 0.2126, 0.0722, 8, 12, 12, 12)
+    with raises(ValueError):
+        H273Config(0.2126, 0.0722, bit_depth_y=12, dtype=float16)
+
+
+def test_outputs_are_stored_in_the_given_buffers():
+    color = H273()
+    values = default_rng(0).integers(0, 256, (16, 16, 3)).astype(uint8)
+    rgb_values = color.dequantize_rgb(values)
+    ycbcr = color.ycbcr_from_rgb(values, 0.2126, 0.0722)
+
+    out = empty(values.shape, dtype=float32)
+    assert color.dequantize_rgb(values, out=out) is out
+    assert_array_equal(out, rgb_values)
+
+    out = empty(values.shape, dtype=uint8)
+    workspace = empty(values.shape, dtype=float32)
+    assert color.quantize_rgb(rgb_values, out=out, workspace=workspace) is out
+    assert_array_equal(out, color.quantize_rgb(rgb_values))
+
+    out = empty(values.shape, dtype=uint8)
+    workspace = empty((2,) + values.shape, dtype=float32)
+    assert (
+        color.ycbcr_from_rgb(values, 0.2126, 0.0722, out=out, workspace=workspace)
+        is out
+    )
+    assert_array_equal(out, ycbcr)
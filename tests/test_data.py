@@ -0,0 +1,462 @@
+import os
+from io import BytesIO
+from threading import Event
+from numpy import arange, array, frombuffer, int32, int64, uint8, uint16
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from pytest import mark, raises
+
+from src.modules.data import (
+    INTERLEAVED_LAYOUT_NV12,
+    INTERLEAVED_LAYOUT_NV21,
+    INTERLEAVED_LAYOUT_UYVY,
+    INTERLEAVED_LAYOUT_YUYV,
+    SAMPLE_PACKING_MSB,
+    SAMPLE_PACKING_TIGHT,
+    YCbCrFrame,
+    YCbCrFrameReader,
+    YCbCrFrameWriter,
+    YCbCrSequence,
+    Y4MHeader,
+    Y4MReader,
+    Y4MWriter,
+    get_interleaved_size,
+    get_packed_size,
+    interleaved_from_ycbcr_planes,
+    load_interleaved_ycbcr_image,
+    load_packed_ycbcr_image,
+    pack_samples,
+    save_interleaved_ycbcr_image,
+    save_packed_ycbcr_image,
+    save_ycbcr_image,
+    unpack_samples,
+    ycbcr_planes_from_interleaved,
+)
+
+
+def get_planes(index, dtype=uint8):
+    return (
+        (arange(6 * 8).reshape(6, 8) + index).astype(dtype),
+        (arange(3 * 4).reshape(3, 4) + index * 2).astype(dtype),
+        (arange(3 * 4).reshape(3, 4) + index * 3).astype(dtype),
+    )
+
+
+def get_expected_bytes(frames):
+    device = BytesIO()
+    for planes in frames:
+        save_ycbcr_image(device, planes)
+    return device.getvalue()
+
+
+class BlockingWritev:
+    """
+    A replacement of `os.writev` which writes at most `max_count` bytes per call,
+    and blocks the first call until `released` is set
+    """
+
+    def __init__(self, max_count):
+        self.max_count = max_count
+        self.calls = []
+        self.started = Event()
+        self.released = Event()
+
+    def __call__(self, descriptor, buffers):
+        buffers = [bytes(buffer) for buffer in buffers]
+        self.calls.append([len(buffer) for buffer in buffers])
+        self.started.set()
+        self.released.wait(10)
+        return os.write(descriptor, b"".join(buffers)[: self.max_count])
+
+
+class FailingDevice(BytesIO):
+    def write(self, data):
+        if len(self.getvalue()) >= 48 + 12 + 12:
+            raise OSError("device full")
+        return super().write(data)
+
+
+def test_queued_frames_are_gathered_into_one_writev(tmp_path, monkeypatch):
+    writev = BlockingWritev(1 << 20)
+    monkeypatch.setattr(os, "writev", writev)
+    frames = [get_planes(index) for index in range(5)]
+
+    with open(tmp_path / "frames.yuv", "wb") as device:
+        with YCbCrFrameWriter(device, queue_size=8, batch_size=2) as writer:
+            writer.write(frames[0])
+            # The next frames are queued while the first one is being written
+            assert writev.started.wait(10)
+            for planes in frames[1:]:
+                writer.write(planes)
+            writev.released.set()
+
+    assert writev.calls == [[48, 12, 12], [48, 12, 12] * 2, [48, 12, 12] * 2]
+    assert (tmp_path / "frames.yuv").read_bytes() == get_expected_bytes(frames)
+
+
+def test_partial_writes_of_writev_are_resumed(tmp_path, monkeypatch):
+    writev = BlockingWritev(7)
+    writev.released.set()
+    monkeypatch.setattr(os, "writev", writev)
+    frames = [get_planes(index, uint16) for index in range(3)]
+
+    with open(tmp_path / "frames.yuv", "wb") as device:
+        with YCbCrFrameWriter(device) as writer:
+            for planes in frames:
+                writer.write(planes)
+            writer.flush()
+            # A partially written buffer is continued from the written bytes
+            assert all(sum(counts) > 7 for counts in writev.calls[:-1])
+
+    assert (tmp_path / "frames.yuv").read_bytes() == get_expected_bytes(frames)
+
+
+def test_frames_are_written_without_a_file_descriptor():
+    device = BytesIO()
+    frames = [get_planes(index) for index in range(4)]
+
+    with YCbCrFrameWriter(device, batch_size=3) as writer:
+        for planes in frames:
+            # The non-contiguous planes are copied
+            writer.write(tuple(plane[:, ::-1][:, ::-1] for plane in planes))
+
+    assert device.getvalue() == get_expected_bytes(frames)
+
+
+def test_error_is_raised_and_later_frames_are_dropped():
+    device = FailingDevice()
+    writer = YCbCrFrameWriter(device, batch_size=1)
+    writer.write(get_planes(0))
+
+    with raises(OSError, match="device full"):
+        writer.write(get_planes(1))
+        writer.flush()
+    writer.write(get_planes(2))
+    writer.close()
+
+    assert device.getvalue() == get_expected_bytes([get_planes(0)])
+
+    with raises(ValueError, match="closed"):
+        writer.write(get_planes(3))
+
+
+@mark.parametrize("packing", [SAMPLE_PACKING_TIGHT(), SAMPLE_PACKING_MSB()])
+@mark.parametrize("bit_depth", [8, 10, 12, 14, 16])
+@mark.parametrize("dtype", [uint16, int32, int64])
+def test_packed_samples_round_trip(packing, bit_depth, dtype):
+    values = default_rng(bit_depth).integers(0, 1 << bit_depth, (5, 37))
+    data = pack_samples(values.astype(dtype), bit_depth, packing)
+
+    assert data.shape == (get_packed_size(values.size, bit_depth, packing),)
+    assert_array_equal(unpack_samples(data, values.shape, bit_depth, packing), values)
+
+
+def test_packed_samples_have_the_documented_layouts():
+    values = [0x3FF, 0x001, 0x200, 0x0F0, 0x3FF]
+
+    assert pack_samples(values, 10, SAMPLE_PACKING_MSB()).tobytes() == bytes.fromhex(
+        "c0ff 4000 0080 003c c0ff"
+    )
+    # Four 10-bit samples per five bytes, the last group padded with zeros
+    assert pack_samples(values, 10).tobytes() == bytes.fromhex(
+        "ff 07 00 20 3c ff 03 00 00 00"
+    )
+    assert pack_samples([0xABC, 0x123], 12).tobytes() == bytes.fromhex("bc 3a 12")
+
+
+@mark.parametrize("packing", [SAMPLE_PACKING_TIGHT(), SAMPLE_PACKING_MSB()])
+def test_pack_samples_rejects_out_of_range_values(packing):
+    with raises(ValueError):
+        pack_samples(arange(1025), 10, packing)
+    with raises(ValueError):
+        pack_samples([-1, 0, 1, 2], 10, packing)
+    with raises(ValueError):
+        pack_samples([0.0, 1.0, 2.0, 3.0], 10, packing)
+
+
+def test_msb_samples_are_unpacked_in_place():
+    values = default_rng(0).integers(0, 1 << 10, (4, 6)).astype(uint16)
+    data = pack_samples(values, 10, SAMPLE_PACKING_MSB())
+    words = frombuffer(data, dtype=uint16).reshape(values.shape)
+
+    assert unpack_samples(data, values.shape, 10, "msb", out=words) is words
+    assert_array_equal(words, values)
+
+
+@mark.parametrize("packing", [SAMPLE_PACKING_TIGHT(), SAMPLE_PACKING_MSB()])
+def test_packed_image_round_trip(packing):
+    random = default_rng(1)
+    planes = (
+        random.integers(0, 1 << 10, (6, 10)),
+        random.integers(0, 1 << 12, (3, 5)),
+        random.integers(0, 1 << 12, (3, 5)),
+    )
+    device = BytesIO()
+    save_packed_ycbcr_image(device, planes, 10, 12, 12, packing=packing)
+    device.seek(0)
+    loaded_planes = load_packed_ycbcr_image(
+        device, (10, 6), (4, 2, 0), 10, 12, 12, packing=packing
+    )
+
+    for loaded_plane, plane in zip(loaded_planes, planes):
+        assert_array_equal(loaded_plane, plane)
+
+
+def test_sequence_frames_are_the_same_as_the_loaded_ones(tmp_path):
+    frames = [get_planes(index, uint16) for index in range(5)]
+    path = tmp_path / "sequence.yuv"
+    path.write_bytes(get_expected_bytes(frames) + b"\0" * 7)
+
+    with YCbCrSequence(path, (8, 6), (4, 2, 0), 10, 10, 10) as sequence:
+        assert len(sequence) == 5
+        assert sequence.frame_size == (48 + 12 + 12) * 2
+        for index in (4, 0, 2):
+            for plane, expected_plane in zip(sequence[index], frames[index]):
+                assert plane.dtype == uint16
+                assert not plane.flags.writeable
+                assert_array_equal(plane, expected_plane)
+        for planes, expected_planes in zip(sequence[1::2], zip(*frames[1::2])):
+            assert_array_equal(planes, expected_planes)
+        assert len(list(sequence)) == 5
+
+
+def test_sequence_frames_are_written_in_any_order(tmp_path):
+    frames = [get_planes(index) for index in range(3)]
+    path = tmp_path / "sequence.yuv"
+
+    with YCbCrSequence(path, (8, 6), (4, 2, 0), count=3) as sequence:
+        for index in (2, 0, 1):
+            for plane, new_plane in zip(sequence[index], frames[index]):
+                plane[...] = new_plane
+        sequence.flush()
+
+    assert path.read_bytes() == get_expected_bytes(frames)
+    with YCbCrSequence(path, (8, 6), (4, 2, 0), writable=True) as sequence:
+        sequence[1][0][...] = 0
+    assert path.read_bytes()[72 : 72 + 48] == bytes(48)
+
+
+def test_empty_sequence_has_no_frames(tmp_path):
+    path = tmp_path / "sequence.yuv"
+    path.write_bytes(b"\0" * 7)
+
+    with YCbCrSequence(path, (8, 6), (4, 2, 0)) as sequence:
+        assert len(sequence) == 0
+        assert sequence[:][0].shape == (0, 6, 8)
+    with raises(ValueError):
+        YCbCrSequence(path, (8, 6), (4, 2, 0), count=-1)
+
+
+@mark.parametrize("double_buffered", [False, True])
+def test_read_frames_are_the_same_as_the_loaded_ones(double_buffered):
+    frames = [get_planes(index, uint16) for index in range(4)]
+    device = BytesIO(get_expected_bytes(frames))
+
+    with YCbCrFrameReader(
+        device, (8, 6), (4, 2, 0), 10, 10, 10, double_buffered=double_buffered
+    ) as reader:
+        count = 0
+        for planes, expected_planes in zip(reader, frames):
+            for plane, expected_plane in zip(planes, expected_planes):
+                assert plane.dtype == uint16
+                assert_array_equal(plane, expected_plane)
+            count += 1
+        assert count == 4
+        assert reader.read() is None
+        assert reader.frame_size == (48 + 12 + 12) * 2
+
+
+def test_reader_reuses_its_buffers():
+    frames = [get_planes(index) for index in range(4)]
+    device = BytesIO(get_expected_bytes(frames))
+
+    with YCbCrFrameReader(device, (8, 6), (4, 2, 0), double_buffered=True) as reader:
+        planes = [reader.read()[0] for _ in range(4)]
+
+    assert planes[0] is planes[2] and planes[1] is planes[3]
+    assert planes[0] is not planes[1]
+    # The planes of a buffer are overwritten by the later frames
+    assert_array_equal(planes[0], frames[2][0])
+    with raises(ValueError):
+        YCbCrFrameReader(BytesIO(), (0, 6), (4, 2, 0))
+    with raises(ValueError):
+        YCbCrFrameReader(BytesIO(b"\0" * 7), (8, 6), (4, 2, 0)).read()
+
+
+@mark.parametrize("prefetch", [0, 2])
+@mark.parametrize("bit_depth, dtype", [(8, uint8), (10, uint16)])
+def test_y4m_frames_round_trip(prefetch, bit_depth, dtype):
+    frames = [get_planes(index, dtype) for index in range(5)]
+    header = Y4MHeader((8, 6), (4, 2, 0), bit_depth, frame_rate=(30000, 1001))
+    device = BytesIO()
+
+    writer = Y4MWriter(device, header)
+    for planes in frames:
+        writer.write(planes)
+
+    # The frames are the planar frames behind their frame headers
+    data = device.getvalue()
+    frame_bytes = [b"FRAME\n" + get_expected_bytes([planes]) for planes in frames]
+    assert data == header.to_bytes() + b"".join(frame_bytes)
+
+    device.seek(0)
+    with Y4MReader(device, prefetch=prefetch) as reader:
+        assert reader.header == header
+        read_frames = list(reader)
+        assert list(reader) == []
+
+    assert len(read_frames) == 5
+    for planes, expected_planes in zip(read_frames, frames):
+        for plane, expected_plane in zip(planes, expected_planes):
+            assert plane.dtype.itemsize == dtype().itemsize
+            assert_array_equal(plane, expected_plane)
+
+
+def test_y4m_header_round_trip():
+    data = b"YUV4MPEG2 W176 H144 F30:1 Ip A1:1 C422p10 XCOLORRANGE=FULL\n"
+
+    header = Y4MHeader.from_bytes(data)
+
+    assert header.size == (176, 144)
+    assert header.subsampling_scheme == (4, 2, 2)
+    assert header.bit_depth == 10
+    assert header.parameters == ("XCOLORRANGE=FULL",)
+    assert header.to_bytes() == data
+    assert Y4MHeader.from_bytes(b"YUV4MPEG2 W8 H6 C420mpeg2").colorspace == "420jpeg"
+    with raises(ValueError):
+        Y4MHeader.from_bytes(b"YUV4MPEG2 W8 H6 C411")
+    with raises(ValueError):
+        Y4MHeader.from_bytes(b"YUV4MPEG2 W8")
+
+
+@mark.parametrize("prefetch", [0, 2])
+def test_y4m_reader_raises_the_error_of_a_truncated_stream(prefetch):
+    header = Y4MHeader((8, 6))
+    device = BytesIO()
+    Y4MWriter(device, header).write(get_planes(0))
+    device = BytesIO(device.getvalue() + b"FRAME\n" + b"\0" * 7)
+
+    with Y4MReader(device, prefetch=prefetch) as reader:
+        frames = []
+        with raises(ValueError):
+            for planes in reader:
+                frames.append(planes)
+        assert len(frames) == 1
+        if prefetch:
+            with raises(ValueError):
+                list(reader)
+
+
+@mark.parametrize(
+    "layout, expected_data",
+    [
+        (INTERLEAVED_LAYOUT_NV12(), "00 01 02 03  04 05 06 07  10 20 11 21"),
+        (INTERLEAVED_LAYOUT_NV21(), "00 01 02 03  04 05 06 07  20 10 21 11"),
+        (INTERLEAVED_LAYOUT_YUYV(), "00 10 01 20 02 11 03 21  04 10 05 20 06 11 07 21"),
+        (INTERLEAVED_LAYOUT_UYVY(), "10 00 20 01 11 02 21 03  10 04 20 05 11 06 21 07"),
+    ],
+)
+def test_interleaved_samples_have_the_documented_layouts(layout, expected_data):
+    plane_y = arange(8, dtype=uint8).reshape(2, 4)
+    # The 4:2:0 layouts have one row of chroma, and the 4:2:2 layouts have two
+    rows = 1 if layout in (INTERLEAVED_LAYOUT_NV12(), INTERLEAVED_LAYOUT_NV21()) else 2
+    plane_cb = array([[0x10, 0x11]] * rows, dtype=uint8)
+    plane_cr = array([[0x20, 0x21]] * rows, dtype=uint8)
+
+    data = interleaved_from_ycbcr_planes((plane_y, plane_cb, plane_cr), layout)
+
+    assert data.tobytes() == bytes.fromhex(expected_data)
+    assert get_interleaved_size((4, 2), layout) == len(data)
+
+
+@mark.parametrize(
+    "layout",
+    [
+        INTERLEAVED_LAYOUT_NV12(),
+        INTERLEAVED_LAYOUT_NV21(),
+        INTERLEAVED_LAYOUT_YUYV(),
+        INTERLEAVED_LAYOUT_UYVY(),
+    ],
+)
+@mark.parametrize("bit_depth, dtype", [(8, uint8), (10, uint16)])
+def test_interleaved_image_round_trip(layout, bit_depth, dtype):
+    generator = default_rng(0)
+    if layout in (INTERLEAVED_LAYOUT_NV12(), INTERLEAVED_LAYOUT_NV21()):
+        size, chroma_shape = (7, 5), (3, 4)
+    else:
+        size, chroma_shape = (8, 5), (5, 4)
+    planes = (
+        generator.integers(0, 1 << bit_depth, size[::-1]).astype(dtype),
+        generator.integers(0, 1 << bit_depth, chroma_shape).astype(dtype),
+        generator.integers(0, 1 << bit_depth, chroma_shape).astype(dtype),
+    )
+    device = BytesIO()
+
+    save_interleaved_ycbcr_image(device, planes, layout, bit_depth)
+    assert len(device.getvalue()) == get_interleaved_size(size, layout, bit_depth)
+    device.seek(0)
+    loaded_planes = load_interleaved_ycbcr_image(device, size, layout, bit_depth)
+
+    for plane, expected_plane in zip(loaded_planes, planes):
+        assert plane.dtype.itemsize == dtype().itemsize
+        assert_array_equal(plane, expected_plane)
+
+
+def test_interleaved_planes_are_views_of_the_buffer():
+    buffer = bytearray(get_interleaved_size((4, 2), INTERLEAVED_LAYOUT_YUYV()))
+
+    plane_y, plane_cb, plane_cr = ycbcr_planes_from_interleaved(
+        buffer, (4, 2), INTERLEAVED_LAYOUT_YUYV()
+    )
+    plane_y[...] = 1
+    plane_cb[...] = 2
+    plane_cr[...] = 3
+
+    assert bytes(buffer) == bytes([1, 2, 1, 3] * 4)
+    assert not ycbcr_planes_from_interleaved(
+        bytes(buffer), (4, 2), INTERLEAVED_LAYOUT_YUYV()
+    )[0].flags.writeable
+    with raises(ValueError):
+        get_interleaved_size((3, 2), INTERLEAVED_LAYOUT_UYVY())
+    with raises(ValueError):
+        get_interleaved_size((4, 2), "I420")
+
+
+def test_frame_buffer_is_the_same_as_the_saved_planes():
+    planes = get_planes(1, uint16)
+
+    frame = YCbCrFrame.from_planes(planes, (4, 2, 0), 10, 10, 10)
+
+    assert frame.size == (8, 6)
+    assert frame.subsampling_scheme == (4, 2, 0)
+    assert frame.bit_depths == (10, 10, 10)
+    assert len(frame) == 3
+    assert bytes(frame.buffer) == get_expected_bytes([planes])
+    for plane, expected_plane in zip(frame, planes):
+        assert plane.dtype == uint16
+        assert plane.flags.c_contiguous
+        assert_array_equal(plane, expected_plane)
+
+    device = BytesIO()
+    frame.save(device)
+    device.seek(0)
+    loaded_frame = YCbCrFrame.load(device, (8, 6), (4, 2, 0), 10, 10, 10)
+    assert bytes(loaded_frame.buffer) == bytes(frame.buffer)
+
+
+def test_frame_planes_are_views_of_the_buffer():
+    buffer = bytearray(48 + 12 + 12 + 5)
+
+    frame = YCbCrFrame((8, 6), (4, 2, 0), buffer=buffer)
+    frame[1][...] = 7
+    copied_frame = frame.copy()
+    frame.planes[2][...] = 9
+
+    assert bytes(buffer) == bytes(48) + bytes([7] * 12) + bytes([9] * 12) + bytes(5)
+    assert_array_equal(copied_frame[2], 0)
+    with raises(ValueError):
+        YCbCrFrame((8, 6), (4, 2, 0), buffer=bytearray(71))
+    with raises(ValueError):
+        YCbCrFrame.from_planes(planes=get_planes(0)[:2], subsampling_scheme=(4, 2, 0))
+    with raises(ValueError):
+        YCbCrFrame.load(BytesIO(bytes(71)), (8, 6), (4, 2, 0))
@@ -0,0 +1,78 @@
+from numpy import empty, float32, uint8, zeros
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from pytest import mark, raises
+
+from src.modules.color import H273
+from src.modules.palette import colors_from_keys, convert_unique_colors, get_color_keys
+
+
+def _convert(values):
+    return H273().ycbcr_from_rgb(values, 0.2126, 0.0722)
+
+
+def _convert_to_floats(values):
+    return H273().dequantize_rgb(values)
+
+
+def _get_screen_content(shape, colors, seed=0):
+    generator = default_rng(seed)
+    palette = generator.integers(0, 256, (colors, 3)).astype(uint8)
+    return palette[generator.integers(0, colors, shape)], palette
+
+
+@mark.parametrize("convert", [_convert, _convert_to_floats])
+@mark.parametrize("colors", [1, 16, 4096])
+def test_unique_colors_are_the_same_as_the_dense_conversion(convert, colors):
+    values, _ = _get_screen_content((2, 48, 64), colors)
+
+    converted_values = convert_unique_colors(convert, values, sample_size=256)
+
+    expected_values = convert(values.reshape(-1, 3)).reshape(values.shape)
+    assert converted_values.dtype == expected_values.dtype
+    assert_array_equal(converted_values, expected_values)
+
+
+def test_colors_missing_from_the_palette_are_converted():
+    values, palette = _get_screen_content((48, 64), 16)
+    values[::7, ::5] = [1, 2, 3]
+
+    out = empty(values.shape, dtype=uint8)
+    converted_values = convert_unique_colors(_convert, values, palette=palette, out=out)
+
+    assert converted_values is out
+    assert_array_equal(converted_values, _convert(values))
+    # The index table is reset for the next call
+    values = zeros((4, 4, 3), dtype=uint8)
+    assert_array_equal(
+        convert_unique_colors(_convert, values, palette=palette), _convert(values)
+    )
+
+
+def test_empty_frame_is_converted():
+    values = zeros((0, 4, 3), dtype=uint8)
+
+    converted_values = convert_unique_colors(_convert_to_floats, values)
+
+    assert converted_values.shape == (0, 4, 3)
+    assert converted_values.dtype == float32
+
+
+def test_color_keys_are_packed_losslessly():
+    values = default_rng(0).integers(0, 256, (8, 9, 3)).astype(uint8)
+
+    keys = get_color_keys(values)
+
+    assert keys.shape == (8, 9)
+    red, green, blue = values[0, 0].tolist()
+    assert keys[0, 0] == (red << 16) | (green << 8) | blue
+    assert_array_equal(colors_from_keys(keys), values)
+
+
+def test_unique_colors_reject_invalid_values():
+    with raises(ValueError):
+        convert_unique_colors(_convert, zeros((4, 4, 3), dtype=float32))
+    with raises(ValueError):
+        convert_unique_colors(_convert, zeros((4, 4, 4), dtype=uint8))
+    with raises(ValueError):
+        convert_unique_colors(_convert, zeros((4, 4, 3), dtype=uint8), sample_size=0)
@@ -0,0 +1,62 @@
+from numpy import empty, float32, float64, uint16
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from pytest import mark, raises
+
+from src.modules.color import H273Config
+from src.modules.parallel import H273Executor
+
+
+@mark.parametrize("band_height", [None, 1, 7, 100])
+@mark.parametrize("dtype", [float32, float64])
+def test_parallel_conversions_are_the_same_as_the_serial_ones(band_height, dtype):
+    config = H273Config(0.2126, 0.0722, bit_depth_rgb=10, bit_depth_y=10, dtype=dtype)
+    rgb_converter = config.get_rgb_converter()
+    ycbcr_converter = config.get_ycbcr_converter()
+    values = default_rng(0).integers(0, 1 << 10, (30, 17, 3)).astype(uint16)
+
+    with H273Executor(config, max_workers=4, band_height=band_height) as executor:
+        rgb = executor.dequantize_rgb(values)
+        ypbpr = executor.ypbpr_from_rgb(rgb)
+        ycbcr = executor.quantize_ycbcr(ypbpr)
+        steps = [
+            (rgb, rgb_converter.dequantize_rgb(values, 10)),
+            (ypbpr, ycbcr_converter.ypbpr_from_rgb(rgb, 0.2126, 0.0722)),
+            (ycbcr, ycbcr_converter.quantize_ycbcr(ypbpr, 10, 8, 8)),
+            (
+                executor.dequantize_ycbcr(ycbcr),
+                ycbcr_converter.dequantize_ycbcr(ycbcr, 10, 8, 8),
+            ),
+            (
+                executor.rgb_from_ypbpr(ypbpr),
+                ycbcr_converter.rgb_from_ypbpr(ypbpr, 0.2126, 0.0722),
+            ),
+            (executor.quantize_rgb(rgb), rgb_converter.quantize_rgb(rgb, 10)),
+        ]
+
+    for values, expected_values in steps:
+        assert values.dtype == expected_values.dtype
+        assert_array_equal(values, expected_values)
+
+
+def test_parallel_conversion_stores_the_values_in_the_output_array():
+    config = H273Config(0.2126, 0.0722)
+    values = default_rng(0).integers(0, 256, (16, 16, 3))
+    out = config.get_rgb_converter().dequantize_rgb(values)
+
+    with H273Executor(config, max_workers=2) as executor:
+        assert executor.dequantize_rgb(values, out=out) is out
+        assert_array_equal(out, config.get_rgb_converter().dequantize_rgb(values))
+        with raises(ValueError):
+            executor.dequantize_rgb(
+                values, out=empty((16, 16, 4), dtype=float32)[..., :3]
+            )
+
+
+def test_executor_rejects_invalid_arguments():
+    config = H273Config(0.2126, 0.0722)
+
+    with raises(ValueError):
+        H273Executor(config, max_workers=-1)
+    with raises(ValueError):
+        H273Executor(config, band_height=0)
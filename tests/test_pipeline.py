@@ -0,0 +1,121 @@
+from multiprocessing.shared_memory import SharedMemory
+from numpy import arange, full, int32, uint8
+from numpy.testing import assert_array_equal
+from pytest import raises
+
+from src.modules.pipeline import FramePipeline
+
+INPUT_LAYOUT = [((4, 6), uint8)]
+OUTPUT_LAYOUT = [((4, 6), int32), ((1,), int32)]
+
+
+def negate_frame(inputs, outputs):
+    (values,) = inputs
+    negated_values, total = outputs
+    negated_values[...] = -values.astype(int32)
+    total[0] = values.sum()
+
+
+def fail_on_frame(inputs, outputs):
+    (values,) = inputs
+    if values[0, 0] == 3:
+        raise ValueError("frame 3")
+    negate_frame(inputs, outputs)
+
+
+def get_frame(index):
+    return (full((4, 6), index, dtype=uint8),)
+
+
+def test_map_keeps_the_order_of_the_frames():
+    frames = [(arange(24, dtype=uint8).reshape(4, 6) + index,) for index in range(9)]
+
+    with FramePipeline(
+        negate_frame, INPUT_LAYOUT, OUTPUT_LAYOUT, max_workers=2, ring_size=3
+    ) as pipeline:
+        outputs = list(pipeline.map(frames))
+
+    assert len(outputs) == len(frames)
+    for (values,), (negated_values, total) in zip(frames, outputs):
+        assert_array_equal(negated_values, -values.astype(int32))
+        assert total[0] == values.sum()
+
+
+def test_map_reuses_the_slots_of_the_ring_buffers():
+    with FramePipeline(
+        negate_frame, INPUT_LAYOUT, OUTPUT_LAYOUT, max_workers=2, ring_size=2
+    ) as pipeline:
+        slot_addresses = set()
+        for index, (negated_values, total) in enumerate(
+            pipeline.map(map(get_frame, range(7)), copy=False)
+        ):
+            # The views are valid until the iterator is advanced
+            assert (negated_values == -index).all()
+            assert total[0] == index * 24
+            slot_addresses.add(negated_values.__array_interface__["data"][0])
+
+        # The same pipeline can map another sequence of frames
+        outputs = list(pipeline.map(map(get_frame, range(3))))
+
+    assert len(slot_addresses) == 2
+    assert [int(total[0]) for _, total in outputs] == [0, 24, 48]
+
+
+def test_close_after_stopping_early_releases_the_ring_buffers():
+    pulled = []
+
+    def frames():
+        for index in range(100):
+            pulled.append(index)
+            yield get_frame(index)
+
+    pipeline = FramePipeline(
+        negate_frame, INPUT_LAYOUT, OUTPUT_LAYOUT, max_workers=1, ring_size=2
+    )
+    names = (pipeline._input_memory.name, pipeline._output_memory.name)
+    outputs = pipeline.map(frames())
+
+    for index, (negated_values, _) in zip(range(3), outputs):
+        assert (negated_values == -index).all()
+    outputs.close()
+    pipeline.close()
+
+    # At most the frames in flight are pulled ahead of the consumer
+    assert len(pulled) <= 3 + 2
+    for name in names:
+        with raises(FileNotFoundError):
+            SharedMemory(name)
+
+
+def test_error_of_a_worker_is_raised_in_order():
+    with FramePipeline(
+        fail_on_frame, INPUT_LAYOUT, OUTPUT_LAYOUT, max_workers=2, ring_size=2
+    ) as pipeline:
+        totals = []
+        with raises(ValueError, match="frame 3"):
+            for _, total in pipeline.map(map(get_frame, range(8))):
+                totals.append(int(total[0]))
+
+        # The frames before the failed one are returned
+        assert totals == [0, 24, 48]
+
+        # The pipeline is still usable after the error
+        outputs = list(pipeline.map(map(get_frame, range(2))))
+        assert [int(total[0]) for _, total in outputs] == [0, 24]
+
+
+def test_map_rejects_a_frame_with_a_wrong_number_of_arrays():
+    with FramePipeline(
+        negate_frame, INPUT_LAYOUT, OUTPUT_LAYOUT, max_workers=1, ring_size=1
+    ) as pipeline:
+        with raises(ValueError):
+            list(pipeline.map([get_frame(0) * 2]))
+
+
+def test_map_rejects_an_array_in_a_wrong_shape():
+    with FramePipeline(
+        negate_frame, INPUT_LAYOUT, OUTPUT_LAYOUT, max_workers=1, ring_size=1
+    ) as pipeline:
+        # The array is not broadcast to the shape of the slot
+        with raises(ValueError, match=r"\(4, 6\)"):
+            list(pipeline.map([(full((6,), 1, dtype=uint8),)]))
@@ -0,0 +1,22 @@
+from numpy import arange, empty, float32, float64, uint8
+from numpy.testing import assert_array_equal
+
+from src.modules.quant import quantize_evenly
+
+
+def test_quantized_values_are_the_same_with_the_buffers():
+    values = arange(256)
+    expected_values = quantize_evenly(values, 32, (0, 255), (0, 31))
+
+    out = empty(values.shape, dtype=uint8)
+    workspace = empty(values.shape, dtype=float64)
+    quantized_values = quantize_evenly(
+        values, 32, (0, 255), (0, 31), out=out, workspace=workspace
+    )
+
+    assert quantized_values is out
+    assert_array_equal(expected_values, values // 8)
+    assert_array_equal(quantized_values, expected_values)
+    assert_array_equal(
+        quantize_evenly(values, 32, (0, 255), (0, 31), dtype=float32), expected_values
+    )
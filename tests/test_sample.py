@@ -0,0 +1,274 @@
+from numpy import (
+    apply_along_axis,
+    arange,
+    float32,
+    float64,
+    int16,
+    interp,
+    pad,
+    stack,
+    uint8,
+    uint16,
+    zeros,
+)
+from numpy.random import default_rng
+from numpy.testing import assert_allclose, assert_array_equal
+from pytest import mark, raises
+
+from src.modules.sample import (
+    BT2100,
+    CHROMA_SITING_CENTER,
+    CHROMA_SITING_COSITED,
+    INTERPOLATION_BICUBIC,
+    INTERPOLATION_BILINEAR,
+    blocks_from_plane,
+    build_pyramid,
+    get_pyramid_size,
+    get_subsampling_factors,
+    plane_from_blocks,
+)
+
+
+def _average_blocks(chroma, scheme):
+    dv, dh = get_subsampling_factors(scheme)
+    v, h = chroma.shape[:2]
+    padded_chroma = pad(
+        chroma.astype(float64),
+        ((0, -v % dv), (0, -h % dh)) + ((0, 0),) * (chroma.ndim - 2),
+        mode="edge",
+    )
+    blocks = padded_chroma.reshape(
+        padded_chroma.shape[0] // dv, dv, padded_chroma.shape[1] // dh, dh, -1
+    )
+    return (
+        blocks.sum(axis=(1, 3)).reshape(
+            blocks.shape[0], blocks.shape[2], *chroma.shape[2:]
+        ),
+        dv * dh,
+    )
+
+
+@mark.parametrize("scheme", [(4, 2, 0), (4, 2, 2), (4, 4, 4), (4, 1, 1)])
+@mark.parametrize("shape", [(16, 24), (15, 23), (15, 23, 2)])
+@mark.parametrize("dtype", [uint8, uint16, int16])
+def test_averaged_chroma_is_the_rounded_block_mean(scheme, shape, dtype):
+    chroma = default_rng(0).integers(0, 256 if dtype == uint8 else 4096, shape)
+    if dtype == int16:
+        chroma -= 2048
+    chroma = chroma.astype(dtype)
+
+    averaged_chroma = BT2100().subsample_average(scheme, chroma, chroma)
+
+    sums, count = _average_blocks(chroma, scheme)
+    # The averages are rounded half up
+    expected_chroma = (sums + count // 2) // count
+    assert averaged_chroma.dtype == dtype
+    assert averaged_chroma.flags.c_contiguous
+    assert_array_equal(averaged_chroma, expected_chroma)
+
+
+def test_averaged_floats_are_not_rounded():
+    chroma = default_rng(0).random((15, 23)).astype(float32)
+
+    averaged_chroma = BT2100().subsample_average((4, 2, 0), chroma, chroma)
+
+    sums, count = _average_blocks(chroma, (4, 2, 0))
+    assert averaged_chroma.dtype == float32
+    assert_allclose(averaged_chroma, sums / count, rtol=1e-6)
+
+
+def test_averaged_chroma_is_stored_in_the_output_array():
+    chroma = default_rng(0).integers(0, 256, (16, 24)).astype(uint8)
+    out = zeros((8, 12), dtype=uint8)
+
+    averaged_chroma = BT2100().subsample_average((4, 2, 0), chroma, chroma, out=out)
+
+    assert averaged_chroma is out
+    assert_array_equal(out, BT2100().subsample_average((4, 2, 0), chroma, chroma))
+    with raises(ValueError):
+        BT2100().subsample_average((4, 2, 0), chroma[0], chroma[0])
+
+
+@mark.parametrize("scheme", [(4, 2, 0), (4, 2, 2), (4, 4, 4)])
+def test_upsampled_view_is_the_same_as_the_copy(scheme):
+    dv, dh = get_subsampling_factors(scheme)
+    chroma = default_rng(0).integers(0, 256, (8, 12, 2)).astype(uint8)
+    luma = zeros((8 * dv, 12 * dh), dtype=uint8)
+
+    view = BT2100().upsample(scheme, luma, chroma, view=True)
+
+    assert view.shape == (8, dv, 12, dh, 2)
+    assert not view.flags.writeable
+    assert view.base is not None
+    assert_array_equal(plane_from_blocks(view), BT2100().upsample(scheme, luma, chroma))
+    # The luma blocks line up with the view element-wise
+    luma = default_rng(1).integers(0, 256, (8 * dv, 12 * dh, 2)).astype(uint8)
+    assert_array_equal(
+        plane_from_blocks(blocks_from_plane(luma, scheme) ^ view),
+        luma ^ BT2100().upsample(scheme, luma, chroma),
+    )
+
+
+def test_upsampled_view_rejects_cropped_luma():
+    chroma = zeros((8, 12), dtype=uint8)
+
+    with raises(ValueError):
+        BT2100().upsample((4, 2, 0), zeros((15, 24), dtype=uint8), chroma, view=True)
+    with raises(ValueError):
+        blocks_from_plane(zeros((15, 24), dtype=uint8), (4, 2, 0))
+
+
+def _interpolate_linearly(chroma, scheme, siting):
+    dv, dh = get_subsampling_factors(scheme)
+    values = chroma.astype(float64)
+    for axis, factor in ((1, dh), (0, dv)):
+        positions = arange(values.shape[axis] * factor) / factor
+        if siting == CHROMA_SITING_CENTER():
+            positions = positions + (0.5 / factor - 0.5)
+        values = apply_along_axis(
+            lambda line: interp(positions, arange(len(line)), line), axis, values
+        )
+    return values
+
+
+@mark.parametrize("scheme", [(4, 2, 0), (4, 2, 2), (4, 1, 1)])
+@mark.parametrize("siting", [CHROMA_SITING_COSITED(), CHROMA_SITING_CENTER()])
+def test_bilinear_chroma_is_the_same_as_the_linear_interpolation(scheme, siting):
+    dv, dh = get_subsampling_factors(scheme)
+    chroma = default_rng(0).integers(0, 256, (9, 7)).astype(uint8)
+    luma = zeros((9 * dv, 7 * dh), dtype=uint8)
+    sample = BT2100()
+
+    expected_chroma = _interpolate_linearly(chroma, scheme, siting)
+    float_chroma = sample.upsample_interpolated(
+        scheme, luma, chroma.astype(float64), siting=siting
+    )
+    integer_chroma = sample.upsample_interpolated(scheme, luma, chroma, siting=siting)
+
+    assert_allclose(float_chroma, expected_chroma, atol=1e-9)
+    # The 8-bit weights round the positions between the samples
+    assert integer_chroma.dtype == uint8
+    assert abs(integer_chroma - expected_chroma).max() <= 1
+
+
+@mark.parametrize("method", [INTERPOLATION_BILINEAR(), INTERPOLATION_BICUBIC()])
+def test_cosited_chroma_samples_are_kept(method):
+    chroma = default_rng(0).integers(0, 1 << 10, (9, 7)).astype(uint16)
+    luma = zeros((18, 14), dtype=uint16)
+
+    upsampled_chroma = BT2100().upsample_interpolated(
+        (4, 2, 0), luma, chroma, method=method
+    )
+
+    assert upsampled_chroma.shape == luma.shape
+    assert_array_equal(upsampled_chroma[::2, ::2], chroma)
+
+
+def test_bicubic_chroma_reproduces_ramps_inside_the_frame():
+    chroma = (arange(12, dtype=float64)[:, None] * 3 + arange(10) * 2)[..., None]
+    chroma = chroma.repeat(2, axis=-1)
+    luma = zeros((24, 20), dtype=float64)
+
+    upsampled_chroma = BT2100().upsample_interpolated(
+        (4, 2, 0), luma, chroma, method=INTERPOLATION_BICUBIC()
+    )
+
+    expected_chroma = (arange(24)[:, None] * 1.5 + arange(20))[..., None]
+    assert_allclose(
+        upsampled_chroma[2:-4, 2:-4], expected_chroma[2:-4, 2:-4].repeat(2, axis=-1)
+    )
+
+    with raises(ValueError):
+        BT2100().upsample_interpolated((4, 2, 0), luma, chroma, method="nearest")
+    with raises(ValueError):
+        BT2100().upsample_interpolated((4, 2, 0), luma, chroma, siting="left")
+
+
+def test_pyramid_levels_are_successive_averages():
+    generator = default_rng(0)
+    planes = (
+        generator.integers(0, 256, (37, 50)).astype(uint8),
+        generator.integers(0, 256, (19, 25)).astype(uint8),
+    )
+    shapes = [plane.shape for plane in planes]
+    arena = zeros(get_pyramid_size(shapes, 3) + 5, dtype=uint8)
+
+    pyramid = build_pyramid(planes, 3, arena=arena)
+
+    assert len(pyramid) == 3
+    assert [plane.shape for plane in pyramid[0]] == [(19, 25), (10, 13)]
+    assert [plane.shape for plane in pyramid[2]] == [(5, 7), (3, 4)]
+    assert get_pyramid_size(shapes, 3) == sum(
+        plane.size for level in pyramid for plane in level
+    )
+    for level in pyramid:
+        for plane, previous_plane in zip(level, planes):
+            assert plane.base is arena
+            assert plane.flags.c_contiguous
+            assert_array_equal(
+                plane,
+                BT2100().subsample_average((4, 2, 0), previous_plane, previous_plane),
+            )
+        planes = level
+
+
+def test_float_pyramid_is_the_direct_average():
+    plane = default_rng(0).random((32, 48))
+
+    (half_plane,), (quarter_plane,) = build_pyramid([plane], 2)
+
+    assert quarter_plane.dtype == float64
+    assert_allclose(half_plane, plane.reshape(16, 2, 24, 2).mean(axis=(1, 3)))
+    assert_allclose(quarter_plane, plane.reshape(8, 4, 12, 4).mean(axis=(1, 3)))
+    assert build_pyramid([plane], 0) == []
+
+
+def test_pyramid_rejects_invalid_planes():
+    plane = zeros((8, 8), dtype=uint8)
+
+    with raises(ValueError):
+        build_pyramid([])
+    with raises(ValueError):
+        build_pyramid([plane, plane.astype(uint16)])
+    with raises(ValueError):
+        build_pyramid([plane], arena=zeros(get_pyramid_size([plane.shape]) - 1, uint8))
+    with raises(ValueError):
+        build_pyramid([plane], arena=zeros(get_pyramid_size([plane.shape]), uint16))
+
+
+@mark.parametrize(
+    "resample",
+    [
+        lambda sample, luma, chroma, **kwargs: sample.subsample(
+            (4, 2, 0), luma, chroma, **kwargs
+        ),
+        lambda sample, luma, chroma, **kwargs: sample.subsample_average(
+            (4, 2, 0), luma, chroma, **kwargs
+        ),
+        lambda sample, luma, chroma, **kwargs: sample.upsample(
+            (4, 2, 0), luma, chroma[..., ::2, ::2], **kwargs
+        ),
+        lambda sample, luma, chroma, **kwargs: sample.upsample_interpolated(
+            (4, 2, 0), luma, chroma[..., ::2, ::2], **kwargs
+        ),
+    ],
+)
+def test_frame_stacks_are_the_same_as_each_frame(resample):
+    sample = BT2100()
+    frames = default_rng(0).integers(0, 256, (3, 12, 16)).astype(uint8)
+    expected_frames = stack([resample(sample, frame, frame) for frame in frames])
+
+    resampled_frames = resample(sample, frames, frames, axes=(1, 2))
+    assert resampled_frames.shape == expected_frames.shape
+    assert_array_equal(resampled_frames, expected_frames)
+
+    out = zeros(expected_frames.shape, dtype=uint8)
+    assert resample(sample, frames, frames, axes=(1, 2), out=out) is out
+    assert_array_equal(out, expected_frames)
+
+    # The spatial axes may be anywhere, such as the last axes of channels first
+    channels = frames[None].repeat(2, axis=0)
+    assert_array_equal(
+        resample(sample, channels, channels, axes=(-2, -1)),
+        expected_frames[None].repeat(2, axis=0),
+    )
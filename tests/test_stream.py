@@ -0,0 +1,169 @@
+from asyncio import run, sleep
+from io import BytesIO
+from numpy import uint8, uint16
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from pytest import raises
+
+from src.modules.bmp import save_bmp_image
+from src.modules.data import save_ycbcr_image
+from src.modules.stream import (
+    AsyncFrameSink,
+    iter_async,
+    iter_bmp_frames_async,
+    iter_bundle_async,
+    iter_ycbcr_frames_async,
+    save_bundle_async,
+)
+
+
+class FailingWriter:
+    def __init__(self, failed_index):
+        self.failed_index = failed_index
+        self.written = []
+
+    def __call__(self, index):
+        if index == self.failed_index:
+            raise OSError(f"frame {index}")
+        self.written.append(index)
+
+
+def test_frames_are_written_in_order():
+    writer = FailingWriter(None)
+
+    async def main():
+        async with AsyncFrameSink(writer, queue_size=2) as sink:
+            for index in range(10):
+                await sink.write(index)
+
+    run(main())
+    assert writer.written == list(range(10))
+
+
+def test_error_is_raised_and_later_frames_are_dropped():
+    writer = FailingWriter(2)
+
+    async def main():
+        sink = AsyncFrameSink(writer, queue_size=1)
+        with raises(OSError, match="frame 2"):
+            async with sink:
+                for index in range(10):
+                    await sink.write(index)
+
+        # The error is raised once
+        await sink.aclose()
+
+    run(main())
+    assert writer.written == [0, 1]
+
+
+def test_error_of_the_last_frame_is_raised_by_aclose():
+    writer = FailingWriter(0)
+
+    async def main():
+        sink = AsyncFrameSink(writer)
+        await sink.write(0)
+        with raises(OSError, match="frame 0"):
+            await sink.aclose()
+
+        with raises(ValueError, match="closed"):
+            await sink.write(1)
+
+    run(main())
+    assert writer.written == []
+
+
+class CountingReader:
+    def __init__(self, count, failed_index=None):
+        self.count = count
+        self.failed_index = failed_index
+        self.read_count = 0
+
+    def __call__(self):
+        index = self.read_count
+        if index == self.failed_index:
+            raise OSError(f"frame {index}")
+        self.read_count += 1
+        return index if index < self.count else None
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_items_are_read_in_order_with_backpressure():
+    reader = CountingReader(10)
+
+    async def main():
+        items = []
+        async for item in iter_async(reader, queue_size=2):
+            if item == 0:
+                await sleep(0.05)
+                # The reader waits for the queue while the first item is processed
+                assert reader.read_count <= 4
+            items.append(item)
+        return items
+
+    assert run(main()) == list(range(10))
+
+
+def test_error_is_raised_after_the_items_before_it():
+    reader = CountingReader(10, failed_index=3)
+    items = []
+
+    async def main():
+        async for item in iter_async(reader):
+            items.append(item)
+
+    with raises(OSError, match="frame 3"):
+        run(main())
+    assert items == [0, 1, 2]
+    with raises(ValueError):
+        run(collect(iter_async(reader, queue_size=0)))
+
+
+def test_async_frames_are_the_same_as_the_loaded_ones():
+    generator = default_rng(0)
+    frames = [
+        [generator.integers(0, 1024, shape).astype(uint16) for shape in shapes]
+        for shapes in [[(6, 8), (3, 4), (3, 4)]] * 3
+    ]
+    device = BytesIO()
+    for planes in frames:
+        save_ycbcr_image(device, planes)
+    device.seek(0)
+
+    loaded_frames = run(
+        collect(iter_ycbcr_frames_async(device, (8, 6), (4, 2, 0), 10, 10, 10))
+    )
+
+    assert len(loaded_frames) == 3
+    for frame, planes in zip(loaded_frames, frames):
+        assert frame.bit_depths == (10, 10, 10)
+        for plane, expected_plane in zip(frame, planes):
+            assert_array_equal(plane, expected_plane)
+
+
+def test_bundle_and_bmp_frames_round_trip(tmp_path):
+    values = [default_rng(index).integers(0, 256, (5, 7, 3)) for index in range(3)]
+    values = [value.astype(uint8) for value in values]
+    paths = []
+    for index, value in enumerate(values):
+        paths.append(tmp_path / f"{index}.bmp")
+        save_bmp_image(paths[-1], value)
+
+    async def main():
+        await save_bundle_async(tmp_path / "bundle.npz", a=values[0], b=values[1])
+        return (
+            await collect(iter_bundle_async(tmp_path / "bundle.npz")),
+            await collect(iter_bmp_frames_async(paths)),
+        )
+
+    arrays, frames = run(main())
+
+    assert [name for name, _ in arrays] == ["a", "b"]
+    for (_, array), value in zip(arrays, values):
+        assert_array_equal(array, value)
+    assert len(frames) == 3
+    for frame, value in zip(frames, values):
+        assert_array_equal(frame, value)
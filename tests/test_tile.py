@@ -0,0 +1,30 @@
+from pytest import mark, raises
+
+from src.modules.tile import get_stripe_height, iter_stripes
+
+
+@mark.parametrize("height, stripe_height", [(0, 4), (7, 1), (8, 4), (10, 4), (3, 8)])
+def test_stripes_cover_every_row_once(height, stripe_height):
+    stripes = list(iter_stripes(height, stripe_height))
+
+    rows = [row for stripe in stripes for row in range(height)[stripe]]
+    assert rows == list(range(height))
+    assert all(stripe.start % stripe_height == 0 for stripe in stripes)
+    assert all(stripe.stop - stripe.start <= stripe_height for stripe in stripes)
+
+
+def test_stripe_height_fits_in_the_cache():
+    assert get_stripe_height(1000, 4, cache_size=100_000) == 25
+    assert get_stripe_height(1000, 4, alignment=2, cache_size=100_000) == 24
+    # A stripe has at least one aligned row even if it does not fit
+    assert get_stripe_height(1000, 4, alignment=2, cache_size=1) == 2
+    assert get_stripe_height(1000, 4) >= 1
+
+
+def test_stripes_reject_invalid_arguments():
+    with raises(ValueError):
+        list(iter_stripes(8, 0))
+    with raises(ValueError):
+        get_stripe_height(0, 4)
+    with raises(ValueError):
+        get_stripe_height(1000, 4, alignment=0)